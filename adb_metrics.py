@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+ADB komut metrikleri
+Groups adb calls into command classes (tap, swipe, motionevent, keyevent, dump,
+cat, screencap, pull, rm, launch, dumpsys, ...) and keeps count, failures,
+timeouts and latency percentiles per class for the session report. A rolling
+window per class also drives adaptive timeouts: p99 x factor, clamped between
+a floor and the caller's fixed budget. The catch-all 'other' class mixes fast
+and slow commands, so it always keeps the fixed budget.
+
+Commands inside a batch are timed on the device, without the adb round trip,
+so they are kept under 'batch:<class>' and only size batch timeouts; they
+never pull down the timeout of a standalone call of the same class.
+"""
+
+import math
+import shlex
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Union
+
+COMMAND_CLASSES = ('tap', 'swipe', 'motionevent', 'keyevent', 'dump', 'cat', 'screencap', 'pull', 'rm',
+                   'launch', 'dumpsys', 'batch', 'other')
+# Öğrenilmiş timeout uygulanmayan sınıflar (heterojen: settings 50 ms, get-serialno saniyeler)
+NON_ADAPTIVE = ('other',)
+BATCH_PREFIX = 'batch:'
+
+
+def batch_key(name: str) -> str:
+    """Batch üyesi için metrik anahtarı ('cat' -> 'batch:cat')"""
+    return BATCH_PREFIX + name
+
+
+def classify(command: Union[Sequence[str], str]) -> str:
+    """adb argv'sini (veya batch içindeki shell satırını) komut sınıfına çevir"""
+    if isinstance(command, str):
+        try:
+            argv = shlex.split(command)
+        except ValueError:
+            argv = command.split()
+    else:
+        argv = list(command)
+    if len(argv) >= 2 and argv[0] == '-s':
+        argv = argv[2:]
+    if argv and argv[0] == 'pull':
+        return 'pull'
+    if argv and argv[0] in ('shell', 'exec-out'):
+        argv = argv[1:]
+        # ['shell', 'uiautomator dump ... && cat ...'] gibi tek parça script
+        if len(argv) == 1 and ' ' in argv[0]:
+            return classify(argv[0])
+    if not argv:
+        return 'other'
+    cmd = argv[0]
+    if cmd == 'input' and len(argv) > 1 and argv[1] in ('tap', 'swipe', 'motionevent', 'keyevent'):
+        return argv[1]
+    if cmd == 'uiautomator' and 'dump' in argv[1:2]:
+        return 'dump'
+    if cmd in ('cat', 'screencap', 'rm', 'dumpsys'):
+        return cmd
+    # Uygulama açma: monkey -p ... veya am start
+    if cmd == 'monkey' or (cmd == 'am' and argv[1:2] == ['start']):
+        return 'launch'
+    return 'other'
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q: 0-100) of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class AdbMetrics:
+    def __init__(self, window: int = 200, min_samples: int = 20, factor: float = 3.0, floor: float = 2.0):
+        self.window = window
+        self.min_samples = min_samples
+        self.factor = factor
+        self.floor = floor
+        self._lock = threading.Lock()
+        self._classes: Dict[str, Dict] = {}
+
+    def _entry(self, name: str) -> Dict:
+        return self._classes.setdefault(name, {'count': 0, 'failures': 0, 'timeouts': 0, 'stall_secs': 0.0,
+                                               'latencies': [], 'recent': deque(maxlen=self.window),
+                                               'ceiling': None})
+
+    def record(self, name: str, latency: Optional[float], ok: bool, timed_out: bool = False):
+        with self._lock:
+            entry = self._entry(name)
+            entry['count'] += 1
+            if not ok:
+                entry['failures'] += 1
+            if timed_out:
+                entry['timeouts'] += 1
+                entry['stall_secs'] += latency or 0.0
+            if latency is not None:
+                entry['latencies'].append(latency)
+                # Zaman aşımı da pencereye girer: sonraki timeout kendiliğinden büyür
+                entry['recent'].append(latency)
+
+    # ---- adaptive timeouts ----
+    def estimate(self, name: str) -> Optional[float]:
+        """p99 x factor over the rolling window; None until min_samples are seen (always for NON_ADAPTIVE)."""
+        if name.replace(BATCH_PREFIX, '', 1) in NON_ADAPTIVE:
+            return None
+        with self._lock:
+            entry = self._classes.get(name)
+            recent = sorted(entry['recent']) if entry else []
+        if len(recent) < self.min_samples:
+            return None
+        return percentile(recent, 99) * self.factor
+
+    def timeout_for(self, name: str, ceiling: float) -> float:
+        """Komut sınıfı için timeout: yeterli örnek yoksa sabit bütçe (ceiling)"""
+        with self._lock:
+            # Rapor, uygulanan (ceiling ile sınırlı) değeri göstersin
+            self._entry(name)['ceiling'] = ceiling
+        estimate = self.estimate(name)
+        if estimate is None:
+            return ceiling
+        return min(ceiling, max(self.floor, estimate))
+
+    def batch_timeout(self, names: Sequence[str], ceiling: float) -> float:
+        """Batch için timeout: floor (round trip payı) + üyelerin batch içi tahminlerinin toplamı;
+        biri bilinmiyorsa ceiling"""
+        estimates = [self.estimate(batch_key(name)) for name in names]
+        if not estimates or any(e is None for e in estimates):
+            return ceiling
+        return min(ceiling, self.floor + sum(estimates))
+
+    def report(self) -> Dict[str, Dict]:
+        """session_report.json 'performance' bölümü (saniye)"""
+        with self._lock:
+            classes = {name: dict(entry, latencies=sorted(entry['latencies']))
+                       for name, entry in self._classes.items()}
+        applied = {name: self.timeout_for(name, entry['ceiling'])
+                   if entry['ceiling'] is not None and self.estimate(name) is not None else None
+                   for name, entry in classes.items()}
+        report = {}
+        order = {name: i for i, name in enumerate(COMMAND_CLASSES)}
+        # batch:<sınıf> satırları 'batch'in hemen ardından
+        for name in sorted(classes, key=lambda n: (order.get(n.split(':')[0], len(order)), n)):
+            entry = classes[name]
+            lat = entry['latencies']
+            report[name] = {
+                'count': entry['count'],
+                'failures': entry['failures'],
+                'timeouts': entry['timeouts'],
+                'stall_secs': round(entry['stall_secs'], 3),
+                'total_secs': round(sum(lat), 3),
+                'p50': round(percentile(lat, 50), 4) if lat else None,
+                'p95': round(percentile(lat, 95), 4) if lat else None,
+                'p99': round(percentile(lat, 99), 4) if lat else None,
+                'adaptive_timeout': round(applied[name], 3) if applied[name] is not None else None,
+            }
+        return report
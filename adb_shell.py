@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Persistent ADB shell channel
+Keeps a single `adb shell` process open and runs commands through it,
+framing each command's output with sentinels so the exit code comes back too.
+Also builds/parses batch scripts: many shell commands in one round trip,
+one result (stdout, exit code, duration) per command.
+
+Without shell v2 (old adb/adbd, or the wire client's legacy shell: service)
+stderr arrives merged into stdout, often with CRLF line ends. Both the batch
+parser and the channel recognise their stderr markers there and drop them; the
+per-command stderr is then empty (it is part of stdout).
+"""
+
+import os
+import queue
+import re
+import subprocess
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Union
+
+
+@dataclass
+class AdbCommandResult:
+    """Result of one command inside a batch"""
+    command: str
+    raw_stdout: Union[bytes, memoryview]  # slice of the batch output buffer (not copied)
+    raw_stderr: bytes
+    exit_code: int
+    duration: Optional[float]  # seconds, measured on the device (None if `date +%N` is unsupported)
+
+    @property
+    def ok(self) -> bool:
+        return self.exit_code == 0
+
+    @property
+    def stdout(self) -> str:
+        return str(self.raw_stdout, 'utf-8', 'replace')
+
+    @property
+    def stderr(self) -> str:
+        return str(self.raw_stderr, 'utf-8', 'replace')
+
+
+def _command_line(command: Union[Sequence[str], str]) -> str:
+    return command if isinstance(command, str) else ' '.join(command)
+
+
+def build_batch_script(commands: Sequence[Union[Sequence[str], str]], token: str) -> str:
+    """One `sh -c` line that runs every command and frames its output/exit code/timestamp."""
+    mark = f'__ADBB_{token}__'
+    now = '"$(date +%s%N)"'
+    parts = [f"printf '\\n{mark} S %s\\n' {now}"]
+    for command in commands:
+        parts.append(f'{_command_line(command)} </dev/null')
+        parts.append(f"printf '\\n{mark} E %d %s\\n' $? {now}")
+        parts.append(f"printf '\\n{mark} E\\n' >&2")
+    return '; '.join(parts)
+
+
+def parse_batch_output(commands: Sequence[Union[Sequence[str], str]], token: str,
+                       stdout: Union[bytes, str], stderr: Union[bytes, str]) -> List[AdbCommandResult]:
+    """Split framed batch output back into per-command results (missing tail = not run).
+
+    stdout is sliced through a memoryview, so binary payloads (dumps, cat of a
+    file) reach the caller without being decoded or copied. A stderr marker
+    found in stdout (merged streams) is skipped.
+    """
+    if isinstance(stdout, str):
+        stdout = stdout.encode('utf-8')
+    if isinstance(stderr, str):
+        stderr = stderr.encode('utf-8')
+    mark = re.escape(f'__ADBB_{token}__'.encode())
+    # S/E satırlarında her zaman bir alan var; stderr işareti ('<mark> E') alansız
+    out_marks = list(re.finditer(rb'\r?\n' + mark + rb' (S|E) (-?\d*) ?(\S*)\r?\n', stdout))
+    err_re = re.compile(rb'\r?\n' + mark + rb' E\r?\n')
+    err_chunks = err_re.split(stderr)
+    view = memoryview(stdout)
+
+    def _ts(value: bytes) -> Optional[int]:
+        return int(value) if value.isdigit() else None
+
+    results: List[AdbCommandResult] = []
+    if not out_marks or out_marks[0].group(1) != b'S':
+        return results
+    prev_end = out_marks[0].end()
+    prev_ts = _ts(out_marks[0].group(2))
+    for i, m in enumerate(out_marks[1:]):
+        if i >= len(commands):
+            break
+        ts = _ts(m.group(3))
+        duration = (ts - prev_ts) / 1e9 if ts is not None and prev_ts is not None else None
+        results.append(AdbCommandResult(
+            command=_command_line(commands[i]),
+            raw_stdout=view[prev_end:m.start()],
+            raw_stderr=err_chunks[i] if i < len(err_chunks) else b'',
+            exit_code=int(m.group(2) or 255),
+            duration=duration,
+        ))
+        prev_end, prev_ts = m.end(), ts
+        # Birleşik akış: stderr işareti çıkış kodunun hemen ardından stdout'ta
+        merged = err_re.match(stdout, prev_end)
+        if merged:
+            prev_end = merged.end()
+    return results
+
+
+class PersistentAdbShell:
+    """One long-lived `adb shell` process; respawned automatically if it dies."""
+
+    def __init__(self, adb_path: str, serial: Optional[str] = None):
+        self.adb_path = adb_path
+        self.serial = serial
+        self.proc: Optional[subprocess.Popen] = None
+        self._stdout_q: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self._stderr_q: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self._stdout_buf = bytearray()
+        self._stderr_buf = bytearray()
+        self._lock = threading.Lock()
+        self.spawn_count = 0
+        # stderr stdout'a mı karışıyor (shell v2 yok)? Kanal başına ilk komutta öğrenilir
+        self.merged_stderr: Optional[bool] = None
+
+    # ---- process lifecycle ----
+    def _spawn(self):
+        cmd = [self.adb_path]
+        if self.serial:
+            cmd += ['-s', self.serial]
+        cmd.append('shell')
+        self.proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0,
+        )
+        self._stdout_q = queue.Queue()
+        self._stderr_q = queue.Queue()
+        self._stdout_buf = bytearray()
+        self._stderr_buf = bytearray()
+        self.merged_stderr = None
+        for stream, q in ((self.proc.stdout, self._stdout_q), (self.proc.stderr, self._stderr_q)):
+            t = threading.Thread(target=self._pump, args=(stream, q), daemon=True)
+            t.start()
+        self.spawn_count += 1
+
+    @staticmethod
+    def _pump(stream, q):
+        """Reader thread: move pipe chunks into a queue, None marks EOF."""
+        try:
+            while True:
+                chunk = stream.read1(65536) if hasattr(stream, 'read1') else os.read(stream.fileno(), 65536)
+                if not chunk:
+                    break
+                q.put(chunk)
+        except Exception:
+            pass
+        finally:
+            q.put(None)
+
+    def is_alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def close(self):
+        """Kill the channel; the next command respawns it."""
+        proc, self.proc = self.proc, None
+        if proc is None:
+            return
+        try:
+            if proc.poll() is None:
+                try:
+                    proc.stdin.write(b'exit\n')
+                    proc.stdin.flush()
+                    proc.wait(timeout=1)
+                except Exception:
+                    proc.kill()
+                    proc.wait(timeout=2)
+        except Exception:
+            pass
+
+    # ---- framing ----
+    def _read_until(self, q, buf: bytearray, marker: bytes, deadline: float, start: int = 0) -> int:
+        """Fill buf from q until marker appears at/after start; returns marker index."""
+        while True:
+            idx = buf.find(marker, start)
+            if idx != -1:
+                return idx
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError
+            try:
+                chunk = q.get(timeout=remaining)
+            except queue.Empty:
+                raise TimeoutError
+            if chunk is None:
+                raise EOFError('adb shell channel closed')
+            buf.extend(chunk)
+
+    def _detect_merged(self, err_mark: bytes, deadline: float) -> bool:
+        """stderr işareti stdout'ta mı geldi? İki kuyruğu da işaret görünene kadar okur."""
+        while True:
+            if self._stdout_buf.find(err_mark) != -1:
+                return True
+            if self._stderr_buf.find(err_mark) != -1:
+                return False
+            if time.monotonic() >= deadline:
+                raise TimeoutError
+            for q, buf in ((self._stdout_q, self._stdout_buf), (self._stderr_q, self._stderr_buf)):
+                try:
+                    chunk = q.get(timeout=0.01)
+                except queue.Empty:
+                    continue
+                if chunk is None:
+                    raise EOFError('adb shell channel closed')
+                buf.extend(chunk)
+
+    def run(self, command: Union[List[str], str], timeout: float = 15,
+            text: bool = True) -> subprocess.CompletedProcess:
+        """Run one shell command over the channel (same result shape as subprocess.run)."""
+        line = command if isinstance(command, str) else ' '.join(command)
+        with self._lock:
+            token = uuid.uuid4().hex
+            out_mark = f'\n__ADBSH_{token}__ '.encode()
+            err_mark = f'\n__ADBSH_{token}__E'.encode()
+            script = (
+                f"{{ {line}\n}} </dev/null\n"
+                f"printf '\\n__ADBSH_{token}__ %d\\n' $?\n"
+                f"printf '\\n__ADBSH_{token}__E\\n' >&2\n"
+            ).encode()
+
+            # Respawn if the previous channel died (or never started)
+            for attempt in range(2):
+                if not self.is_alive():
+                    self.close()
+                    self._spawn()
+                try:
+                    self.proc.stdin.write(script)
+                    self.proc.stdin.flush()
+                    break
+                except (BrokenPipeError, OSError):
+                    self.close()
+                    if attempt == 1:
+                        raise
+
+            deadline = time.monotonic() + timeout
+            try:
+                idx = self._read_until(self._stdout_q, self._stdout_buf, out_mark, deadline)
+                end = self._read_until(self._stdout_q, self._stdout_buf, b'\n', deadline,
+                                       start=idx + len(out_mark))
+                stdout = bytes(self._stdout_buf[:idx]).rstrip(b'\r')
+                returncode = int(self._stdout_buf[idx + len(out_mark):end].strip() or b'255')
+                del self._stdout_buf[:end + 1]
+
+                if self.merged_stderr is None:
+                    self.merged_stderr = self._detect_merged(err_mark, deadline)
+                # Birleşik akışta stderr zaten stdout'ta; işaret satırı atılır
+                q, buf = ((self._stdout_q, self._stdout_buf) if self.merged_stderr
+                          else (self._stderr_q, self._stderr_buf))
+                eidx = self._read_until(q, buf, err_mark, deadline)
+                eend = self._read_until(q, buf, b'\n', deadline, start=eidx + len(err_mark))
+                stderr = b'' if self.merged_stderr else bytes(buf[:eidx]).rstrip(b'\r')
+                del buf[:eend + 1]
+            except TimeoutError:
+                # Channel state is unknown after a hang; drop it so the next call respawns
+                self.close()
+                raise subprocess.TimeoutExpired(['adb', 'shell', line], timeout)
+            except EOFError:
+                self.close()
+                raise
+
+        if text:
+            return subprocess.CompletedProcess(
+                ['adb', 'shell', line], returncode,
+                stdout.decode('utf-8', errors='replace'),
+                stderr.decode('utf-8', errors='replace'),
+            )
+        return subprocess.CompletedProcess(['adb', 'shell', line], returncode, stdout, stderr)
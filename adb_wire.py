@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+ADB wire-protocol client
+Talks to the adb server over its TCP socket (default 127.0.0.1:5037) instead of
+spawning the adb binary for every command. Supports the subset the bots use:
+host:devices, host:transport, shell (v2, with exit codes), exec and sync pull.
+"""
+
+import os
+import socket
+import struct
+import subprocess
+import weakref
+from typing import List, Optional, Tuple
+
+
+class AdbWireError(Exception):
+    """adb server answered FAIL (or spoke something we do not understand)"""
+
+
+# shell v2 packet ids
+SHELL_STDIN = 0
+SHELL_STDOUT = 1
+SHELL_STDERR = 2
+SHELL_EXIT = 3
+SHELL_CLOSE_STDIN = 4
+
+SYNC_DATA_MAX = 64 * 1024
+
+# shell,v2 desteklemeyen eski adbd'nin FAIL mesajları (cihaz yok/yetkisiz gibi hatalar bunlara girmez)
+SHELL_V2_UNSUPPORTED = ('closed', 'unknown service', 'unsupported', 'not supported', 'shell,v2')
+
+
+class AdbWireClient:
+    """Minimal adb client; each request opens one short socket to the adb server."""
+
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None,
+                 serial: Optional[str] = None):
+        # Same env vars the adb binary honours
+        self.host = host or os.getenv('ANDROID_ADB_SERVER_ADDRESS', '127.0.0.1')
+        self.port = int(port or os.getenv('ANDROID_ADB_SERVER_PORT', '5037'))
+        self.serial = serial or os.getenv('ANDROID_SERIAL') or None
+        self._shell_v2 = True
+        self._socks = weakref.WeakSet()
+        self._aborted = False
+
+    # ---- low level ----
+    def _connect(self, timeout: float) -> socket.socket:
+        if self._aborted:
+            raise AdbWireError('aborted')
+        sock = socket.create_connection((self.host, self.port), timeout=timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._socks.add(sock)
+        return sock
+
+    def abort(self):
+        """Cancel in-flight requests from another thread (their recv fails immediately)."""
+        self._aborted = True
+        for sock in list(self._socks):
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _recv_exact(sock: socket.socket, n: int) -> bytes:
+        buf = bytearray()
+        while len(buf) < n:
+            chunk = sock.recv(n - len(buf))
+            if not chunk:
+                raise AdbWireError(f'connection closed ({len(buf)}/{n} bytes)')
+            buf.extend(chunk)
+        return bytes(buf)
+
+    @staticmethod
+    def _recv_all(sock: socket.socket) -> bytes:
+        buf = bytearray()
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return bytes(buf)
+            buf.extend(chunk)
+
+    def _send_request(self, sock: socket.socket, request: str):
+        payload = request.encode('utf-8')
+        sock.sendall(b'%04x' % len(payload) + payload)
+        status = self._recv_exact(sock, 4)
+        if status == b'OKAY':
+            return
+        if status == b'FAIL':
+            raise AdbWireError(self._read_hex_block(sock).decode('utf-8', errors='replace'))
+        raise AdbWireError(f'unexpected status {status!r} for {request!r}')
+
+    def _read_hex_block(self, sock: socket.socket) -> bytes:
+        length = int(self._recv_exact(sock, 4), 16)
+        return self._recv_exact(sock, length)
+
+    def _open_device(self, service: str, timeout: float) -> socket.socket:
+        """Open a connection switched to the device transport, then start service."""
+        sock = self._connect(timeout)
+        try:
+            self._send_request(sock, f'host:transport:{self.serial}' if self.serial else 'host:transport-any')
+            self._send_request(sock, service)
+        except Exception:
+            sock.close()
+            raise
+        return sock
+
+    # ---- services ----
+    def host_command(self, request: str, timeout: float = 5) -> str:
+        """host:* request that answers with a length-prefixed block (devices, version...)"""
+        with self._connect(timeout) as sock:
+            self._send_request(sock, request)
+            return self._read_hex_block(sock).decode('utf-8', errors='replace')
+
+    def devices(self, timeout: float = 5) -> str:
+        return self.host_command('host:devices', timeout)
+
+    def shell(self, command: str, timeout: float = 15) -> Tuple[int, bytes, bytes]:
+        """Run a shell command; returns (exit_code, stdout, stderr)."""
+        if self._shell_v2:
+            try:
+                sock = self._open_device(f'shell,v2,raw:{command}', timeout)
+            except AdbWireError as e:
+                # Old adbd without shell v2: fall back to legacy shell + echoed exit code.
+                # Anything else (device not found, unauthorized, offline) is a real error.
+                if not any(key in str(e).lower() for key in SHELL_V2_UNSUPPORTED):
+                    raise
+                self._shell_v2 = False
+            else:
+                with sock:
+                    return self._read_shell_v2(sock)
+        marker = b'\n__ADBWIRE_RC__'
+        with self._open_device(f"shell:{command}; printf '\\n__ADBWIRE_RC__%d' $?", timeout) as sock:
+            data = self._recv_all(sock)
+        idx = data.rfind(marker)
+        if idx == -1:
+            return 255, data, b''
+        try:
+            rc = int(data[idx + len(marker):].strip() or b'255')
+        except ValueError:
+            rc = 255
+        return rc, data[:idx], b''
+
+    def _read_shell_v2(self, sock: socket.socket) -> Tuple[int, bytes, bytes]:
+        stdout = bytearray()
+        stderr = bytearray()
+        # Nothing to feed; tell adbd stdin is closed so commands reading it see EOF
+        sock.sendall(struct.pack('<BI', SHELL_CLOSE_STDIN, 0))
+        while True:
+            try:
+                header = self._recv_exact(sock, 5)
+            except AdbWireError:
+                # Connection closed without an exit packet
+                return 255, bytes(stdout), bytes(stderr)
+            pid, length = struct.unpack('<BI', header)
+            data = self._recv_exact(sock, length) if length else b''
+            if pid == SHELL_STDOUT:
+                stdout.extend(data)
+            elif pid == SHELL_STDERR:
+                stderr.extend(data)
+            elif pid == SHELL_EXIT:
+                return (data[0] if data else 255), bytes(stdout), bytes(stderr)
+
+    def exec_out(self, command: str, timeout: float = 15) -> bytes:
+        """exec: raw, binary-safe stdout (no pty, no newline translation)."""
+        with self._open_device(f'exec:{command}', timeout) as sock:
+            return self._recv_all(sock)
+
+    def stream_exec(self, command: str, timeout: float = 15, chunk_size: int = 65536):
+        """exec: stdout as an iterator of chunks; closing the generator closes the socket."""
+        with self._open_device(f'exec:{command}', timeout) as sock:
+            while True:
+                chunk = sock.recv(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def pull_bytes(self, remote: str, timeout: float = 15) -> bytes:
+        """sync: RECV a device file into memory."""
+        with self._open_device('sync:', timeout) as sock:
+            path = remote.encode('utf-8')
+            sock.sendall(b'RECV' + struct.pack('<I', len(path)) + path)
+            data = bytearray()
+            while True:
+                tag = self._recv_exact(sock, 4)
+                length = struct.unpack('<I', self._recv_exact(sock, 4))[0]
+                if tag == b'DATA':
+                    data.extend(self._recv_exact(sock, length))
+                elif tag == b'DONE':
+                    break
+                elif tag == b'FAIL':
+                    raise AdbWireError(self._recv_exact(sock, length).decode('utf-8', errors='replace'))
+                else:
+                    raise AdbWireError(f'unexpected sync tag {tag!r}')
+            sock.sendall(b'QUIT' + struct.pack('<I', 0))
+            return bytes(data)
+
+    def pull(self, remote: str, local: str, timeout: float = 15) -> int:
+        """sync pull into a local file; returns bytes written."""
+        data = self.pull_bytes(remote, timeout)
+        if os.path.isdir(local):
+            local = os.path.join(local, os.path.basename(remote))
+        with open(local, 'wb') as f:
+            f.write(data)
+        return len(data)
+
+    # ---- adb CLI compatibility ----
+    @staticmethod
+    def handles(args: List[str]) -> bool:
+        """Whether run() can serve this adb argv without the binary."""
+        if len(args) >= 2 and args[0] == '-s':
+            args = args[2:]
+        if not args:
+            return False
+        verb = args[0]
+        return (verb in ('devices', 'get-serialno') or (verb in ('shell', 'exec-out') and len(args) > 1)
+                or (verb == 'pull' and len(args) == 3))
+
+    def run(self, args: List[str], timeout: float = 15, text: bool = True) -> subprocess.CompletedProcess:
+        """Serve an adb argv (e.g. ['shell', 'input', 'tap', '1', '2']) like subprocess.run would."""
+        client = self
+        if len(args) >= 2 and args[0] == '-s':
+            client = AdbWireClient(self.host, self.port, args[1])
+            args = args[2:]
+        verb = args[0]
+        try:
+            if verb == 'devices':
+                rc, out, err = 0, ('List of devices attached\n' + client.devices(timeout) + '\n').encode(), b''
+            elif verb == 'get-serialno':
+                request = f'host-serial:{client.serial}:get-serialno' if client.serial else 'host:get-serialno'
+                rc, out, err = 0, (client.host_command(request, timeout) + '\n').encode(), b''
+            elif verb == 'shell':
+                rc, out, err = client.shell(' '.join(args[1:]), timeout)
+            elif verb == 'exec-out':
+                rc, out, err = 0, client.exec_out(' '.join(args[1:]), timeout), b''
+            elif verb == 'pull':
+                size = client.pull(args[1], args[2], timeout)
+                rc, out, err = 0, f'{args[1]}: 1 file pulled, 0 skipped. ({size} bytes)\n'.encode(), b''
+            else:
+                raise AdbWireError(f'unsupported adb command: {verb}')
+        except socket.timeout:
+            raise subprocess.TimeoutExpired(['adb'] + args, timeout)
+        except (AdbWireError, OSError) as e:
+            # OSError: adb sunucusu kapalı (ConnectionRefusedError) ya da bağlantı koptu
+            rc, out, err = 1, b'', f'adb: error: {e}\n'.encode()
+        if text:
+            return subprocess.CompletedProcess(['adb'] + args, rc,
+                                               out.decode('utf-8', errors='replace'),
+                                               err.decode('utf-8', errors='replace'))
+        return subprocess.CompletedProcess(['adb'] + args, rc, out, err)
+
+
+def run_adb_args(adb_path: str, args: List[str], timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+    """Helper for the small scripts: wire client when ADB_TRANSPORT=wire, else the adb binary."""
+    if os.getenv('ADB_TRANSPORT', '').strip().lower() == 'wire' and AdbWireClient.handles(args):
+        return AdbWireClient().run(args, timeout=timeout or 15)
+    return subprocess.run([adb_path] + args, capture_output=True, text=True, timeout=timeout)
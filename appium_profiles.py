@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Appium oturum profilleri (UiAutomator2)
+A profile is the capabilities set at session creation plus the UiAutomator2
+server settings applied right after it. Selected with APPIUM_PROFILE:
+
+  stock    only the basic capabilities, server defaults (reference point)
+  default  what connect() always applied: no idle wait, unimportant views hidden
+  fast     default + no selector wait, no action acknowledgment wait, a
+           shallower accessibility snapshot (APPIUM_SNAPSHOT_DEPTH, default
+           40; the TikTok feed dump is 32 levels deep) and no window animations
+
+Every profile uses a zero implicit wait.
+"""
+
+import os
+from typing import Dict
+
+BASE_CAPABILITIES = {
+    'platformName': 'Android',
+    'appium:deviceName': 'Samsung S20',
+    # Do not auto-launch an activity; attach session and activate explicitly
+    'appium:noReset': True,
+    'appium:autoGrantPermissions': True,
+    'appium:autoLaunch': False,
+    # Keep session alive during run
+    'appium:newCommandTimeout': 120,
+}
+
+PROFILES: Dict[str, Dict[str, Dict]] = {
+    'stock': {
+        'capabilities': {},
+        'settings': {},
+    },
+    'default': {
+        'capabilities': {},
+        'settings': {
+            'ignoreUnimportantViews': True,
+            'waitForIdleTimeout': 0,
+            'waitForIdlePollingInterval': 50,
+        },
+    },
+    'fast': {
+        'capabilities': {
+            'appium:disableWindowAnimation': True,
+        },
+        'settings': {
+            'ignoreUnimportantViews': True,
+            'waitForIdleTimeout': 0,
+            'waitForIdlePollingInterval': 50,
+            # Bulunamayan selector sunucuda beklemeden döner
+            'waitForSelectorTimeout': 0,
+            # click/keys sonrası accessibility event beklenmez
+            'actionAcknowledgmentTimeout': 0,
+            'scrollAcknowledgmentTimeout': 0,
+            'keyInjectionDelay': 0,
+            'allowInvisibleElements': False,
+            'snapshotMaxDepth': 40,
+        },
+    },
+}
+
+
+def profile_name(name: str = None) -> str:
+    name = (name or os.getenv('APPIUM_PROFILE', 'default')).strip().lower()
+    if name not in PROFILES:
+        raise ValueError(f"Unknown APPIUM_PROFILE '{name}' (choose: {', '.join(PROFILES)})")
+    return name
+
+
+def capabilities(name: str = None) -> Dict:
+    caps = dict(BASE_CAPABILITIES)
+    caps.update(PROFILES[profile_name(name)]['capabilities'])
+    return caps
+
+
+def settings(name: str = None) -> Dict:
+    values = dict(PROFILES[profile_name(name)]['settings'])
+    if 'snapshotMaxDepth' in values:
+        values['snapshotMaxDepth'] = int(os.getenv('APPIUM_SNAPSHOT_DEPTH', values['snapshotMaxDepth']))
+    return values
+
+
+def apply_settings(driver, name: str = None) -> Dict:
+    """Sunucu ayarlarını uygula; sunucunun kabul etmediği ayar tek tek atlanır.
+    Returns the settings that were applied."""
+    values = settings(name)
+    if not values:
+        return {}
+    try:
+        driver.update_settings(values)
+        return values
+    except Exception:
+        pass
+    applied = {}
+    for key, value in values.items():
+        try:
+            driver.update_settings({key: value})
+            applied[key] = value
+        except Exception:
+            continue
+    return applied
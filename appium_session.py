@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Appium oturumu yeniden kullanımı
+With APPIUM_REUSE_SESSION=1 the locator bot leaves its UiAutomator2 session
+open at exit and records its id in cache/appium_session.json (keyed by server
+and profile). The next run attaches to that id instead of POST /session, so
+the on-device server is not reinstalled or restarted; a dead id falls back to
+a new session that skips server installation and device initialization. The
+HTTP connection to the server is pooled and kept alive.
+"""
+
+import json
+import os
+import time
+from typing import Dict, Optional
+
+from appium import webdriver
+
+SESSION_CACHE = os.path.join('cache', 'appium_session.json')
+
+
+def reuse_enabled() -> bool:
+    return os.getenv('APPIUM_REUSE_SESSION', '0') == '1'
+
+
+class _AttachedRemote(webdriver.Remote):
+    """Remote that adopts an existing session id instead of creating a session."""
+
+    def __init__(self, command_executor, session_id: str, capabilities: Dict, **kwargs):
+        self._attach_to = (session_id, capabilities)
+        super().__init__(command_executor, **kwargs)
+
+    def start_session(self, *args, **kwargs):
+        self.session_id, self.caps = self._attach_to
+
+
+def _remote(cls, server, **kwargs):
+    # Bağlantı havuzu + keep-alive; yeni istemcilerde keep_alive parametresi yok (zaten açık)
+    try:
+        return cls(server, keep_alive=True, **kwargs)
+    except TypeError:
+        return cls(server, **kwargs)
+
+
+class SessionStore:
+    def __init__(self, path: str = SESSION_CACHE):
+        self.path = path
+
+    def _read(self) -> Dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def load(self, server: str, profile: str) -> Optional[Dict]:
+        entry = self._read().get(f"{server}|{profile}")
+        return entry if entry and entry.get('session_id') else None
+
+    def _write(self, data: Dict):
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def save(self, server: str, profile: str, session_id: str, capabilities: Dict):
+        data = self._read()
+        data[f"{server}|{profile}"] = {
+            'session_id': session_id,
+            'capabilities': capabilities,
+            'saved_at': time.time(),
+        }
+        self._write(data)
+
+    def forget(self, server: str, profile: str):
+        data = self._read()
+        if data.pop(f"{server}|{profile}", None) is not None:
+            self._write(data)
+
+
+def attach(server: str, options, entry: Dict):
+    """Kayıtlı oturuma bağlan; oturum ölmüşse None. Returns (driver, first_command_secs)."""
+    try:
+        driver = _remote(_AttachedRemote, server, session_id=entry['session_id'],
+                         capabilities=entry.get('capabilities') or {}, options=options)
+        started = time.perf_counter()
+        # İlk komut hem canlılık testi hem ölçüm: ölü oturum 404 invalid session id döner
+        driver.current_package
+        return driver, time.perf_counter() - started
+    except Exception:
+        return None, None
+
+
+def open_session(server: str, options):
+    return _remote(webdriver.Remote, server, options=options)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Appium profil benchmark'ı (stock / default / fast yan yana)
+Opens one session per profile against the same device and runs the same
+locator workload on the TikTok feed: page_source fetch (size + latency), the
+description/title/like locators asked to the server one by one (hits and
+misses timed separately, a miss is what a video without a description costs)
+and a swipe between rounds. Needs a running Appium server (APPIUM_SERVER).
+
+  python3 bench_appium_profiles.py [--profiles default,fast] [--rounds 10] [--no-swipe] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import time
+
+from appium import webdriver
+from appium.options.android import UiAutomator2Options
+from appium.webdriver.common.appiumby import AppiumBy
+
+import appium_profiles
+
+WORKLOAD = [
+    ('desc uiselector', AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().resourceId("com.zhiliaoapp.musically:id/desc")'),
+    ('desc id', AppiumBy.ID, 'com.zhiliaoapp.musically:id/desc'),
+    ('title id', AppiumBy.ID, 'com.zhiliaoapp.musically:id/title'),
+    ('like id', AppiumBy.ID, 'com.zhiliaoapp.musically:id/ema'),
+    ('like accessibility', AppiumBy.ACCESSIBILITY_ID, 'Like'),
+    ('like xpath', AppiumBy.XPATH,
+     "//android.widget.ImageView[contains(@content-desc,'Like') or contains(@content-desc,'like')]"),
+    # Her ekranda bulunamayan locator: miss maliyeti
+    ('miss id', AppiumBy.ID, 'com.zhiliaoapp.musically:id/__missing__'),
+]
+
+
+def pct(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def run_profile(server, profile, package, rounds, swipe):
+    started = time.perf_counter()
+    options = UiAutomator2Options().load_capabilities(appium_profiles.capabilities(profile))
+    driver = webdriver.Remote(server, options=options)
+    driver.implicitly_wait(0)
+    applied = appium_profiles.apply_settings(driver, profile)
+    connect_secs = time.perf_counter() - started
+    result = {'profile': profile, 'settings': applied, 'connect_secs': connect_secs,
+              'page_bytes': [], 'page_secs': [], 'hits': [], 'misses': [], 'per_locator': {}}
+    try:
+        driver.activate_app(package)
+        time.sleep(3)
+        size = driver.get_window_size()
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            source = driver.page_source
+            result['page_secs'].append(time.perf_counter() - t0)
+            result['page_bytes'].append(len(source.encode('utf-8')))
+            for name, by, value in WORKLOAD:
+                t0 = time.perf_counter()
+                try:
+                    driver.find_element(by, value)
+                    found = True
+                except Exception:
+                    found = False
+                elapsed = time.perf_counter() - t0
+                result['hits' if found else 'misses'].append(elapsed)
+                result['per_locator'].setdefault(name, []).append(elapsed)
+            if swipe:
+                driver.swipe(size['width'] // 2, int(size['height'] * 0.8),
+                             size['width'] // 2, int(size['height'] * 0.2), duration=300)
+                time.sleep(1.5)
+    finally:
+        driver.quit()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--server', default=os.getenv('APPIUM_SERVER', 'http://localhost:4723'))
+    parser.add_argument('--package', default=os.getenv('TIKTOK_PACKAGE', 'com.zhiliaoapp.musically'))
+    parser.add_argument('--profiles', default='stock,default,fast')
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--no-swipe', action='store_true', help='aynı ekranda tekrarla (içerik sabit)')
+    parser.add_argument('--json', default=None, help='ham ölçümleri dosyaya yaz')
+    args = parser.parse_args()
+
+    results = []
+    for profile in [p.strip() for p in args.profiles.split(',') if p.strip()]:
+        print(f"⚙️  {profile}: {args.rounds} tur...")
+        results.append(run_profile(args.server, appium_profiles.profile_name(profile), args.package,
+                                   args.rounds, not args.no_swipe))
+
+    ms = lambda v: f"{v * 1000:.0f}" if v is not None else '-'
+    print(f"\n{'profil':<9}{'connect(s)':>11}{'page KB':>9}{'page ms':>9}{'hit p50':>9}{'hit p95':>9}"
+          f"{'miss p50':>10}{'miss p95':>10}")
+    for r in results:
+        kb = pct(r['page_bytes'], 0.5)
+        print(f"{r['profile']:<9}{r['connect_secs']:>11.1f}{(kb or 0) / 1024:>9.0f}{ms(pct(r['page_secs'], 0.5)):>9}"
+              f"{ms(pct(r['hits'], 0.5)):>9}{ms(pct(r['hits'], 0.95)):>9}"
+              f"{ms(pct(r['misses'], 0.5)):>10}{ms(pct(r['misses'], 0.95)):>10}")
+    print(f"\n{'locator (p50 ms)':<20}" + ''.join(f"{r['profile']:>10}" for r in results))
+    for name, _, _ in WORKLOAD:
+        print(f"{name:<20}" + ''.join(f"{ms(pct(r['per_locator'].get(name, []), 0.5)):>10}" for r in results))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Keyword sınıflandırıcı benchmark'ı (hız + doğruluk, cihazsız)
+Runs each classifier over the labelled corpus built by keyword_corpus.py and
+reports throughput (texts/s) next to precision / recall / F1, so a matcher or
+keywords.json change is judged on both at once.
+
+  python3 keyword_corpus.py                      # korpusu (yeniden) kur
+  python3 bench_classifier.py [--repeat 200] [--errors] [--config other_keywords.json]
+"""
+
+import argparse
+import time
+
+from bench_keywords import LEGACY_KEYWORDS, LOCATOR_KEYWORDS, old_loop
+from keyword_corpus import CORPUS_PATH, load_corpus
+from keyword_matcher import KeywordMatcher
+
+
+def classifiers(config=None):
+    """ad -> fn(desc, title) -> eşleşen keyword listesi (boş değilse hedef)"""
+    result = {
+        'substring:legacy': lambda d, t: old_loop(LEGACY_KEYWORDS, d, t),
+        'substring:locator': lambda d, t: old_loop(LOCATOR_KEYWORDS, d, t),
+    }
+    for profile in ('legacy', 'locator'):
+        result[f'matcher:{profile}'] = KeywordMatcher.from_config(profile, config).matched
+    return result
+
+
+def evaluate(fn, entries):
+    tp = fp = fn_ = tn = 0
+    errors = []
+    for e in entries:
+        predicted = bool(fn(e['desc'], e['title']))
+        if predicted and e['label']:
+            tp += 1
+        elif predicted:
+            fp += 1
+            errors.append(('FP', e))
+        elif e['label']:
+            fn_ += 1
+            errors.append(('FN', e))
+        else:
+            tn += 1
+    precision = tp / (tp + fp) if tp + fp else None
+    recall = tp / (tp + fn_) if tp + fn_ else None
+    f1 = 2 * precision * recall / (precision + recall) if precision and recall else None
+    return {'tp': tp, 'fp': fp, 'fn': fn_, 'tn': tn, 'precision': precision, 'recall': recall, 'f1': f1}, errors
+
+
+def throughput(fn, entries, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for e in entries:
+            fn(e['desc'], e['title'])
+    return repeat * len(entries) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', default=CORPUS_PATH)
+    parser.add_argument('--config', default=None, help='matcher için keywords.json yolu')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--errors', action='store_true', help='yanlış pozitif/negatifleri yazdır')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    entries = [e for e in corpus if e.get('label') is not None]
+    positives = sum(1 for e in entries if e['label'])
+    print(f"📚 Korpus: {len(corpus)} girdi, {len(entries)} etiketli ({positives} hedef)")
+    if not entries:
+        print("⚠️ Etiketli girdi yok: python3 keyword_corpus.py --init-labels ve corpus/labels.json'u doldurun")
+        return
+
+    fmt = lambda v: f"{v:.3f}" if v is not None else '-'
+    print(f"\n{'sınıflandırıcı':<20}{'metin/s':>11}{'TP':>5}{'FP':>5}{'FN':>5}{'prec':>8}{'recall':>8}{'F1':>8}")
+    for name, fn in classifiers(args.config).items():
+        stats, errors = evaluate(fn, entries)
+        rate = throughput(fn, entries, args.repeat)
+        print(f"{name:<20}{rate:>11,.0f}{stats['tp']:>5}{stats['fp']:>5}{stats['fn']:>5}"
+              f"{fmt(stats['precision']):>8}{fmt(stats['recall']):>8}{fmt(stats['f1']):>8}")
+        if args.errors:
+            for kind, e in errors:
+                print(f"    {kind} {e['id']} {e['desc'][:60]!r} / {e['title'][:25]!r} -> {fn(e['desc'], e['title'])}")
+
+
+if __name__ == '__main__':
+    main()
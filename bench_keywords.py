@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Keyword eşleştirme mikro benchmark'ı
+Compares the old per-keyword substring loops (legacy and locator lists, as
+they were inline in the bots) with the compiled KeywordMatcher on recorded
+descriptions from sessions/ (falls back to a few built-in samples).
+--extra N appends N synthetic keywords to both sides to show how each scales
+with the list size (the loops are O(keywords x text), the automaton O(text)).
+
+  python3 bench_keywords.py [--repeat 2000] [--extra 500] [--show-diff]
+"""
+
+import argparse
+import glob
+import os
+import random
+import string
+import time
+
+from keyword_matcher import KeywordMatcher
+
+# Eski satır içi listeler (karşılaştırma için birebir kopya)
+LEGACY_KEYWORDS = [
+    'comptia', 'security+', 'network+', 'a+', 'aplus', 'cysa+',
+    'pentest+', 'linux+', 'cloud+', 'server+', 'project+',
+    'certification', 'cert', 'exam', 'sy0-601', 'sy0-701', 'n10-008',
+    '220-1101', '220-1102', 'cs0-002', 'pt0-002',
+    'cybersecurity', 'cyber security', 'network security', 'ethical hacking',
+    'penetration testing', 'incident response', 'vulnerability',
+    'firewall', 'encryption', 'cryptography', 'malware', 'phishing',
+    'ports', 'protocols', 'tcp/ip', 'osi model', 'subnetting',
+    'troubleshooting', 'hardware', 'software', 'operating system',
+    'study', 'tips', 'passed', 'failed', 'exam prep', 'practice test',
+    'bootcamp', 'course', 'tutorial', 'learn', 'it career'
+]
+LOCATOR_KEYWORDS = [
+    'comptia', 'security+', 'network+', 'a+', 'aplus', 'cysa+', 'pentest+', 'linux+', 'cloud+', 'server+', 'project+',
+    'sy0-601', 'sy0-701', 'n10-008', '220-1101', '220-1102', 'cs0-002', 'pt0-002',
+    'cybersecurity', 'network security', 'ethical hacking', 'incident response', 'vulnerability', 'encryption', 'cryptography',
+    'malware', 'phishing', 'osi model', 'subnet', 'subnetting', 'tcp/ip', 'ports', 'protocols',
+    'certification', 'exam', 'exam prep', 'practice test', 'bootcamp'
+]
+
+SAMPLES = [
+    ("Pass Network+ Easier Than Ever  Practice real exam-style questions", "Network+ N10-009"),
+    ("Tools I use daily as a Network Engineer #fyp #networkengineer #tech", ""),
+    ("One bite of our FAMOUS Chicken Parmigiana alla Vodka", "Dinner"),
+    ("Top 5 sports moments supported by data+ analytics", "Concert highlights"),
+    ("Security+ SY0-701 practice test: ports and protocols", "CompTIA"),
+]
+
+
+def load_texts(root: str):
+    """sessions/ loglarındaki '📝 Description:' ve '🏷️ Title:' satırları (desc, title) çiftleri"""
+    pairs = []
+    for path in sorted(glob.glob(os.path.join(root, '*', 'logs', 'session.log'))):
+        desc = None
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.rstrip('\n')
+                if '📝 Description:' in line:
+                    if desc is not None:
+                        pairs.append((desc, ''))
+                    desc = line.split('📝 Description:', 1)[1].strip()
+                elif '🏷️ Title:' in line and desc is not None:
+                    pairs.append((desc, line.split('🏷️ Title:', 1)[1].strip()))
+                    desc = None
+        if desc is not None:
+            pairs.append((desc, ''))
+    return pairs or SAMPLES
+
+
+def old_loop(keywords, desc, title):
+    """Eski davranış: her keyword için ayrı substring taraması, desc ve title ayrı ayrı"""
+    found = []
+    for text in (desc, title):
+        if not text:
+            continue
+        low = text.lower()
+        found.extend(k for k in keywords if k in low)
+    return list(dict.fromkeys(found))
+
+
+def bench(fn, pairs, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for desc, title in pairs:
+            fn(desc, title)
+    elapsed = time.perf_counter() - started
+    return elapsed, repeat * len(pairs) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', default='sessions')
+    parser.add_argument('--repeat', type=int, default=2000)
+    parser.add_argument('--extra', type=int, default=0, help='her iki tarafa N sentetik keyword ekle')
+    parser.add_argument('--show-diff', action='store_true', help='eski/yeni sonucu farklı olan metinleri yazdır')
+    args = parser.parse_args()
+
+    pairs = load_texts(args.sessions)
+    print(f"📚 {len(pairs)} metin çifti, {args.repeat} tekrar")
+    rng = random.Random(1)
+    extra = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(args.extra)]
+    started = time.perf_counter()
+    matchers = {}
+    for profile in ('legacy', 'locator'):
+        base = KeywordMatcher.from_config(profile)
+        matchers[profile] = KeywordMatcher(
+            [(k, g) for k, g in zip(base.keywords, base.groups)] + [(k, 'synthetic') for k in extra], plurals=True,
+            hashtag_min_length=base.hashtag_min_length, hashtag_exclude_groups=base.hashtag_exclude_groups)
+    print(f"⚙️  Derleme: {(time.perf_counter() - started) * 1000:.2f} ms (2 profil, +{args.extra} sentetik)")
+
+    print(f"\n{'profil':<9}{'yöntem':<16}{'keyword':>8}{'süre(s)':>9}{'metin/s':>12}{'eşleşen':>9}")
+    for profile, keywords in (('legacy', LEGACY_KEYWORDS + extra), ('locator', LOCATOR_KEYWORDS + extra)):
+        matcher = matchers[profile]
+        for name, fn in (('substring loop', lambda d, t: old_loop(keywords, d, t)),
+                         ('aho-corasick', matcher.matched)):
+            elapsed, rate = bench(fn, pairs, args.repeat)
+            hits = sum(1 for d, t in pairs if fn(d, t))
+            print(f"{profile:<9}{name:<16}{len(keywords):>8}{elapsed:>9.3f}{rate:>12,.0f}{hits:>9}")
+        if args.show_diff:
+            for desc, title in pairs:
+                old, new = old_loop(keywords, desc, title), matcher.matched(desc, title)
+                if set(old) != set(new):
+                    print(f"   ≠ {desc[:60]!r}: eski={old} yeni={new}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Cihaz bilgisi önbelleği (serial + TikTok versionName başına)
+Keeps what both bots would otherwise re-discover every run: screen size, the
+installed TikTok package and whether the preflight (stay-on, animations off)
+has been applied. The entry belongs to one versionName and is dropped as soon
+as a different one is reported. Also parses the `wm size` and `dumpsys
+package` output the facts come from. Dump strategy timings are not facts:
+they live in DumpStrategyCache.
+"""
+
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from json_store import JsonStore
+
+TIKTOK_PACKAGES = ['com.zhiliaoapp.musically', 'com.ss.android.ugc.trill']
+
+_SIZE_RE = re.compile(r'(Physical|Override) size:\s*(\d+)x(\d+)')
+_VERSION_RE = re.compile(r'versionName=(\S+)')
+
+
+def version_command(package: str) -> str:
+    """Tek satır: paket kurulu değilse boş çıktı"""
+    return f"dumpsys package {package} | grep -m1 versionName="
+
+
+def parse_version(output: str) -> Optional[str]:
+    m = _VERSION_RE.search(output or '')
+    return m.group(1) if m else None
+
+
+def parse_wm_size(output: str) -> Optional[Tuple[int, int]]:
+    """`wm size` çıktısı; Override varsa o geçerli"""
+    sizes = {kind: (int(w), int(h)) for kind, w, h in _SIZE_RE.findall(output or '')}
+    return sizes.get('Override') or sizes.get('Physical')
+
+
+class DeviceFacts:
+    def __init__(self, path: str, serial: str):
+        self.serial = serial or 'unknown'
+        # Nadiren değişir (oturum başında): her değişiklik hemen yazılır
+        self.store = JsonStore(path, 'devices')
+        # Bu oturumda sürüm değiştiği için silindi mi (rapor için)
+        self.invalidated: Optional[str] = None
+
+    @property
+    def entry(self) -> Dict:
+        return self.store.entry(self.serial)
+
+    # ---- facts ----
+    def check_version(self, version: Optional[str]) -> bool:
+        """Kayıtlı bilgiler bu uygulama sürümüne mi ait? Değilse silinir (False)."""
+        version = version or 'unknown'
+        stored = self.entry.get('version')
+        if stored == version:
+            return True
+        if stored is not None:
+            self.invalidated = f"{stored} -> {version}"
+        self.store.root[self.serial] = {'version': version}
+        self.store.mark_dirty()
+        return False
+
+    def get(self, name: str, default=None):
+        return self.entry.get(name, default)
+
+    def update(self, **facts):
+        changed = {k: v for k, v in facts.items() if self.entry.get(k) != v}
+        if not changed:
+            return
+        self.entry.update(changed)
+        self.entry['updated_at'] = datetime.now().isoformat()
+        self.store.mark_dirty()
+
+    def screen_size(self) -> Optional[Tuple[int, int]]:
+        size = self.entry.get('screen')
+        return (int(size[0]), int(size[1])) if size else None
+
+    def report(self) -> Dict:
+        return {'serial': self.serial, 'invalidated': self.invalidated,
+                **{k: v for k, v in self.entry.items() if k != 'updated_at'}}
+
+
+def choose_package(installed: List[str], preferred: Optional[str] = None) -> Optional[str]:
+    """Tercih edilen paket (TIKTOK_PACKAGE, yoksa önbellekteki) kuruluysa o, değilse ilk kurulu aday"""
+    if preferred and preferred in installed:
+        return preferred
+    return installed[0] if installed else None
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+UI dump strateji önbelleği
+Records, per device serial and TikTok versionName, which uiautomator dump
+strategy worked and its latency (EWMA), so the fastest working strategy is
+tried first and an app update re-learns the order. A strategy that fails
+failure_threshold times in a row is skipped for cooldown_secs (circuit
+breaker); when every circuit is open the one closing first gets a probe.
+"""
+
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from json_store import JsonStore, ewma
+
+_NEW_ENTRY = {
+    'successes': 0,
+    'failures': 0,
+    'consecutive_failures': 0,
+    'avg_latency': None,
+    'open_until': 0.0,
+    'last_success': None,
+}
+
+
+class DumpStrategyCache:
+    def __init__(self, path: str, serial: str, failure_threshold: int = 3,
+                 cooldown_secs: float = 600.0, save_interval: float = 30.0,
+                 version: Optional[str] = None):
+        self.serial = serial or 'unknown'
+        self.key = f"{self.serial}@{version}" if version else self.serial
+        self.failure_threshold = failure_threshold
+        self.cooldown_secs = cooldown_secs
+        # Her dump'ta kayıt: dosya en fazla save_interval'da bir yazılır
+        self.store = JsonStore(path, 'devices', save_interval)
+        # Bu oturumun istatistikleri (rapor için)
+        self.session: Dict[str, Dict] = {}
+
+    def flush(self, force: bool = False):
+        self.store.flush(force)
+
+    def _entry(self, name: str) -> Dict:
+        return self.store.entry(self.key, name, default=_NEW_ENTRY)
+
+    def _session_entry(self, name: str) -> Dict:
+        return self.session.setdefault(name, {'hits': 0, 'misses': 0, 'skipped': 0, 'latencies': []})
+
+    # ---- circuit breaker / ordering ----
+    def is_open(self, name: str, now: Optional[float] = None) -> bool:
+        """Circuit açık mı (strateji geçici olarak atlanıyor mu)?"""
+        entry = self.store.get(self.key, name)
+        if not entry:
+            return False
+        return entry.get('open_until', 0.0) > (now if now is not None else time.time())
+
+    def order(self, strategies: List[str]) -> List[str]:
+        """Çalışan en hızlı strateji önce; circuit'i açık olanlar atlanır."""
+        now = time.time()
+        device = self.store.get(self.key) or {}
+
+        def key(item):
+            idx, name = item
+            entry = device.get(name, {})
+            if entry.get('successes') and entry.get('avg_latency') is not None:
+                return (0, entry['avg_latency'], idx)
+            return (1, 0.0, idx)
+
+        ranked = [name for _, name in sorted(enumerate(strategies), key=key)]
+        available = [name for name in ranked if not self.is_open(name, now)]
+        for name in ranked:
+            if name not in available:
+                self._session_entry(name)['skipped'] += 1
+        if not available and ranked:
+            # Hepsi açık: en erken kapanacak olanla yarı-açık deneme yap
+            probe = min(ranked, key=lambda n: device.get(n, {}).get('open_until', 0.0))
+            self._session_entry(probe)['skipped'] -= 1
+            available = [probe]
+        return available
+
+    def record(self, name: str, success: bool, latency: float):
+        entry = self._entry(name)
+        stats = self._session_entry(name)
+        stats['latencies'].append(latency)
+        if success:
+            stats['hits'] += 1
+            entry['successes'] += 1
+            entry['consecutive_failures'] = 0
+            entry['open_until'] = 0.0
+            entry['last_success'] = datetime.now().isoformat()
+            entry['avg_latency'] = ewma(entry.get('avg_latency'), latency)
+        else:
+            stats['misses'] += 1
+            entry['failures'] += 1
+            entry['consecutive_failures'] += 1
+            if entry['consecutive_failures'] >= self.failure_threshold:
+                entry['open_until'] = time.time() + self.cooldown_secs
+        self.store.mark_dirty()
+
+    # ---- reporting ----
+    def report(self) -> List[Dict]:
+        """Oturum sonu tablo satırları"""
+        rows = []
+        for name, stats in self.session.items():
+            lat = sorted(stats['latencies'])
+            rows.append({
+                'strategy': name,
+                'hits': stats['hits'],
+                'misses': stats['misses'],
+                'skipped': max(0, stats['skipped']),
+                'avg_latency': round(sum(lat) / len(lat), 3) if lat else None,
+                'p50_latency': round(lat[len(lat) // 2], 3) if lat else None,
+                'circuit_open': self.is_open(name),
+            })
+        return rows
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Fake adb server - cihaz olmadan adb_wire testi
+Speaks the adb server side of the wire protocol on a local port and answers
+with a tiny simulated device: an in-memory /sdcard, canned `wm size`/`input`
+replies, and `uiautomator dump`/`screencap` backed by the repo fixtures
+(tiktok_full_dump.xml, temp_screen.png).
+
+Kullanım:
+  python3 fake_adb_server.py --port 5038            # serve until Ctrl+C
+  python3 fake_adb_server.py --selftest             # run adb_wire against it
+  ANDROID_ADB_SERVER_PORT=5038 ADB_TRANSPORT=wire python3 test_adb.py
+"""
+
+import argparse
+import os
+import re
+import shlex
+import socket
+import socketserver
+import struct
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from adb_wire import SHELL_EXIT, SHELL_STDERR, SHELL_STDOUT, SYNC_DATA_MAX
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _fixture(name: str, default: bytes) -> bytes:
+    try:
+        with open(os.path.join(HERE, name), 'rb') as f:
+            return f.read()
+    except OSError:
+        return default
+
+
+class FakeDevice:
+    """Just enough of an Android shell for the bots' commands."""
+
+    def __init__(self, serial: str = 'FAKE0001'):
+        self.serial = serial
+        self.files: Dict[str, bytes] = {}
+        self.dump_xml = _fixture('tiktok_full_dump.xml', b"<?xml version='1.0' ?><hierarchy rotation=\"0\"/>")
+        self.screen_png = _fixture('temp_screen.png', b'\x89PNG\r\n\x1a\n')
+        self.screen_size = (1080, 2400)
+        self.packages = {'com.zhiliaoapp.musically': '37.1.4'}  # package -> versionName
+        self.shell_v2 = True  # False: eski adbd gibi shell,v2 isteğini 'closed' ile reddet
+        self.commands = []
+        self.dump_delay = 0.0  # seconds, to simulate a slow uiautomator
+        self.lock = threading.Lock()
+
+    def run(self, command: str, merged: bool = False) -> Tuple[int, bytes, bytes]:
+        """Execute one shell command line; returns (rc, stdout, stderr).
+        merged=True: stderr goes into stdout in step order (legacy shell: pty)."""
+        with self.lock:
+            self.commands.append(command)
+        rc, out, err = 0, b'', b''
+        # `a; b`, `a && b`, `a | b` with `$?`, `$(date +%s%N)`, `</dev/null`, `>/dev/null`
+        # and `>&2` are enough for the bots' command lines and framed batch scripts
+        for part in command.split(';'):
+            for i, step in enumerate(part.split('&&')):
+                step = step.strip()
+                if not step or (i > 0 and rc != 0):
+                    continue
+                step = step.replace('"$(date +%s%N)"', str(time.time_ns())).replace('$?', str(rc))
+                to_stderr = step.endswith('>&2')
+                to_null = step.endswith('>/dev/null')
+                step = step.replace('>&2', '').replace('>/dev/null', '').replace('</dev/null', '')
+                o, e = None, b''
+                for piece in step.split('|'):
+                    rc, o, pe = self._run_one(piece.strip(), stdin=o)
+                    e += pe
+                if to_stderr:
+                    o, e = b'', e + o
+                if to_null:
+                    o = b''
+                if merged:
+                    out += o + e
+                else:
+                    out += o
+                    err += e
+        return rc, out, err
+
+    def _run_one(self, line: str, stdin: Optional[bytes] = None) -> Tuple[int, bytes, bytes]:
+        try:
+            argv = shlex.split(line)
+        except ValueError:
+            return 2, b'', b'sh: syntax error\n'
+        if not argv:
+            return 0, b'', b''
+        cmd, args = argv[0], argv[1:]
+        if cmd == 'printf' and args:
+            fmt = args[0].encode().decode('unicode_escape')
+            values = [int(v) if spec == 'd' else v
+                      for spec, v in zip(re.findall(r'%([ds])', fmt), args[1:])]
+            return 0, (fmt % tuple(values)).encode(), b''
+        if cmd == 'echo':
+            return 0, (' '.join(args) + '\n').encode(), b''
+        if cmd == 'wm' and args[:1] == ['size']:
+            return 0, 'Physical size: {}x{}\n'.format(*self.screen_size).encode(), b''
+        if cmd == 'wm' and args[:1] == ['density']:
+            return 0, b'Physical density: 420\n', b''
+        if cmd in ('input', 'settings', 'svc', 'am', 'monkey'):
+            return 0, (b'Events injected: 1\n' if cmd == 'monkey' else b''), b''
+        if cmd == 'pm' and args[:2] == ['list', 'packages']:
+            return 0, ''.join(f'package:{p}\n' for p in self.packages).encode(), b''
+        if cmd == 'dumpsys' and args[:1] == ['package']:
+            version = self.packages.get(args[1]) if len(args) > 1 else None
+            if version is None:
+                return 0, b'', b''
+            return 0, f'Packages:\n  Package [{args[1]}]\n    versionCode=1\n    versionName={version}\n'.encode(), b''
+        if cmd == 'grep' and args:
+            pattern = [a for a in args if not a.startswith('-')][0]
+            lines = [l for l in (stdin or b'').decode().splitlines(True) if pattern in l]
+            if '-m1' in args:
+                lines = lines[:1]
+            return (0 if lines else 1), ''.join(lines).encode(), b''
+        if cmd == 'rm':
+            for p in args:
+                if not p.startswith('-'):
+                    existed = self.files.pop(p, None) is not None
+                    if not existed and '-f' not in args:
+                        return 1, b'', f'rm: {p}: No such file or directory\n'.encode()
+            return 0, b'', b''
+        if cmd == 'test' and len(args) == 2 and args[0] == '-f':
+            return (0 if args[1] in self.files else 1), b'', b''
+        if cmd == 'cat':
+            if args and args[0] in self.files:
+                return 0, self.files[args[0]], b''
+            return 1, b'', f'cat: {args[0] if args else "-"}: No such file or directory\n'.encode()
+        if cmd == 'pkill':
+            return 1, b'', b''
+        if cmd == 'uiautomator' and args[:1] == ['dump']:
+            if self.dump_delay:
+                time.sleep(self.dump_delay)
+            paths = [a for a in args[1:] if not a.startswith('--')]
+            path = paths[0] if paths else '/sdcard/window_dump.xml'
+            if path == '/dev/tty':
+                return 0, self.dump_xml + b'UI hierchary dumped to: /dev/tty\n', b''
+            self.files[path] = self.dump_xml
+            return 0, f'UI hierchary dumped to: {path}\n'.encode(), b''
+        if cmd == 'screencap':
+            paths = [a for a in args if not a.startswith('-')]
+            if paths:
+                self.files[paths[0]] = self.screen_png
+                return 0, b'', b''
+            if '-p' not in args:
+                # Raw RGBA_8888: width, height, format, dataspace + pixels
+                width, height = self.screen_size
+                return 0, struct.pack('<IIII', width, height, 1, 0) + b'\x20\x40\x60\xff' * (width * height), b''
+            return 0, self.screen_png, b''
+        if cmd in ('true', ':'):
+            return 0, b'', b''
+        if cmd == 'false':
+            return 1, b'', b''
+        return 127, b'', f'/system/bin/sh: {cmd}: not found\n'.encode()
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def _recv_exact(self, n: int) -> bytes:
+        buf = bytearray()
+        while len(buf) < n:
+            chunk = self.request.recv(n - len(buf))
+            if not chunk:
+                raise ConnectionError
+            buf.extend(chunk)
+        return bytes(buf)
+
+    def _okay(self):
+        self.request.sendall(b'OKAY')
+
+    def _fail(self, msg: str):
+        data = msg.encode()
+        self.request.sendall(b'FAIL' + b'%04x' % len(data) + data)
+
+    def handle(self):
+        device: FakeDevice = self.server.device
+        transport = False
+        try:
+            while True:
+                length = int(self._recv_exact(4), 16)
+                request = self._recv_exact(length).decode('utf-8')
+                if request == 'host:version':
+                    self._okay()
+                    self.request.sendall(b'0004' + b'%04x' % 41)
+                    return
+                if request == 'host:devices':
+                    data = f'{device.serial}\tdevice\n'.encode()
+                    self._okay()
+                    self.request.sendall(b'%04x' % len(data) + data)
+                    return
+                if request in ('host:get-serialno', f'host-serial:{device.serial}:get-serialno'):
+                    data = device.serial.encode()
+                    self._okay()
+                    self.request.sendall(b'%04x' % len(data) + data)
+                    return
+                if request in ('host:transport-any', f'host:transport:{device.serial}'):
+                    transport = True
+                    self._okay()
+                    continue
+                if request.startswith('host:transport:'):
+                    self._fail(f"device '{request.split(':', 2)[2]}' not found")
+                    return
+                if not transport:
+                    self._fail(f'unknown host service: {request}')
+                    return
+                if request.startswith('shell,v2,raw:') or request.startswith('shell,v2:'):
+                    if not device.shell_v2:
+                        self._fail('closed')
+                        return
+                    self._okay()
+                    rc, out, err = device.run(request.split(':', 1)[1])
+                    for pid, data in ((SHELL_STDOUT, out), (SHELL_STDERR, err)):
+                        for i in range(0, len(data), SYNC_DATA_MAX):
+                            chunk = data[i:i + SYNC_DATA_MAX]
+                            self.request.sendall(struct.pack('<BI', pid, len(chunk)) + chunk)
+                    self.request.sendall(struct.pack('<BI', SHELL_EXIT, 1) + bytes([rc & 0xFF]))
+                    return
+                if request.startswith('shell:') or request.startswith('exec:'):
+                    self._okay()
+                    # shell: stderr stdout'a karışık gelir; exec: yalnızca stdout
+                    rc, out, _ = device.run(request.split(':', 1)[1], merged=request.startswith('shell:'))
+                    self.request.sendall(out)
+                    return
+                if request == 'sync:':
+                    self._okay()
+                    self._sync(device)
+                    return
+                self._fail(f'unknown service: {request}')
+                return
+        except (ConnectionError, ValueError):
+            return
+
+    def finish(self):
+        # Drain what the client still sends (e.g. shell v2 close-stdin) so closing
+        # with unread input does not turn into a TCP reset that eats our reply
+        try:
+            self.request.shutdown(socket.SHUT_WR)
+            self.request.settimeout(1.0)
+            while self.request.recv(65536):
+                pass
+        except OSError:
+            pass
+
+    def _sync(self, device: FakeDevice):
+        while True:
+            tag = self._recv_exact(4)
+            length = struct.unpack('<I', self._recv_exact(4))[0]
+            if tag == b'QUIT':
+                return
+            path = self._recv_exact(length).decode('utf-8')
+            if tag == b'RECV':
+                data = device.files.get(path)
+                if data is None:
+                    msg = b'No such file or directory'
+                    self.request.sendall(b'FAIL' + struct.pack('<I', len(msg)) + msg)
+                    continue
+                for i in range(0, len(data), SYNC_DATA_MAX):
+                    chunk = data[i:i + SYNC_DATA_MAX]
+                    self.request.sendall(b'DATA' + struct.pack('<I', len(chunk)) + chunk)
+                self.request.sendall(b'DONE' + struct.pack('<I', 0))
+            elif tag == b'STAT':
+                data = device.files.get(path)
+                mode = 0o100644 if data is not None else 0
+                self.request.sendall(b'STAT' + struct.pack('<III', mode, len(data or b''), 0))
+            else:
+                return
+
+
+class FakeAdbServer(socketserver.ThreadingTCPServer):
+    """Threaded stand-in for the adb server; use as a context manager in scripts."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, device: Optional[FakeDevice] = None):
+        super().__init__((host, port), _Handler)
+        self.device = device or FakeDevice()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self) -> 'FakeAdbServer':
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def selftest() -> bool:
+    """adb_wire'ı sahte sunucuya karşı çalıştır"""
+    from adb_wire import AdbWireClient
+
+    ok = True
+    with FakeAdbServer() as server:
+        client = AdbWireClient('127.0.0.1', server.port)
+        checks = []
+        checks.append(('devices', client.run(['devices']).stdout.strip().endswith('device')))
+        checks.append(('get-serialno', client.run(['get-serialno']).stdout.strip() == server.device.serial))
+        rc, out, _ = client.shell('wm size')
+        checks.append(('shell stdout', rc == 0 and b'1080x2400' in out))
+        rc, _, _ = client.shell('test -f /sdcard/missing.xml')
+        checks.append(('shell exit code', rc == 1))
+        client.shell('uiautomator dump --compressed /sdcard/ui_dump.xml')
+        checks.append(('dump + cat', client.run(['shell', 'cat', '/sdcard/ui_dump.xml']).stdout.startswith('<?xml')))
+        checks.append(('exec-out', b'<hierarchy' in client.exec_out('uiautomator dump --compressed /dev/tty')))
+        client.shell('screencap -p /sdcard/temp_screenshot.png')
+        checks.append(('sync pull', client.pull_bytes('/sdcard/temp_screenshot.png') == server.device.screen_png))
+        checks.append(('pull missing', client.run(['pull', '/sdcard/nope.png', '/tmp/nope.png']).returncode != 0))
+        from adb_shell import build_batch_script, parse_batch_output
+        batch = [['rm', '-f', '/sdcard/ui_dump.xml'], ['uiautomator', 'dump', '/sdcard/ui_dump.xml'],
+                 ['test', '-f', '/sdcard/nope.xml'], ['cat', '/sdcard/ui_dump.xml']]
+        rc, out, err = client.shell(build_batch_script(batch, 'selftest'))
+        results = parse_batch_output(batch, 'selftest', out, err)
+        checks.append(('batch', [r.exit_code for r in results] == [0, 0, 1, 0]
+                       and results[3].stdout.startswith('<?xml')))
+
+        # Eski adbd: shell,v2 reddedilir, legacy shell: (stderr stdout'a karışık)
+        server.device.shell_v2 = False
+        legacy = AdbWireClient('127.0.0.1', server.port)
+        rc, out, err = legacy.shell('wm size')
+        checks.append(('legacy shell stdout', rc == 0 and b'1080x2400' in out and not legacy._shell_v2))
+        rc, _, _ = legacy.shell('test -f /sdcard/missing.xml')
+        checks.append(('legacy shell exit code', rc == 1))
+        batch = [['cat', '/sdcard/nope.xml'], ['uiautomator', 'dump', '/sdcard/ui_dump.xml'],
+                 ['cat', '/sdcard/ui_dump.xml']]
+        rc, out, err = legacy.shell(build_batch_script(batch, 'legacy'))
+        results = parse_batch_output(batch, 'legacy', out, err)
+        checks.append(('legacy batch (merged stderr)', [r.exit_code for r in results] == [1, 0, 0]
+                       and results[2].stdout.startswith('<?xml')))
+        server.device.shell_v2 = True
+
+    # Durmuş adb sunucusu: istisna değil, başarısız sonuç
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        closed_port = probe.getsockname()[1]
+    result = AdbWireClient('127.0.0.1', closed_port).run(['shell', 'echo', 'hi'], timeout=2)
+    checks.append(('server down', result.returncode != 0 and 'error' in result.stderr))
+    for name, passed in checks:
+        print(f"{'✅' if passed else '❌'} {name}")
+        ok = ok and passed
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake adb server for offline testing')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5038)
+    parser.add_argument('--selftest', action='store_true', help='run adb_wire checks and exit')
+    args = parser.parse_args()
+
+    if args.selftest:
+        raise SystemExit(0 if selftest() else 1)
+
+    server = FakeAdbServer(args.host, args.port)
+    print(f"🧪 Fake adb server: {args.host}:{server.port} (serial {server.device.serial})")
+    print(f"   ANDROID_ADB_SERVER_PORT={server.port} ADB_TRANSPORT=wire ...")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,9 @@
 #!/usr/bin/env python3
-import subprocess
+from adb_wire import run_adb_args
 
 def run_adb(command):
     adb_path = "/mnt/c/Users/canga/Desktop/platform-tools/adb.exe"
-    full_command = [adb_path, 'shell'] + command
-    result = subprocess.run(full_command, capture_output=True, text=True)
+    result = run_adb_args(adb_path, ['shell'] + command)
     return result.stdout.strip()
 
 def enable_show_touches():
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Kalıcı JSON önbellek dosyası
+One small JSON document under a single root key ('devices', 'apps', ...),
+read once at start and written atomically (tmp file + os.replace) so a crash
+mid-write never leaves a truncated cache. Writers mark the store dirty;
+flush() writes at most once per save_interval seconds and flush(force=True)
+writes whatever is pending, e.g. at session end.
+"""
+
+import json
+import os
+import time
+from typing import Dict, Optional
+
+
+def ewma(prev: Optional[float], value: float, alpha: float = 0.3, digits: int = 3) -> float:
+    """Üstel hareketli ortalama: yeni ölçüme alpha ağırlığı (ilk ölçüm olduğu gibi)"""
+    return round(value if prev is None else prev * (1 - alpha) + value * alpha, digits)
+
+
+class JsonStore:
+    def __init__(self, path: str, root_key: str, save_interval: float = 0.0):
+        self.path = path
+        self.root_key = root_key
+        self.save_interval = save_interval
+        self.data: Dict[str, Dict] = {root_key: {}}
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        self.load()
+
+    @property
+    def root(self) -> Dict:
+        return self.data[self.root_key]
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data.get(self.root_key), dict):
+                self.data = data
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError:
+            pass
+        self._saved_at = time.monotonic()
+
+    def mark_dirty(self):
+        """Değişiklik var; aralık dolduysa hemen yazılır (save_interval=0: her seferinde)"""
+        self._dirty = True
+        self.flush()
+
+    def flush(self, force: bool = False):
+        if self._dirty and (force or time.monotonic() - self._saved_at >= self.save_interval):
+            self.save()
+
+    def get(self, *keys) -> Optional[Dict]:
+        """root[k1][k2]...; yoksa None (oluşturmaz)"""
+        node = self.root
+        for key in keys:
+            node = node.get(key) if isinstance(node, dict) else None
+            if node is None:
+                return None
+        return node
+
+    def entry(self, *keys, default: Optional[Dict] = None) -> Dict:
+        """root[k1][k2]... (yoksa oluşturulur; son seviye default'un kopyasıyla)"""
+        node = self.root
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        return node.setdefault(keys[-1], dict(default or {}))
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Keyword sınıflandırıcı korpusu (sessions/ kayıtlarından)
+Collects the descriptions and titles the bots recorded under sessions/
+(liked_videos.json, session_report.json, '📝 Description:' / '🏷️ Title:' log
+lines) into one deduplicated dataset. Logs truncate descriptions (50 or 80
+chars), so entries are merged when one normalized description is a prefix of
+another and keep the longest text. Each entry's id hashes the first 48
+normalized chars, which survives both truncations, so hand labels in
+corpus/labels.json stay attached across rebuilds.
+
+  python3 keyword_corpus.py                 # corpus/keyword_corpus.jsonl yaz
+  python3 keyword_corpus.py --init-labels   # etiketsiz girdileri labels.json'a ekle (label: null)
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Optional
+
+CORPUS_PATH = os.path.join('corpus', 'keyword_corpus.jsonl')
+LABELS_PATH = os.path.join('corpus', 'labels.json')
+
+ID_PREFIX = 48
+JUNK = {'', 'none', 'extracted_from_text'}
+TRAILER_RE = re.compile(r'(…more|\.\.\.more|…|\.\.\.)\s*$')
+
+
+def normalize(text: str) -> str:
+    text = TRAILER_RE.sub('', (text or '').strip().strip("'"))
+    return ' '.join(text.lower().split())
+
+
+def entry_id(norm_desc: str, norm_title: str = '') -> str:
+    key = norm_desc[:ID_PREFIX] or 'title:' + norm_title
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=6).hexdigest()
+
+
+def _records_from_log(path: str) -> List[Dict]:
+    """session.log: locator ('📝 Description: x' + '🏷️ Title: y') ve legacy ("📝 Description: 'x...'")"""
+    records, current = [], None
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if '📹 Video #' in line:
+                current = None
+            elif '📝 Description:' in line:
+                current = {'desc': line.split('📝 Description:', 1)[1].strip(), 'title': ''}
+                records.append(current)
+            elif '🏷️ Title:' in line:
+                title = line.split('🏷️ Title:', 1)[1].strip()
+                if current is None:
+                    current = {'desc': '', 'title': title}
+                    records.append(current)
+                else:
+                    current['title'] = title
+            elif '🎯 Decision:' in line and current is not None:
+                current['recorded_target'] = 'reason: keywords' in line
+    return records
+
+
+def _records_from_json(path: str) -> List[Dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    records = []
+    for item in data.get('liked_videos', []) if isinstance(data, dict) else []:
+        if 'video_info' in item:  # legacy bot
+            info = item.get('video_info') or {}
+            records.append({'desc': info.get('description', ''), 'title': info.get('username', ''),
+                            'recorded_target': bool(item.get('is_comptia'))})
+        else:  # locator bot
+            records.append({'desc': item.get('desc', ''), 'title': item.get('title', ''),
+                            'recorded_target': item.get('reason') == 'keywords'})
+    return records
+
+
+def collect(root: str = 'sessions') -> List[Dict]:
+    """Ham kayıtlar: {'desc', 'title', 'source', 'recorded_target'?}"""
+    records = []
+    patterns = ('*/logs/session.log', '*/logs/liked_videos.json', '*/logs/session_report.json',
+                '*/session_report.json')
+    for pattern in patterns:
+        for path in sorted(glob.glob(os.path.join(root, pattern))):
+            found = _records_from_log(path) if path.endswith('.log') else _records_from_json(path)
+            source = os.path.relpath(path, root)
+            for record in found:
+                record['source'] = source
+            records.extend(found)
+    return records
+
+
+def build(records: List[Dict], labels: Optional[Dict[str, Dict]] = None) -> List[Dict]:
+    """Normalize, önek ile birleştir (en uzun metin kalır), etiketleri ekle"""
+    labels = labels or {}
+    usable = []
+    for record in records:
+        desc, title = normalize(record.get('desc', '')), normalize(record.get('title', ''))
+        if desc in JUNK:
+            desc = ''
+        if not desc and title in JUNK:
+            continue
+        usable.append((desc, title, record))
+    # En uzun açıklama önce: kısaltılmış kopyalar ona katılır
+    usable.sort(key=lambda item: -len(item[0]))
+    entries: List[Dict] = []
+    for desc, title, record in usable:
+        target = None
+        for entry in entries:
+            if desc and entry['_norm'].startswith(desc) or not desc and entry['_norm_title'] == title:
+                target = entry
+                break
+        if target is None:
+            target = {'_norm': desc, '_norm_title': title, 'desc': TRAILER_RE.sub('', record['desc'].strip().strip("'")),
+                      'title': record.get('title', '').strip(), 'sources': [], 'recorded_target': None}
+            entries.append(target)
+        if not target['title'] and record.get('title'):
+            target['title'] = record['title'].strip()
+            target['_norm_title'] = title
+        if record['source'] not in target['sources']:
+            target['sources'].append(record['source'])
+        if record.get('recorded_target') is not None:
+            target['recorded_target'] = bool(target['recorded_target']) or record['recorded_target']
+    result = []
+    for entry in entries:
+        eid = entry_id(entry.pop('_norm'), entry.pop('_norm_title'))
+        label = labels.get(eid, {}).get('label')
+        result.append(dict(id=eid, **entry, label=label, label_source='manual' if label is not None else None))
+    result.sort(key=lambda e: e['id'])
+    return result
+
+
+def load_labels(path: str = LABELS_PATH) -> Dict[str, Dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_corpus(path: str = CORPUS_PATH, sessions: str = 'sessions') -> List[Dict]:
+    """Kayıtlı korpusu oku; yoksa sessions/'dan bellekte kur"""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    return build(collect(sessions), load_labels())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', default='sessions')
+    parser.add_argument('--out', default=CORPUS_PATH)
+    parser.add_argument('--labels', default=LABELS_PATH)
+    parser.add_argument('--init-labels', action='store_true', help='etiketsiz girdileri labels dosyasına ekle')
+    args = parser.parse_args()
+
+    records = collect(args.sessions)
+    labels = load_labels(args.labels)
+    corpus = build(records, labels)
+    os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        for entry in corpus:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    labelled = [e for e in corpus if e['label'] is not None]
+    positives = sum(1 for e in labelled if e['label'])
+    print(f"📚 {len(records)} kayıt -> {len(corpus)} tekil girdi ({args.out})")
+    print(f"🏷️  Etiketli: {len(labelled)} ({positives} hedef, {len(labelled) - positives} değil), "
+          f"etiketsiz: {len(corpus) - len(labelled)}")
+
+    if args.init_labels:
+        added = 0
+        for entry in corpus:
+            if entry['id'] not in labels:
+                labels[entry['id']] = {'label': None, 'desc': entry['desc'][:80], 'title': entry['title'][:40]}
+                added += 1
+        with open(args.labels, 'w', encoding='utf-8') as f:
+            json.dump(labels, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"✍️  {added} girdi {args.labels} dosyasına eklendi (label: true/false doldurun)")
+
+
+if __name__ == '__main__':
+    main()
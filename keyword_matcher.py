@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Anahtar kelime eşleştirici (token sınırlı Aho-Corasick)
+Keywords come from keywords.json (groups + per-bot profiles) and are compiled
+once into an Aho-Corasick automaton over tokens instead of characters. A token
+is a run of word characters or a single punctuation mark, so matches always
+sit on token boundaries: 'a+' does not fire inside 'data+', 'ports' not inside
+'sports', 'cert' not inside 'concert'. Multi-token keywords keep their spacing
+('tcp/ip' needs the tokens adjacent, 'osi model' needs whitespace between
+them). One pass over all texts returns every match with its position.
+
+Hashtags glue words together ('#cybersecuritytips', '#comptiasecurityplus'),
+so inside a '#' token distinctive keywords also match as a prefix of the
+hashtag word. Their compact form drops spaces and punctuation and spells '+'
+as 'plus' ('security+' -> 'securityplus'). Only keywords whose compact form
+has at least hashtag_min_length characters qualify, and groups can be
+excluded, so short or ambiguous keys ('a+', 'cert', 'ports', 'tips') keep
+their token boundaries.
+"""
+
+import json
+import os
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'keywords.json')
+
+TOKEN_RE = re.compile(r'\w+|[^\w\s]')
+
+
+class KeywordMatch(NamedTuple):
+    keyword: str
+    group: str
+    field: int  # scan() argümanlarından hangisi (0 = ilk metin)
+    start: int
+    end: int
+
+
+def hashtag_form(keyword: str) -> str:
+    """'security+' -> 'securityplus', 'exam prep' -> 'examprep', 'tcp/ip' -> 'tcpip'"""
+    return ''.join(ch for ch in keyword.lower().replace('+', 'plus') if ch.isalnum() or ch == '_')
+
+
+def _keys(phrase: str) -> List[str]:
+    """Phrase -> automaton keys; a key gets a leading space when whitespace precedes its token."""
+    keys, prev_end = [], None
+    for m in TOKEN_RE.finditer(phrase.lower()):
+        keys.append(m.group() if prev_end is None or m.start() == prev_end else ' ' + m.group())
+        prev_end = m.end()
+    return keys
+
+
+class KeywordMatcher:
+    def __init__(self, keywords: Iterable[Tuple[str, str]], plurals: bool = False,
+                 hashtag_min_length: int = 0, hashtag_exclude_groups: Iterable[str] = ()):
+        """keywords: (keyword, group) çiftleri; plurals: 'exam' -> 'exams' de eşleşir;
+        hashtag_min_length > 0: bu uzunluktaki keyword'ler hashtag içinde önek olarak da eşleşir"""
+        self.keywords: List[str] = []
+        self.groups: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # State -> (keyword index, token count) outputs, fail zinciri dahil
+        self._out: List[List[Tuple[int, int]]] = [[]]
+        for keyword, group in keywords:
+            if keyword in self.keywords:
+                continue
+            idx = len(self.keywords)
+            self.keywords.append(keyword)
+            self.groups.append(group)
+            variants = [keyword]
+            if plurals and keyword[-1:].isalpha() and not keyword.endswith('s'):
+                variants.append(keyword + 's')
+            for variant in variants:
+                self._insert(_keys(variant), idx)
+        self._build_fail_links()
+        # Ön filtre: hiçbir keyword'ün ilk token'ı metinde yoksa otomata hiç çalışmaz
+        self._first_tokens = frozenset(self._goto[0])
+        # Hashtag önekleri: ilk hashtag_min_length karakterine göre kovalanmış (form, keyword index)
+        self.hashtag_min_length = hashtag_min_length
+        self.hashtag_exclude_groups = tuple(hashtag_exclude_groups)
+        self._hashtags: Dict[str, List[Tuple[str, int]]] = {}
+        if hashtag_min_length > 0:
+            for idx, (keyword, group) in enumerate(zip(self.keywords, self.groups)):
+                form = hashtag_form(keyword)
+                if len(form) >= hashtag_min_length and group not in self.hashtag_exclude_groups:
+                    self._hashtags.setdefault(form[:hashtag_min_length], []).append((form, idx))
+
+    @classmethod
+    def from_config(cls, profile: str, path: Optional[str] = None) -> 'KeywordMatcher':
+        """keywords.json'dan profil yükle (KEYWORDS_CONFIG ile başka dosya verilebilir)"""
+        path = path or os.getenv('KEYWORDS_CONFIG') or DEFAULT_CONFIG
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        spec = config['profiles'][profile]
+        pairs = [(keyword, group) for group in spec['groups'] for keyword in config['groups'][group]]
+        hashtags = config.get('hashtags', {})
+        return cls(pairs, plurals=spec.get('plurals', False),
+                   hashtag_min_length=hashtags.get('min_length', 0),
+                   hashtag_exclude_groups=hashtags.get('exclude_groups', ()))
+
+    # ---- compile ----
+    def _insert(self, keys: List[str], idx: int):
+        state = 0
+        for depth, key in enumerate(keys):
+            if depth == 0:
+                key = key.lstrip(' ')
+            nxt = self._goto[state].get(key)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][key] = nxt
+            state = nxt
+        self._out[state].append((idx, len(keys)))
+
+    def _step(self, state: int, key: str) -> int:
+        while True:
+            if state == 0:
+                # Kökte önceki boşluk önemsiz: keyword her token'da başlayabilir
+                return self._goto[0].get(key.lstrip(' '), 0)
+            nxt = self._goto[state].get(key)
+            if nxt is not None:
+                return nxt
+            state = self._fail[state]
+
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for key, child in self._goto[state].items():
+                self._fail[child] = self._step(self._fail[state], key)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+                queue.append(child)
+
+    # ---- match ----
+    def scan(self, *texts: Optional[str]) -> Iterator[KeywordMatch]:
+        """Metinleri tek geçişte tara; her eşleşme (metin içi konumuyla) sırayla döner"""
+        goto, out, step = self._goto, self._out, self._step
+        for field, text in enumerate(texts):
+            if not text:
+                continue
+            low = text.lower()
+            if len(low) != len(text):
+                # lower() uzunluğu değiştirdi (ör. 'İ'): konumlar için token token küçült
+                low = None
+            elif self._first_tokens.isdisjoint(TOKEN_RE.findall(low)) and not (self._hashtags and '#' in low):
+                continue
+            state, prev_end, prev_token = 0, None, None
+            starts: List[int] = []
+            for m in TOKEN_RE.finditer(low if low is not None else text):
+                start = m.start()
+                token = m.group() if low is not None else m.group().lower()
+                adjacent = prev_end == start
+                key = token if adjacent else ' ' + token
+                if adjacent and prev_token == '#' and self._hashtags:
+                    for form, idx in self._hashtags.get(token[:self.hashtag_min_length], ()):
+                        # Tam token eşleşmesini otomat zaten veriyor
+                        if token.startswith(form) and token != self.keywords[idx]:
+                            yield KeywordMatch(self.keywords[idx], self.groups[idx], field,
+                                               start, start + len(form))
+                prev_end, prev_token = m.end(), token
+                starts.append(start)
+                # Hızlı yol: kökteyken boşluk işareti gerekmez
+                if state == 0:
+                    state = goto[0].get(token, 0)
+                else:
+                    state = step(state, key)
+                for idx, length in out[state]:
+                    yield KeywordMatch(self.keywords[idx], self.groups[idx], field,
+                                       starts[-length], prev_end)
+
+    def find_all(self, *texts: Optional[str]) -> List[KeywordMatch]:
+        return list(self.scan(*texts))
+
+    def matched(self, *texts: Optional[str]) -> List[str]:
+        """Eşleşen keyword'ler, ilk görülme sırasıyla ve tekrarsız"""
+        return list(dict.fromkeys(m.keyword for m in self.scan(*texts)))
+
+    def __len__(self) -> int:
+        return len(self.keywords)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Locator strateji sıralaması (paket + uygulama sürümü başına)
+Counts, per TikTok package@versionName, how often each like-button locator
+strategy found the button and how long the lookup took. The strategy that
+usually wins is tried first on the next video and the next run; nothing is
+ever skipped, only reordered. A new app version starts an empty ranking,
+since resource ids change between releases.
+"""
+
+from datetime import datetime
+from typing import Dict, List
+
+from json_store import JsonStore, ewma
+
+_NEW_ENTRY = {
+    'successes': 0,
+    'failures': 0,
+    'avg_latency': None,
+    'last_success': None,
+}
+
+
+class LocatorRanking:
+    def __init__(self, path: str, package: str, version: str, save_interval: float = 30.0):
+        self.key = f"{package or 'unknown'}@{version or 'unknown'}"
+        # Her like aramasında kayıt: dosya en fazla save_interval'da bir yazılır
+        self.store = JsonStore(path, 'apps', save_interval)
+        # Bu oturumun istatistikleri (rapor için)
+        self.session: Dict[str, Dict] = {}
+
+    def flush(self, force: bool = False):
+        self.store.flush(force)
+
+    def _entry(self, label: str) -> Dict:
+        return self.store.entry(self.key, label, default=_NEW_ENTRY)
+
+    def _session_entry(self, label: str) -> Dict:
+        return self.session.setdefault(label, {'hits': 0, 'misses': 0, 'latencies': []})
+
+    # ---- ordering ----
+    def score(self, label: str):
+        """(başarı oranı, ortalama gecikme); hiç denenmemişse None"""
+        entry = self.store.get(self.key, label)
+        if not entry or not (entry['successes'] + entry['failures']):
+            return None
+        # Laplace düzeltmesi: tek bir şanslı deneme listenin başına oturmasın
+        rate = (entry['successes'] + 1) / (entry['successes'] + entry['failures'] + 2)
+        return rate, entry['avg_latency']
+
+    def order(self, labels: List[str]) -> List[str]:
+        """Yüksek başarı oranı önce, eşitse hızlı olan; denenmemişler varsayılan sırada ortada kalır.
+        Hiçbir strateji atlanmaz: sıralama yalnızca deneme sırasını değiştirir."""
+        def key(item):
+            idx, label = item
+            score = self.score(label)
+            if score is None:
+                return (0.5, float('inf'), idx)
+            rate, latency = score
+            return (1.0 - rate, latency if latency is not None else float('inf'), idx)
+
+        return [label for _, label in sorted(enumerate(labels), key=key)]
+
+    def record(self, label: str, success: bool, latency: float):
+        entry = self._entry(label)
+        stats = self._session_entry(label)
+        stats['latencies'].append(latency)
+        if success:
+            stats['hits'] += 1
+            entry['successes'] += 1
+            entry['last_success'] = datetime.now().isoformat()
+        else:
+            stats['misses'] += 1
+            entry['failures'] += 1
+        entry['avg_latency'] = ewma(entry.get('avg_latency'), latency, digits=4)
+        self.store.mark_dirty()
+
+    # ---- reporting ----
+    def report(self) -> Dict:
+        """Rapor: kalıcı sıralama (bu paket/sürüm) + bu oturumun deneme sayıları"""
+        app = self.store.get(self.key) or {}
+        ranking = []
+        for label in self.order(list(app)):
+            entry = app[label]
+            stats = self.session.get(label, {'hits': 0, 'misses': 0, 'latencies': []})
+            lat = sorted(stats['latencies'])
+            score = self.score(label)
+            ranking.append({
+                'strategy': label,
+                'successes': entry['successes'],
+                'failures': entry['failures'],
+                'success_rate': round(score[0], 3) if score else None,
+                'avg_latency': entry['avg_latency'],
+                'session_hits': stats['hits'],
+                'session_misses': stats['misses'],
+                'session_p50_latency': round(lat[len(lat) // 2], 4) if lat else None,
+            })
+        return {'app': self.key, 'ranking': ranking}
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Süre bütçeli locator çözümü
+A LookupBudget gives one lookup ("resolve the description within 400 ms") a
+deadline. Strategies are started only while budget remains; each one's time
+and outcome is recorded so the log shows where the time went. A strategy
+already running on the server is not interrupted (implicit wait is 0, so a
+miss is one round trip); the ones after the deadline are skipped.
+"""
+
+import time
+from typing import Callable, List, Optional, Tuple
+
+
+class LookupBudget:
+    def __init__(self, what: str, budget_ms: float):
+        self.what = what
+        self.budget_ms = budget_ms
+        self.started = time.perf_counter()
+        self.deadline = self.started + budget_ms / 1000.0
+        # (label, ms, found)
+        self.steps: List[Tuple[str, float, bool]] = []
+        self.skipped: List[str] = []
+
+    def remaining_ms(self) -> float:
+        return max(0.0, (self.deadline - time.perf_counter()) * 1000.0)
+
+    @property
+    def expired(self) -> bool:
+        return time.perf_counter() >= self.deadline
+
+    def run(self, label: str, lookup: Callable[[], object]):
+        """Stratejiyi bütçe varsa çalıştır; bütçe bittiyse atla (None)."""
+        if self.expired:
+            self.skipped.append(label)
+            return None
+        started = time.perf_counter()
+        try:
+            el = lookup()
+        except Exception:
+            el = None
+        self.steps.append((label, (time.perf_counter() - started) * 1000.0, el is not None))
+        return el
+
+    def last_ms(self) -> Optional[float]:
+        return self.steps[-1][1] if self.steps else None
+
+    @property
+    def spent_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000.0
+
+    def summary(self) -> str:
+        parts = [f"{label} {ms:.0f} ms {'✓' if found else '✗'}" for label, ms, found in self.steps]
+        text = f"⏱️  {self.what}: {self.spent_ms:.0f}/{self.budget_ms:.0f} ms | " + (" · ".join(parts) or "-")
+        if self.skipped:
+            text += f" | {len(self.skipped)} skipped (deadline)"
+        return text
@@ -8,6 +8,9 @@ import time
 import xml.etree.ElementTree as ET
 import re
 
+from ui_hierarchy import UiHierarchy
+from ui_spatial import SpatialGrid, right_panel_actions
+
 def main():
     adb_path = "/mnt/c/Users/canga/Desktop/platform-tools/adb.exe"
     
@@ -54,7 +57,8 @@ def main():
     
     # 5. Parse et ve analiz et
     try:
-        root = ET.fromstring(xml_content)
+        ui = UiHierarchy.parse(xml_content)
+        grid = SpatialGrid(ui)
         
         print("\n🔍 TIKTOK UI ANALİZİ:")
         print("-" * 50)
@@ -67,131 +71,94 @@ def main():
         music_elements = []
         all_texts = []
         
-        for elem in root.iter('node'):
-            text = elem.get('text', '')
-            content_desc = elem.get('content-desc', '')
-            resource_id = elem.get('resource-id', '')
-            bounds = elem.get('bounds', '')
-            clickable = elem.get('clickable', 'false')
+        for i in range(len(ui)):
+            text = ui.text(i)
+            content_desc = ui.desc(i).lower()
             
             # Text içerenler
             if text:
-                all_texts.append({
-                    'text': text,
-                    'bounds': bounds,
-                    'id': resource_id
-                })
+                all_texts.append(i)
                 
                 # Süre formatı
                 if re.match(r'^\d{1,2}:\d{2}$', text.strip()):
-                    time_patterns.append({
-                        'text': text,
-                        'bounds': bounds
-                    })
+                    time_patterns.append(i)
             
             # Like button
-            if any(word in content_desc.lower() for word in ['like', 'beğen', 'heart', 'kalp']):
-                like_elements.append({
-                    'desc': content_desc,
-                    'bounds': bounds,
-                    'clickable': clickable
-                })
+            if any(word in content_desc for word in ['like', 'beğen', 'heart', 'kalp']):
+                like_elements.append(i)
             
             # Comment button
-            if any(word in content_desc.lower() for word in ['comment', 'yorum']):
-                comment_elements.append({
-                    'desc': content_desc,
-                    'bounds': bounds,
-                    'clickable': clickable
-                })
+            if any(word in content_desc for word in ['comment', 'yorum']):
+                comment_elements.append(i)
             
             # Share button
-            if any(word in content_desc.lower() for word in ['share', 'paylaş']):
-                share_elements.append({
-                    'desc': content_desc,
-                    'bounds': bounds,
-                    'clickable': clickable
-                })
+            if any(word in content_desc for word in ['share', 'paylaş']):
+                share_elements.append(i)
             
             # Music info
-            if any(word in content_desc.lower() for word in ['music', 'müzik', 'original sound', 'ses']):
-                music_elements.append({
-                    'desc': content_desc,
-                    'text': text,
-                    'bounds': bounds
-                })
+            if any(word in content_desc for word in ['music', 'müzik', 'original sound', 'ses']):
+                music_elements.append(i)
         
         # Sonuçları göster
         if time_patterns:
             print("\n⏱️ VİDEO SÜRESİ BULUNDU:")
-            for t in time_patterns:
-                print(f"  • Süre: {t['text']}")
-                # Koordinatları parse et
-                if t['bounds']:
-                    match = re.match(r'\[(\d+),(\d+)\]\[(\d+),(\d+)\]', t['bounds'])
-                    if match:
-                        x1, y1, x2, y2 = map(int, match.groups())
-                        print(f"    Konum: ({(x1+x2)//2}, {(y1+y2)//2})")
+            for i in time_patterns:
+                print(f"  • Süre: {ui.text(i)}")
+                print(f"    Konum: {ui.center(i)}")
         else:
             print("\n⏱️ Video süresi görünmüyor (video oynatılıyor olabilir)")
         
         if like_elements:
             print("\n❤️ LIKE BUTTON:")
-            for elem in like_elements[:1]:  # İlkini al
-                print(f"  • Content-desc: '{elem['desc']}'")
-                if elem['bounds']:
-                    match = re.match(r'\[(\d+),(\d+)\]\[(\d+),(\d+)\]', elem['bounds'])
-                    if match:
-                        x1, y1, x2, y2 = map(int, match.groups())
-                        print(f"    Koordinat: ({(x1+x2)//2}, {(y1+y2)//2})")
-                        print(f"    Tıklanabilir: {elem['clickable']}")
+            for i in like_elements[:1]:  # İlkini al
+                tap = grid.tap_target(i)
+                print(f"  • Content-desc: '{ui.desc(i)}'")
+                print(f"    Koordinat: {ui.center(tap)}")
+                print(f"    Tıklanabilir: {str(ui.has(tap, 'clickable')).lower()}")
         
         if comment_elements:
             print("\n💬 COMMENT BUTTON:")
-            for elem in comment_elements[:1]:
-                print(f"  • Content-desc: '{elem['desc']}'")
-                if elem['bounds']:
-                    match = re.match(r'\[(\d+),(\d+)\]\[(\d+),(\d+)\]', elem['bounds'])
-                    if match:
-                        x1, y1, x2, y2 = map(int, match.groups())
-                        print(f"    Koordinat: ({(x1+x2)//2}, {(y1+y2)//2})")
+            for i in comment_elements[:1]:
+                print(f"  • Content-desc: '{ui.desc(i)}'")
+                print(f"    Koordinat: {ui.center(grid.tap_target(i))}")
         
         if share_elements:
             print("\n📤 SHARE BUTTON:")
-            for elem in share_elements[:1]:
-                print(f"  • Content-desc: '{elem['desc']}'")
-                if elem['bounds']:
-                    match = re.match(r'\[(\d+),(\d+)\]\[(\d+),(\d+)\]', elem['bounds'])
-                    if match:
-                        x1, y1, x2, y2 = map(int, match.groups())
-                        print(f"    Koordinat: ({(x1+x2)//2}, {(y1+y2)//2})")
+            for i in share_elements[:1]:
+                print(f"  • Content-desc: '{ui.desc(i)}'")
+                print(f"    Koordinat: {ui.center(grid.tap_target(i))}")
+        
+        # Sağ aksiyon paneli: sayaçların hemen üstündeki ikonlar (uzamsal indeks ile)
+        panel = right_panel_actions(ui, grid)
+        if panel:
+            print("\n🧭 SAĞ PANEL (ikon ↑ sayaç):")
+            for icon, label in panel:
+                tap = grid.tap_target(icon)
+                name = ui.desc(tap) or ui.desc(icon) or ui.resource_id(icon)
+                print(f"  • {ui.text(label):>8} → ikon {ui.center(icon)}, dokunma alanı {ui.center(tap)}  {name[:40]}")
         
         if music_elements:
             print("\n🎵 MÜZİK BİLGİSİ:")
-            for elem in music_elements[:1]:
-                print(f"  • Content-desc: '{elem['desc']}'")
-                if elem['text']:
-                    print(f"  • Text: '{elem['text']}'")
+            for i in music_elements[:1]:
+                print(f"  • Content-desc: '{ui.desc(i)}'")
+                if ui.text(i):
+                    print(f"  • Text: '{ui.text(i)}'")
         
         # Tüm text'leri göster
         print("\n📝 EKRANDA GÖRÜNEN TEXTLER (ilk 15):")
-        for i, t in enumerate(all_texts[:15], 1):
-            text_display = t['text'][:50] + ('...' if len(t['text']) > 50 else '')
-            print(f"  {i}. '{text_display}'")
-            if t['id']:
-                print(f"     ID: {t['id']}")
+        for n, i in enumerate(all_texts[:15], 1):
+            text = ui.text(i)
+            text_display = text[:50] + ('...' if len(text) > 50 else '')
+            print(f"  {n}. '{text_display}'")
+            if ui.resource_id(i):
+                print(f"     ID: {ui.resource_id(i)}")
         
-        # TikTok package kontrolü
+        # TikTok package kontrolü (intern tablosundan, node taraması yok)
         print("\n📦 PAKET BİLGİSİ:")
-        tiktok_found = False
-        for elem in root.iter('node'):
-            package = elem.get('package', '')
-            if 'musically' in package or 'tiktok' in package.lower():
-                tiktok_found = True
-                print(f"  ✅ TikTok paketi doğrulandı: {package}")
-                break
-        
-        if not tiktok_found:
+        tiktok_packages = [p for p in ui.packages() if 'musically' in p or 'tiktok' in p.lower()]
+        if tiktok_packages:
+            print(f"  ✅ TikTok paketi doğrulandı: {tiktok_packages[0]}")
+        else:
             print("  ⚠️ TikTok paketi bulunamadı, uygulama açık olmayabilir")
         
     except ET.ParseError as e:
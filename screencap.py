@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+screencap raw çıktısı -> PNG
+Raw `screencap` (no -p) prints a small header (width, height, pixel format and,
+on newer Android, a dataspace word) followed by RGBA_8888 pixels. Encoding that
+on the host with zlib skips the device-side PNG encoder, which is the slow part
+of `screencap -p`.
+"""
+
+import struct
+import zlib
+from typing import Tuple, Union
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# android.graphics.PixelFormat
+PIXEL_FORMAT_RGBA_8888 = 1
+PIXEL_FORMAT_RGBX_8888 = 2
+
+
+def parse_raw_header(buf: Union[bytes, bytearray, memoryview]) -> Tuple[int, int, int, int]:
+    """(width, height, format, pixel_offset); header is 12 bytes, 16 with dataspace."""
+    if len(buf) < 12:
+        raise ValueError(f'raw screencap too short ({len(buf)} bytes)')
+    width, height, fmt = struct.unpack_from('<III', buf, 0)
+    if fmt not in (PIXEL_FORMAT_RGBA_8888, PIXEL_FORMAT_RGBX_8888):
+        raise ValueError(f'unsupported pixel format {fmt}')
+    offset = len(buf) - width * height * 4
+    if offset not in (12, 16):
+        raise ValueError(f'raw screencap size mismatch ({len(buf)} bytes for {width}x{height})')
+    return width, height, fmt, offset
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff)
+
+
+def encode_png(width: int, height: int, rgba: Union[bytes, bytearray, memoryview], level: int = 1) -> bytes:
+    """RGBA_8888 piksellerinden PNG üret (filtre yok, hızlı zlib seviyesi)."""
+    stride = width * 4
+    pixels = memoryview(rgba)
+    # Each scanline is prefixed with filter type 0 (None)
+    scanlines = bytearray((stride + 1) * height)
+    for y in range(height):
+        start = y * (stride + 1) + 1
+        scanlines[start:start + stride] = pixels[y * stride:(y + 1) * stride]
+    ihdr = struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)  # 8-bit RGBA
+    return (PNG_SIGNATURE + _png_chunk(b'IHDR', ihdr)
+            + _png_chunk(b'IDAT', zlib.compress(scanlines, level))
+            + _png_chunk(b'IEND', b''))
+
+
+def raw_to_png(buf: Union[bytes, bytearray, memoryview], level: int = 1) -> bytes:
+    """Raw screencap buffer'ını PNG'ye çevir"""
+    width, height, fmt, offset = parse_raw_header(buf)
+    pixels = memoryview(buf)[offset:]
+    if fmt == PIXEL_FORMAT_RGBX_8888:
+        # X byte'ı tanımsız: tam opak yap
+        opaque = bytearray(pixels)
+        opaque[3::4] = b'\xff' * (width * height)
+        pixels = memoryview(opaque)
+    return encode_png(width, height, pixels, level)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Arka plan screenshot worker'ı
+The bots only grab the screen bytes; encoding (raw RGBA -> PNG/WebP) and the
+disk write happen on one background thread. The queue is bounded by the bytes
+it holds: submit() blocks when it is full, so a slow disk slows the bot down
+instead of growing memory without limit.
+"""
+
+import io
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from screencap import parse_raw_header, raw_to_png
+
+try:
+    from PIL import Image
+except ImportError:  # WebP isteğe bağlı; Pillow yoksa PNG yazılır
+    Image = None
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def encode_screenshot(payload: BytesLike, raw: bool, image_format: str) -> bytes:
+    """Yakalanan ekranı hedef formata çevir (raw RGBA veya PNG girdi)."""
+    if image_format == 'webp':
+        if raw:
+            width, height, _, offset = parse_raw_header(payload)
+            img = Image.frombuffer('RGBA', (width, height), bytes(memoryview(payload)[offset:]), 'raw', 'RGBA', 0, 1)
+        else:
+            img = Image.open(io.BytesIO(payload))
+        out = io.BytesIO()
+        img.save(out, format='WEBP', quality=80)
+        return out.getvalue()
+    return raw_to_png(payload) if raw else payload
+
+
+class ScreenshotWorker:
+    def __init__(self, max_pending_bytes: int = 64 * 1024 * 1024, image_format: str = 'png',
+                 log: Callable[[str], None] = print):
+        self.max_pending_bytes = max_pending_bytes
+        self.log = log
+        self.image_format = image_format.lower()
+        if self.image_format == 'webp' and Image is None:
+            self.log("ℹ️ Pillow bulunamadı; screenshot'lar PNG olarak yazılacak")
+            self.image_format = 'png'
+        self._queue = deque()
+        self._pending_bytes = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {
+            'submitted': 0,
+            'written': 0,
+            'failed': 0,
+            'bytes_written': 0,
+            'peak_pending_bytes': 0,
+            'backpressure_waits': 0,
+            'backpressure_secs': 0.0,
+            'encode_write_secs': 0.0,
+        }
+
+    def target_path(self, path: str) -> str:
+        """Dosyanın yazılacağı son yol (format uzantısıyla)"""
+        root, _ = os.path.splitext(path)
+        return f"{root}.{self.image_format}"
+
+    def submit(self, path: str, payload: BytesLike, raw: bool = False) -> Tuple[str, Future]:
+        """Encode + yazmayı kuyruğa al; (son yol, Future[son yol]) döndür. Kuyruk doluysa bekler."""
+        final_path = self.target_path(path)
+        size = len(payload)
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('screenshot worker closed')
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='screenshot-worker', daemon=True)
+                self._thread.start()
+            # Backpressure: boş kuyruğa tek büyük kare her zaman sığar
+            if self._queue and self._pending_bytes + size > self.max_pending_bytes:
+                self.stats['backpressure_waits'] += 1
+                started = time.monotonic()
+                while self._queue and self._pending_bytes + size > self.max_pending_bytes:
+                    self._cond.wait()
+                self.stats['backpressure_secs'] += time.monotonic() - started
+            self._queue.append((final_path, payload, raw, size, future))
+            self._pending_bytes += size
+            self.stats['submitted'] += 1
+            self.stats['peak_pending_bytes'] = max(self.stats['peak_pending_bytes'], self._pending_bytes)
+            self._cond.notify_all()
+        return final_path, future
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                final_path, payload, raw, size, future = self._queue[0]
+            started = time.monotonic()
+            try:
+                data = encode_screenshot(payload, raw, self.image_format)
+                part_path = final_path + '.part'
+                with open(part_path, 'wb') as f:
+                    f.write(data)
+                os.replace(part_path, final_path)
+            except Exception as e:
+                self.stats['failed'] += 1
+                self.log(f"❌ Screenshot yazılamadı: {os.path.basename(final_path)} ({type(e).__name__}: {e})")
+                future.set_exception(e)
+            else:
+                self.stats['written'] += 1
+                self.stats['bytes_written'] += len(data)
+                future.set_result(final_path)
+            self.stats['encode_write_secs'] += time.monotonic() - started
+            with self._cond:
+                # İş bitene kadar kuyrukta kalır: flush() yarım yazılmış dosyayı beklesin
+                self._queue.popleft()
+                self._pending_bytes -= size
+                self._cond.notify_all()
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Kuyruktaki tüm screenshot'lar yazılana kadar bekle"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queue:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        return flushed
+
+    def report(self) -> Dict:
+        stats = dict(self.stats)
+        stats['format'] = self.image_format
+        stats['pending'] = self.pending
+        stats['backpressure_secs'] = round(stats['backpressure_secs'], 3)
+        stats['encode_write_secs'] = round(stats['encode_write_secs'], 3)
+        return stats
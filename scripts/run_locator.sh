@@ -19,14 +19,18 @@ MINS="${RUN_MINS:-2}"
 PKG="${TIKTOK_PACKAGE:-}"
 SERVER="${APPIUM_SERVER:-}"
 FAST="0"
+PROFILE="${APPIUM_PROFILE:-default}"
+REUSE="${APPIUM_REUSE_SESSION:-0}"
 
 usage() {
   cat <<EOF
-Usage: $0 [-m minutes] [-p package] [-s server] [--fast]
+Usage: $0 [-m minutes] [-p package] [-s server] [--fast] [--profile stock|default|fast] [--reuse]
   -m  Minutes to run (default: 2)
   -p  TikTok package (default autodetect -> musically or trill)
   -s  Appium server URL (default autodetect -> http://<windows_ip>:4723)
   --fast  Enable FAST_MODE=1 (shorter watch/load intervals for smoke runs)
+  --profile  Appium session profile (default: default; see appium_profiles.py)
+  --reuse  Keep the Appium session open and attach to it on the next run
 
 Examples:
   $0 -m 2 --fast
@@ -40,6 +44,8 @@ while [[ $# -gt 0 ]]; do
     -p) PKG="$2"; shift 2;;
     -s) SERVER="$2"; shift 2;;
     --fast) FAST="1"; shift;;
+    --profile) PROFILE="$2"; shift 2;;
+    --reuse) REUSE="1"; shift;;
     -h|--help) usage; exit 0;;
     *) echo "Unknown arg: $1"; usage; exit 1;;
   esac
@@ -56,18 +62,19 @@ if [[ -z "${SERVER}" ]]; then
   fi
 fi
 
-# Quick server reachability check
-if command -v curl >/dev/null 2>&1; then
+# Quick server reachability check (skipped with --reuse: connect() reports it)
+if [[ "${REUSE}" != "1" ]] && command -v curl >/dev/null 2>&1; then
   if ! curl -sS "${SERVER}/status" >/dev/null; then
     echo "⚠️  Cannot reach Appium at ${SERVER}. Is it running? (appium -a 0.0.0.0 -p 4723)" >&2
   fi
 fi
 
-# Detect TikTok package if not set and adb exists
+# Detect TikTok package if not set and adb exists (one pm call)
 if [[ -z "${PKG}" ]] && command -v adb >/dev/null 2>&1; then
-  if adb shell pm list packages 2>/dev/null | grep -qi "com.zhiliaoapp.musically"; then
+  PACKAGES=$(adb shell pm list packages 2>/dev/null || true)
+  if grep -qi "com.zhiliaoapp.musically" <<<"${PACKAGES}"; then
     PKG="com.zhiliaoapp.musically"
-  elif adb shell pm list packages 2>/dev/null | grep -qi "com.ss.android.ugc.trill"; then
+  elif grep -qi "com.ss.android.ugc.trill" <<<"${PACKAGES}"; then
     PKG="com.ss.android.ugc.trill"
   fi
 fi
@@ -77,9 +84,17 @@ if [[ -z "${PKG}" ]]; then
   PKG="com.zhiliaoapp.musically"
 fi
 
+# App version (locator ranking is kept per package + version)
+if [[ -z "${TIKTOK_VERSION:-}" ]] && command -v adb >/dev/null 2>&1; then
+  TIKTOK_VERSION=$(adb shell dumpsys package "${PKG}" 2>/dev/null | awk -F= '/versionName=/{print $2; exit}' | tr -d '\r' || true)
+fi
+
 export APPIUM_SERVER="${SERVER}"
 export TIKTOK_PACKAGE="${PKG}"
+export TIKTOK_VERSION="${TIKTOK_VERSION:-}"
 export RUN_MINS="${MINS}"
+export APPIUM_PROFILE="${PROFILE}"
+export APPIUM_REUSE_SESSION="${REUSE}"
 
 if [[ "${FAST}" == "1" ]]; then
   export FAST_MODE=1
@@ -91,7 +106,8 @@ fi
 
 echo "🚀 Running locator bot"
 echo "   Server : ${APPIUM_SERVER}"
-echo "   Package: ${TIKTOK_PACKAGE}"
+echo "   Package: ${TIKTOK_PACKAGE} ${TIKTOK_VERSION:+(v${TIKTOK_VERSION})}"
+echo "   Profile: ${APPIUM_PROFILE} (session reuse=${APPIUM_REUSE_SESSION})"
 echo "   Minutes: ${RUN_MINS} (FAST_MODE=${FAST_MODE:-0})"
 
 exec python3 tiktok_with_locator.py
@@ -5,6 +5,9 @@ UIAutomator dump'ın tamamını göster
 
 import subprocess
 import time
+import xml.etree.ElementTree as ET
+
+from ui_hierarchy import UiHierarchy
 
 def main():
     adb_path = "/mnt/c/Users/canga/Desktop/platform-tools/adb.exe"
@@ -40,6 +43,14 @@ def main():
     print("\n" + "="*50)
     print(f"Toplam karakter: {len(xml_content)}")
     print(f"Toplam satır: {len(xml_content.splitlines())}")
+    try:
+        ui = UiHierarchy.parse(xml_content)
+        clickable = sum(1 for _ in ui.with_flag('clickable'))
+        with_text = sum(1 for _ in ui.with_text())
+        print(f"Toplam node: {len(ui)} (tıklanabilir: {clickable}, text: {with_text})")
+        print(f"Paketler: {', '.join(ui.packages()) or '-'}")
+    except ET.ParseError as e:
+        print(f"⚠️ XML parse hatası: {e}")
     print("="*50)
     
     # Dosyayı local'e de kaydet
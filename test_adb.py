@@ -1,13 +1,15 @@
 #!/usr/bin/env python3
-import subprocess
 import sys
 
+from adb_wire import run_adb_args
+
 def run_adb_command(command):
     """ADB komutu çalıştır"""
     adb_path = "/mnt/c/Users/canga/Desktop/platform-tools/adb.exe"
     full_command = [adb_path] + command
     try:
-        result = subprocess.run(full_command, capture_output=True, text=True)
+        # ADB_TRANSPORT=wire: adb server socket'i üzerinden (adb.exe spawn yok)
+        result = run_adb_args(adb_path, command)
         print(f"Komut: {' '.join(full_command)}")
         print(f"Return code: {result.returncode}")
         if result.stdout:
@@ -9,6 +9,8 @@ import time
 import xml.etree.ElementTree as ET
 import re
 
+from ui_hierarchy import UiHierarchy
+
 def test_uiautomator():
     adb_path = "/mnt/c/Users/canga/Desktop/platform-tools/adb.exe"
     
@@ -48,50 +50,36 @@ def test_uiautomator():
     # 3. XML'i parse et
     print("\n🔬 Elementler analiz ediliyor...")
     try:
-        root = ET.fromstring(xml_content)
+        ui = UiHierarchy.parse(xml_content)
         
-        # Tüm elementleri topla
+        # Tüm elementleri topla (node indeksleri)
         all_elements = []
         clickable_elements = []
         text_elements = []
         time_elements = []
         
-        for elem in root.iter('node'):
-            # Element özellikleri
-            text = elem.get('text', '')
-            content_desc = elem.get('content-desc', '')
-            resource_id = elem.get('resource-id', '')
-            class_name = elem.get('class', '')
-            clickable = elem.get('clickable', 'false')
-            bounds = elem.get('bounds', '')
+        for i in range(len(ui)):
+            text = ui.text(i)
             
             # Boş olmayanları kaydet
-            if text or content_desc or resource_id:
-                element_info = {
-                    'text': text,
-                    'content_desc': content_desc,
-                    'resource_id': resource_id,
-                    'class': class_name,
-                    'clickable': clickable == 'true',
-                    'bounds': bounds
-                }
-                all_elements.append(element_info)
+            if text or ui.desc(i) or ui.resource_id(i):
+                all_elements.append(i)
                 
                 # Tıklanabilir elementler
-                if clickable == 'true':
-                    clickable_elements.append(element_info)
+                if ui.has(i, 'clickable'):
+                    clickable_elements.append(i)
                 
                 # Text içeren elementler
                 if text:
-                    text_elements.append(element_info)
+                    text_elements.append(i)
                     
                     # Zaman formatı içerenler (0:15, 1:23 gibi)
                     if re.match(r'\d{1,2}:\d{2}', text):
-                        time_elements.append(element_info)
+                        time_elements.append(i)
         
         # 4. Sonuçları göster
         print(f"\n📊 ÖZET:")
-        print(f"• Toplam element: {len(list(root.iter('node')))}")
+        print(f"• Toplam element: {len(ui)}")
         print(f"• İçerikli element: {len(all_elements)}")
         print(f"• Tıklanabilir: {len(clickable_elements)}")
         print(f"• Text içeren: {len(text_elements)}")
@@ -100,31 +88,26 @@ def test_uiautomator():
         # 5. Önemli elementleri listele
         if time_elements:
             print(f"\n⏱️ ZAMAN İÇEREN ELEMENTLER:")
-            for elem in time_elements:
-                print(f"  • Text: '{elem['text']}'")
-                print(f"    Bounds: {elem['bounds']}")
-                print(f"    Class: {elem['class']}")
+            for i in time_elements:
+                print(f"  • Text: '{ui.text(i)}'")
+                print(f"    Bounds: {ui.bounds_str(i)}")
+                print(f"    Class: {ui.cls(i)}")
         
         print(f"\n📝 İLK 10 TEXT ELEMENT:")
-        for i, elem in enumerate(text_elements[:10], 1):
-            print(f"  {i}. '{elem['text'][:50]}{'...' if len(elem['text']) > 50 else ''}'")
-            if elem['resource_id']:
-                print(f"     ID: {elem['resource_id']}")
+        for n, i in enumerate(text_elements[:10], 1):
+            text = ui.text(i)
+            print(f"  {n}. '{text[:50]}{'...' if len(text) > 50 else ''}'")
+            if ui.resource_id(i):
+                print(f"     ID: {ui.resource_id(i)}")
         
         print(f"\n🎯 TIKLANABILIR ELEMENTLER (content-desc):")
         seen_descs = set()
-        for elem in clickable_elements:
-            if elem['content_desc'] and elem['content_desc'] not in seen_descs:
-                seen_descs.add(elem['content_desc'])
-                print(f"  • '{elem['content_desc']}'")
-                # Koordinatları parse et
-                if elem['bounds']:
-                    match = re.match(r'\[(\d+),(\d+)\]\[(\d+),(\d+)\]', elem['bounds'])
-                    if match:
-                        x1, y1, x2, y2 = map(int, match.groups())
-                        center_x = (x1 + x2) // 2
-                        center_y = (y1 + y2) // 2
-                        print(f"    Merkez: ({center_x}, {center_y})")
+        for i in clickable_elements:
+            content_desc = ui.desc(i)
+            if content_desc and content_desc not in seen_descs:
+                seen_descs.add(content_desc)
+                print(f"  • '{content_desc}'")
+                print(f"    Merkez: {ui.center(i)}")
         
         # 6. TikTok'a özel elementleri ara
         print(f"\n🎵 TIKTOK ÖZELLİKLERİ:")
@@ -132,18 +115,19 @@ def test_uiautomator():
                           'follow', 'Follow', 'music', 'Music', 'beğen', 'Beğen',
                           'yorum', 'Yorum', 'paylaş', 'Paylaş']
         
-        for elem in all_elements:
+        for i in all_elements:
+            content_desc, text, resource_id = ui.desc(i), ui.text(i), ui.resource_id(i)
             for keyword in tiktok_keywords:
-                if keyword in elem.get('content_desc', '').lower() or \
-                   keyword in elem.get('text', '').lower() or \
-                   keyword in elem.get('resource_id', '').lower():
+                if keyword in content_desc.lower() or \
+                   keyword in text.lower() or \
+                   keyword in resource_id.lower():
                     print(f"  ✓ {keyword.capitalize()} bulundu:")
-                    if elem['content_desc']:
-                        print(f"    Content-desc: '{elem['content_desc']}'")
-                    if elem['text']:
-                        print(f"    Text: '{elem['text']}'")
-                    if elem['resource_id']:
-                        print(f"    ID: '{elem['resource_id']}'")
+                    if content_desc:
+                        print(f"    Content-desc: '{content_desc}'")
+                    if text:
+                        print(f"    Text: '{text}'")
+                    if resource_id:
+                        print(f"    ID: '{resource_id}'")
                     break
         
         # 7. Ham XML örneği
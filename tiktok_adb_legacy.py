@@ -9,22 +9,51 @@ import subprocess
 import time
 import random
 import re
-import xml.etree.ElementTree as ET
 import os
 import json
 import math
 import shutil
+import signal
+import threading
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
+
+from adb_shell import AdbCommandResult, PersistentAdbShell, build_batch_script, parse_batch_output
+from adb_metrics import AdbMetrics, batch_key, classify
+from adb_wire import AdbWireClient
+from device_facts import TIKTOK_PACKAGES, DeviceFacts, choose_package, parse_version, parse_wm_size, version_command
+from dump_strategy_cache import DumpStrategyCache
+from keyword_matcher import KeywordMatcher
+from screencap import PNG_SIGNATURE, raw_to_png
+from screenshot_worker import ScreenshotWorker
+from ui_cache import GenerationCache, is_interaction
+from ui_fingerprint import UiFingerprint
+from ui_stream import VideoInfoStreamParser, parse_video_info
 
 class CompTIATikTokBot:
     def __init__(self):
         # ADB Path (override with ADB_PATH env var if provided)
         self.adb_path = os.getenv("ADB_PATH", "/mnt/c/Users/canga/Desktop/platform-tools/adb.exe")
-        
-        # Ekran boyutları
+        # ADB transport: 'subprocess' (one adb process per command),
+        # 'persistent' (single long-lived `adb shell` channel for shell commands) or
+        # 'wire' (talk to the adb server socket directly, no adb binary spawn)
+        self.adb_transport = os.getenv("ADB_TRANSPORT", "subprocess").strip().lower()
+        # Komut sınıfı başına sayaç/gecikme (session_report.json 'performance')
+        self.adb_metrics = AdbMetrics()
+        # ADB_ADAPTIVE_TIMEOUT=1 (varsayılan): timeout = sınıfın p99'u x 3 (min 2 sn, max eski sabit bütçe)
+        self.adaptive_timeouts = os.getenv("ADB_ADAPTIVE_TIMEOUT", "1") == "1"
+        self._adb_shell: Optional[PersistentAdbShell] = None
+        self._adb_wire: Optional[AdbWireClient] = None
+        
+        # Ekran boyutları (varsayılan; cihaz bilgisi önbelleğinden / `wm size`'dan güncellenir)
         self.screen_width = 1080
         self.screen_height = 2400
+        self.tiktok_package = os.getenv("TIKTOK_PACKAGE", TIKTOK_PACKAGES[0])
+        # Cihaz bilgisi önbelleği (serial + versionName başına, çalıştırmalar arası kalıcı)
+        self.device_facts: Optional[DeviceFacts] = None
+        self.device_facts_path = os.getenv("DEVICE_FACTS_CACHE", "cache/device_facts.json")
         
         # Real user interaction coordinates (from actual usage data)
         self.ui_elements = {
@@ -65,24 +94,8 @@ class CompTIATikTokBot:
             {'start_area': (850, 1600, 950, 1700), 'end_area': (950, 1250, 1050, 1350)},
         ]
         
-        # CompTIA anahtar kelimeleri (geniş liste)
-        self.comptia_keywords = [
-            # Sertifikalar
-            'comptia', 'security+', 'network+', 'a+', 'aplus', 'cysa+', 
-            'pentest+', 'linux+', 'cloud+', 'server+', 'project+',
-            # İlgili terimler
-            'certification', 'cert', 'exam', 'sy0-601', 'sy0-701', 'n10-008',
-            '220-1101', '220-1102', 'cs0-002', 'pt0-002', 
-            # Konu başlıkları
-            'cybersecurity', 'cyber security', 'network security', 'ethical hacking',
-            'penetration testing', 'incident response', 'vulnerability', 
-            'firewall', 'encryption', 'cryptography', 'malware', 'phishing',
-            'ports', 'protocols', 'tcp/ip', 'osi model', 'subnetting',
-            'troubleshooting', 'hardware', 'software', 'operating system',
-            # Eğitim
-            'study', 'tips', 'passed', 'failed', 'exam prep', 'practice test',
-            'bootcamp', 'course', 'tutorial', 'learn', 'it career'
-        ]
+        # CompTIA anahtar kelimeleri: keywords.json 'legacy' profili, token sınırlı tek geçiş
+        self.keyword_matcher = KeywordMatcher.from_config('legacy')
         
         # Davranış parametreleri
         self.behavior_params = {
@@ -138,6 +151,38 @@ class CompTIATikTokBot:
         self.interaction_count = 0  # Etkileşim sayısı
         self._preflight_done = False
 
+        # UI dump strateji önbelleği (cihaz serial'ı başına, çalıştırmalar arası kalıcı)
+        self.device_serial: Optional[str] = None
+        self.dump_cache: Optional[DumpStrategyCache] = None
+        self.dump_cache_path = os.getenv("DUMP_STRATEGY_CACHE", "cache/dump_strategies.json")
+        # DUMP_RACE=1: uygun dump stratejilerini paralel yarıştır, ilk geçerli XML kazanır
+        self.dump_race = os.getenv("DUMP_RACE", "0") == "1"
+        # SCREENCAP_MODE: png (cihazda encode, varsayılan) | raw (RGBA aktar, host'ta PNG'ye çevir)
+        self.screencap_mode = os.getenv("SCREENCAP_MODE", "png").strip().lower()
+        self.dump_strategies = {
+            'file_compressed': lambda: self._dump_via_file(
+                ['uiautomator', 'dump', '--compressed', '/sdcard/ui_dump.xml'], '/sdcard/ui_dump.xml'),
+            'default_compressed': lambda: self._dump_via_file(
+                ['uiautomator', 'dump', '--compressed'], '/sdcard/window_dump.xml'),
+            'exec_out_tty': self._dump_via_exec_out,
+            'file_uncompressed': lambda: self._dump_via_file(
+                ['uiautomator', 'dump', '/sdcard/ui_dump.xml'], '/sdcard/ui_dump.xml'),
+        }
+        # UI okumaları etkileşim nesline göre önbelleklenir (tap/swipe/keyevent nesli ilerletir)
+        self.ui_cache = GenerationCache()
+        # Son başarılı dump'ın yapısal parmak izi (açıklama/yazar/sayaç bölgeleri)
+        self.last_fingerprint: Optional[UiFingerprint] = None
+        # run_session'ın mevcut video için aldığı (video_info, parmak izi); swipe "before" olarak kullanır
+        self.current_video: Optional[Tuple[Dict[str, str], Optional[UiFingerprint]]] = None
+        
+        # Beğeni screenshot'ları: ekran belleğe alınır, encode + diske yazma arka planda
+        # SCREENSHOT_FORMAT: png | webp (Pillow gerekir), SCREENSHOT_QUEUE_MB: kuyruk bellek sınırı
+        self.screenshot_worker = ScreenshotWorker(
+            max_pending_bytes=int(os.getenv("SCREENSHOT_QUEUE_MB", "64")) * 1024 * 1024,
+            image_format=os.getenv("SCREENSHOT_FORMAT", "png"),
+            log=self.log,
+        )
+
     def setup_session_folder(self):
         """Session için klasör oluştur ve log dosyası başlat"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -185,24 +230,87 @@ class CompTIATikTokBot:
             except:
                 pass
 
+    def adb_timeout(self, name: str, ceiling: float) -> float:
+        """Komut sınıfının öğrenilmiş timeout'u (ceiling = eski sabit bütçe)"""
+        if not self.adaptive_timeouts:
+            return ceiling
+        return self.adb_metrics.timeout_for(name, ceiling)
+
+    def _exec_adb(self, command: List[str], timeout: float, text: bool = True,
+                  metric: Optional[str] = None, adaptive: bool = True) -> subprocess.CompletedProcess:
+        """Run an adb command on the selected transport (raises like subprocess.run), timing it per command class"""
+        name = metric or classify(command)
+        if is_interaction(command):
+            self.ui_cache.bump()
+        if adaptive:
+            timeout = self.adb_timeout(name, timeout)
+        started = time.monotonic()
+        try:
+            result = self._exec_adb_transport(command, timeout, text)
+        except subprocess.TimeoutExpired:
+            self.adb_metrics.record(name, time.monotonic() - started, ok=False, timed_out=True)
+            raise
+        except Exception:
+            self.adb_metrics.record(name, time.monotonic() - started, ok=False)
+            raise
+        self.adb_metrics.record(name, time.monotonic() - started, ok=result.returncode == 0)
+        return result
+
+    def _exec_adb_transport(self, command: List[str], timeout: float, text: bool) -> subprocess.CompletedProcess:
+        if self.adb_transport == 'persistent' and len(command) > 1 and command[0] == 'shell':
+            if self._adb_shell is None:
+                self._adb_shell = PersistentAdbShell(self.adb_path)
+            return self._adb_shell.run(command[1:], timeout=timeout, text=text)
+        if self.adb_transport == 'wire' and AdbWireClient.handles(command):
+            if self._adb_wire is None:
+                self._adb_wire = AdbWireClient()
+            return self._adb_wire.run(command, timeout=timeout, text=text)
+        return self._spawn_adb_call(command, text=text)[0](timeout)
+
+    def close_adb(self):
+        """Persistent shell kanalını kapat"""
+        if self._adb_shell is not None:
+            self._adb_shell.close()
+            self._adb_shell = None
+
     def run_adb(self, command: List[str]) -> Optional[str]:
         """ADB komutu çalıştır ve çıktıyı döndür"""
-        full_command = [self.adb_path] + command
         try:
-            result = subprocess.run(full_command, capture_output=True, text=True, timeout=15)
+            result = self._exec_adb(command, timeout=15)
             if result.returncode == 0:
                 return result.stdout
             return None
         except:
             return None
     
+    def run_adb_bytes(self, command: List[str], timeout: float = 15) -> Optional[memoryview]:
+        """ADB komutu çalıştır, stdout'u decode etmeden döndür (binary: screencap, dump, dosya)"""
+        try:
+            result = self._exec_adb(command, timeout=timeout, text=False)
+            if result.returncode == 0:
+                return memoryview(result.stdout)
+            return None
+        except:
+            return None
+
+    def pull_bytes(self, remote_path: str, timeout: float = 15) -> Optional[memoryview]:
+        """Cihazdaki dosyayı belleğe çek (wire: sync RECV, diğerleri: exec-out cat)"""
+        if self.adb_transport == 'wire':
+            if self._adb_wire is None:
+                self._adb_wire = AdbWireClient()
+            try:
+                return memoryview(self._adb_wire.pull_bytes(remote_path, timeout=timeout))
+            except Exception:
+                return None
+        return self.run_adb_bytes(['exec-out', 'cat', remote_path], timeout=timeout)
+
     def run_adb_with_longer_timeout(self, command: List[str]) -> Optional[str]:
         """ADB komutu uzun timeout ile çalıştır - detailed debug"""
-        full_command = [self.adb_path] + command
         self.log(f"🔧 ADB command: {' '.join(command)}")
         
         try:
-            result = subprocess.run(full_command, capture_output=True, text=True, timeout=30)
+            # Uzun/tek seferlik komutlar (dumpsys activity top): öğrenilmiş timeout uygulanmaz
+            result = self._exec_adb(command, timeout=30, adaptive=False)
             self.log(f"📊 ADB result: return_code={result.returncode}")
             
             if result.stdout:
@@ -221,15 +329,39 @@ class CompTIATikTokBot:
                 self.log(f"❌ Command failed with code {result.returncode}")
                 return None
                 
-        except subprocess.TimeoutExpired:
-            self.log("⏱️ ADB command timed out after 30 seconds")
+        except subprocess.TimeoutExpired as e:
+            self.log(f"⏱️ ADB command timed out after {e.timeout:g} seconds")
             return None
         except Exception as e:
             self.log(f"❌ ADB exception: {type(e).__name__}: {e}")
             return None
 
+    def run_adb_batch(self, commands: List[List[str]], timeout: float = 30) -> Optional[List[AdbCommandResult]]:
+        """Birden fazla shell komutunu tek round trip'te çalıştır (komut başına stdout/exit code/süre)"""
+        token = uuid.uuid4().hex[:12]
+        script = build_batch_script(commands, token)
+        if any(is_interaction(c) for c in commands):
+            self.ui_cache.bump()
+        if self.adaptive_timeouts:
+            timeout = self.adb_metrics.batch_timeout([classify(c) for c in commands], timeout)
+        try:
+            result = self._exec_adb(['shell', script], timeout=timeout, text=False, metric='batch', adaptive=False)
+        except subprocess.TimeoutExpired:
+            self.log(f"⏱️ ADB batch timed out after {timeout:g} seconds ({len(commands)} komut)")
+            return None
+        except Exception as e:
+            self.log(f"❌ ADB batch exception: {type(e).__name__}: {e}")
+            return None
+        results = parse_batch_output(commands, token, result.stdout or b'', result.stderr or b'')
+        # Cihazda ölçülen (round trip'siz) süreler ayrı pencerede: tekil komutların timeout'unu düşürmesin
+        for r in results:
+            self.adb_metrics.record(batch_key(classify(r.command)), r.duration, r.ok)
+        if len(results) < len(commands):
+            self.log(f"⚠️ ADB batch incomplete: {len(results)}/{len(commands)} komut (code={result.returncode})")
+        return results
+
     def take_screenshot(self, filename: str) -> bool:
-        """Screenshot al ve session klasörüne kaydet"""
+        """Screenshot al ve exec-out ile doğrudan session klasörüne akıt (cihazda temp dosya yok)"""
         self.log(f"📸 Screenshot alınıyor: {filename}")
         
         if not self.session_folder:
@@ -242,45 +374,96 @@ class CompTIATikTokBot:
             self.log(f"📁 Screenshots klasörü oluşturuluyor: {screenshots_dir}")
             os.makedirs(screenshots_dir, exist_ok=True)
         
-        # Telefonda screenshot al
-        screenshot_path = f"/sdcard/temp_screenshot.png"
-        self.log(f"📱 ADB screencap komutu çalıştırılıyor...")
+        local_path = f"{screenshots_dir}/{filename}"
+        part_path = local_path + '.part'
+        # SCREENCAP_MODE=raw: cihaz PNG encode etmez, RGBA burada zlib ile PNG'ye çevrilir
+        raw = self.screencap_mode == 'raw'
+        command = ['exec-out', 'screencap'] if raw else ['exec-out', 'screencap', '-p']
+        self.log(f"📱 ADB {' '.join(command)} -> {local_path}")
         
-        screencap_result = self.run_adb(['shell', 'screencap', '-p', screenshot_path])
-        # screencap başarılı olduğunda boş string döndürür, None hatada
-        if screencap_result is None:
-            self.log("❌ ADB screencap başarısız!")
+        started = time.monotonic()
+        received = 0
+        try:
+            if raw:
+                buf = bytearray()
+                for chunk in self._stream_adb(command, timeout=30):
+                    buf += chunk
+                received = len(buf)
+                png = raw_to_png(buf)
+                with open(part_path, 'wb') as f:
+                    f.write(png)
+            else:
+                head = b''
+                with open(part_path, 'wb') as f:
+                    for chunk in self._stream_adb(command, timeout=30):
+                        if len(head) < len(PNG_SIGNATURE):
+                            head += bytes(chunk[:len(PNG_SIGNATURE) - len(head)])
+                        f.write(chunk)
+                        received += len(chunk)
+                if head != PNG_SIGNATURE:
+                    raise ValueError(f"PNG değil ({received} bytes)")
+            os.replace(part_path, local_path)
+        except subprocess.TimeoutExpired as e:
+            self.log(f"⏱️ ADB screencap timed out after {e.timeout:g} seconds")
+            self._remove_quietly(part_path)
             return False
-        else:
-            self.log("✅ ADB screencap başarılı")
-        
-        time.sleep(0.5)
-        
-        # PC'ye çek
-        local_path = f"{self.session_folder}/screenshots/{filename}"
-        self.log(f"💾 Dosya çekiliyor: {screenshot_path} -> {local_path}")
-        
-        pull_result = self.run_adb(['pull', screenshot_path, local_path])
-        # pull başarılı olduğunda output döndürür, None hatada
-        if pull_result is None:
-            self.log("❌ ADB pull başarısız!")
+        except Exception as e:
+            self.log(f"❌ ADB screencap başarısız: {type(e).__name__}: {e}")
+            self._remove_quietly(part_path)
             return False
-        else:
-            self.log("✅ ADB pull başarılı")
         
-        # Dosya var mı kontrol et
-        if os.path.exists(local_path):
-            file_size = os.path.getsize(local_path)
-            self.log(f"✅ Screenshot kaydedildi: {filename} ({file_size} bytes)")
-        else:
-            self.log(f"❌ Screenshot dosyası bulunamadı: {local_path}")
-            return False
+        elapsed = time.monotonic() - started
+        file_size = os.path.getsize(local_path)
+        rate = received / elapsed / 1e6 if elapsed > 0 else 0.0
+        self.log(f"✅ Screenshot kaydedildi: {filename} ({file_size} bytes, "
+                 f"{received} bytes alındı, {elapsed:.2f}s, {rate:.1f} MB/s)")
+        return True
+
+    def submit_screenshot(self, filename: str) -> Optional[str]:
+        """Ekranı belleğe al, encode + yazmayı worker'a bırak; dosyanın yazılacağı adı döndür"""
+        if not self.session_folder:
+            self.log("❌ Session folder yok!")
+            return None
         
-        # Telefondaki temp dosyayı sil
-        self.run_adb(['shell', 'rm', screenshot_path])
+        raw = self.screencap_mode == 'raw'
+        command = ['exec-out', 'screencap'] if raw else ['exec-out', 'screencap', '-p']
+        started = time.monotonic()
+        buf = bytearray()
+        try:
+            for chunk in self._stream_adb(command, timeout=30):
+                buf += chunk
+        except subprocess.TimeoutExpired as e:
+            self.log(f"⏱️ ADB screencap timed out after {e.timeout:g} seconds")
+            return None
+        except Exception as e:
+            self.log(f"❌ ADB screencap başarısız: {type(e).__name__}: {e}")
+            return None
+        if not buf or (not raw and not buf.startswith(PNG_SIGNATURE)):
+            self.log(f"❌ ADB screencap başarısız ({len(buf)} bytes)")
+            return None
         
-        return True
+        screenshots_dir = f"{self.session_folder}/screenshots"
+        os.makedirs(screenshots_dir, exist_ok=True)
+        path, _ = self.screenshot_worker.submit(f"{screenshots_dir}/{filename}", buf, raw=raw)
+        elapsed = time.monotonic() - started
+        self.log(f"📸 Screenshot yakalandı: {os.path.basename(path)} ({len(buf)} bytes, {elapsed:.2f}s, "
+                 f"kuyrukta {self.screenshot_worker.pending})")
+        return os.path.basename(path)
 
+    def flush_screenshots(self):
+        """Kuyruktaki screenshot'ların diske yazılmasını bekle"""
+        pending = self.screenshot_worker.pending
+        if pending:
+            self.log(f"⏳ {pending} screenshot yazılıyor...")
+        self.screenshot_worker.flush()
+
+    @staticmethod
+    def _remove_quietly(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    
     def tap(self, x: int, y: int, pressure: str = "normal") -> bool:
         """Advanced human-like tap simulation with learning and adaptation"""
         self.interaction_count += 1
@@ -584,8 +767,14 @@ class CompTIATikTokBot:
         max_duration = 200 if swipe_distance < 400 else 500
         final_duration = max(min_duration, min(final_duration, max_duration))
         
-        # Get current video info before swipe for validation
-        video_info_before = self.get_video_description()
+        # Before state for validation: reuse run_session's dump of this video when available
+        if self.current_video is not None:
+            video_info_before, fingerprint_before = self.current_video
+            self.current_video = None
+            self.log(f"♻️ Swipe öncesi durum: mevcut video dump'ı kullanılıyor ({fingerprint_before})")
+        else:
+            video_info_before = self.get_video_description()
+            fingerprint_before = self.last_fingerprint
         
         # Execute the swipe
         swipe_result = self.run_adb(['shell', 'input', 'swipe', 
@@ -601,7 +790,7 @@ class CompTIATikTokBot:
             time.sleep(1.5)  # Daha uzun bekleme
             
             # Check if video actually changed
-            video_changed = self.validate_video_change(video_info_before)
+            video_changed = self.validate_video_change(video_info_before, fingerprint_before)
             
             if not video_changed:
                 self.log("⚠️ Video didn't change - trying ONE more faster swipe")
@@ -622,7 +811,7 @@ class CompTIATikTokBot:
                     time.sleep(1.8)  # İkinci swipe için daha uzun bekleme
                     
                     # Son validation - eğer yine başarısızsa devam et
-                    video_changed = self.validate_video_change(video_info_before)
+                    video_changed = self.validate_video_change(video_info_before, fingerprint_before)
                     if not video_changed:
                         self.log("⏭️ Proceeding anyway - may be UI parsing issue")
                         video_changed = True  # Force continue to avoid infinite loop
@@ -646,12 +835,33 @@ class CompTIATikTokBot:
         
         return success
     
-    def validate_video_change(self, previous_video_info: Dict[str, str]) -> bool:
+    def validate_video_change(self, previous_video_info: Dict[str, str],
+                              previous_fingerprint: Optional[UiFingerprint] = None) -> bool:
         """Check if video actually changed by comparing UI elements"""
         try:
             # Get current video info with fresh dump
             current_video_info = self.get_video_description()
             
+            # Structural fingerprints: per-region hash compare, no field-by-field guessing
+            current_fingerprint = self.last_fingerprint
+            if previous_fingerprint is not None and current_fingerprint is not None:
+                diff = previous_fingerprint.diff(current_fingerprint)
+                if not diff:
+                    self.log("📹 No UI regions found - assuming video changed")
+                    return True
+                same = previous_fingerprint.same_video(current_fingerprint)
+                if same is None:
+                    # Açıklama yok: yazar + sayaçlar birlikte karar verir
+                    same = not any(diff.values())
+                changed_regions = [region for region, moved in diff.items() if moved]
+                if same:
+                    self.log(f"⚠️ No video change detected - fingerprint match "
+                             f"(changed regions: {', '.join(changed_regions) or 'none'})")
+                else:
+                    self.log(f"✅ Video change confirmed! Changed regions: {', '.join(changed_regions)}")
+                return not same
+            
+            # Dump başarısız (alternatif yöntem): parmak izi yok, alan karşılaştırması
             # Debug: Show what we got
             self.log(f"🔍 Comparing videos:")
             self.log(f"   Before: desc='{previous_video_info.get('description', '')[:20]}...', user='{previous_video_info.get('username', '')}', likes='{previous_video_info.get('likes', '')}'")
@@ -755,156 +965,69 @@ class CompTIATikTokBot:
 
     def get_video_description(self) -> Dict[str, str]:
         """UIAutomator ile video açıklamasını al (gelişmiş, dayanıklı yöntemler)."""
+        cached = self.ui_cache.get('video_info')
+        if cached is not None:
+            video_info, self.last_fingerprint = cached
+            self.log(f"♻️ UI cache hit (nesil {self.ui_cache.generation}, etkileşim yok): dump atlandı")
+            return dict(video_info)
+        
         self.log("🔍 UI dump alınıyor...")
         
-        # Cihazı dump için hazırlamaya çalış (tek sefer)
+        # Cihazı dump için hazırlamaya çalış (tek sefer, tek round trip)
         if not self._preflight_done:
             try:
-                self.log("🧰 Preflight: ekran açık + animasyonlar kapalı")
-                self.run_adb(['shell', 'input', 'keyevent', '224'])  # WAKEUP
-                self.run_adb(['shell', 'svc', 'power', 'stayon', 'true'])
-                self.run_adb(['shell', 'settings', 'put', 'global', 'window_animation_scale', '0'])
-                self.run_adb(['shell', 'settings', 'put', 'global', 'transition_animation_scale', '0'])
-                self.run_adb(['shell', 'settings', 'put', 'global', 'animator_duration_scale', '0'])
-                self.run_adb(['shell', 'am', 'broadcast', '-a', 'android.intent.action.CLOSE_SYSTEM_DIALOGS'])
+                commands = [['input', 'keyevent', '224']]  # WAKEUP
+                if self.device_facts is not None and self.device_facts.get('preflight_done'):
+                    # Ayarlar cihazda kalıcı: önceki çalıştırmada uygulandı
+                    self.log("🧰 Preflight: ekran açık (ayarlar önbellekte: uygulanmış)")
+                else:
+                    self.log("🧰 Preflight: ekran açık + animasyonlar kapalı")
+                    commands += [
+                        ['svc', 'power', 'stayon', 'true'],
+                        ['settings', 'put', 'global', 'window_animation_scale', '0'],
+                        ['settings', 'put', 'global', 'transition_animation_scale', '0'],
+                        ['settings', 'put', 'global', 'animator_duration_scale', '0'],
+                    ]
+                commands.append(['am', 'broadcast', '-a', 'android.intent.action.CLOSE_SYSTEM_DIALOGS'])
+                results = self.run_adb_batch(commands, timeout=15)
+                if results is not None:
+                    failed = [r.command for r in results if not r.ok]
+                    if failed:
+                        self.log(f"⚠️ Preflight: {len(failed)} komut başarısız: {', '.join(failed)}")
+                    elif self.device_facts is not None:
+                        self.device_facts.update(preflight_done=True)
                 self._preflight_done = True
             except Exception as e:
                 self.log(f"Preflight error ignored: {e}")
         
-        # Önceki dump'ları temizle (hem custom hem default path)
-        self.run_adb(['shell', 'rm', '-f', '/sdcard/ui_dump.xml'])
-        self.run_adb(['shell', 'rm', '-f', '/sdcard/window_dump.xml'])
-        time.sleep(0.15)
-        
-        xml_content: Optional[str] = None
-        
-        # Strateji 1: --compressed ile özel dosyaya yaz
-        for attempt in range(3):
-            self.log(f"🔄 UI dump deneme {attempt + 1}/3 (compressed -> file)...")
-            dump_result = self.run_adb_with_longer_timeout([
-                'shell', 'uiautomator', 'dump', '--compressed', '/sdcard/ui_dump.xml'
-            ])
-            if dump_result is not None:
-                # Dosya oluştu mu?
-                file_check = self.run_adb(['shell', 'test', '-f', '/sdcard/ui_dump.xml'])
-                if file_check is not None:
-                    # Dosyayı oku
-                    xml_content = self.run_adb(['shell', 'cat', '/sdcard/ui_dump.xml'])
-                    if xml_content:
-                        self.log("✅ UI dump başarılı (compressed/file)")
-                        break
-                else:
-                    self.log("❌ Dump başarılı görünüyor ama dosya bulunamadı")
-            else:
-                self.log(f"❌ UI dump deneme {attempt + 1} başarısız (code/loglara bak)")
-            if attempt < 2:
-                time.sleep(1.2)
-        
-        # Strateji 2: --compressed ile default path (window_dump.xml)
-        if not xml_content:
-            self.log("📱 Fallback: uiautomator dump --compressed (default path)")
-            r = self.run_adb_with_longer_timeout(['shell', 'uiautomator', 'dump', '--compressed'])
-            if r is not None:
-                xml_content = self.run_adb(['shell', 'cat', '/sdcard/window_dump.xml'])
-                if xml_content:
-                    self.log("✅ UI dump başarılı (compressed/default)")
-        
-        # Strateji 3: exec-out ile direkt stdout'a yaz (en güvenilir)
-        if not xml_content:
-            self.log("📡 Fallback: exec-out uiautomator dump --compressed /dev/tty")
-            r = self.run_adb_with_longer_timeout(['exec-out', 'uiautomator', 'dump', '--compressed', '/dev/tty'])
-            # exec-out başarılı olduğunda stdout'ta XML gelir
-            if r and '<hierarchy' in r:
-                xml_content = r
-                self.log("✅ UI dump başarılı (exec-out/stdout)")
-        
-        # Strateji 4: compressed olmadan son deneme (eski cihazlar)
-        if not xml_content:
-            self.log("🧪 Fallback: uiautomator dump (no --compressed)")
-            r = self.run_adb_with_longer_timeout(['shell', 'uiautomator', 'dump', '/sdcard/ui_dump.xml'])
-            if r is not None:
-                xml_content = self.run_adb(['shell', 'cat', '/sdcard/ui_dump.xml'])
-                if xml_content:
-                    self.log("✅ UI dump başarılı (uncompressed/file)")
+        generation = self.ui_cache.generation
+        parser = self._run_dump_strategies()
         
         # Hâlâ başarısızsa alternatif yöntemlere geç
-        if not xml_content:
+        if parser is None:
+            self.last_fingerprint = None
             self.log("❌ Tüm UI dump yöntemleri başarısız")
             self.log("🔄 Alternatif yöntem deneniyor...")
             return self.get_video_info_alternative()
         
         time.sleep(0.5)  # UI stabilize olsun
         
-        # XML içeriği boş mu?
-        if not xml_content.strip():
-            self.log("❌ UI dump boş")
-            return {'description': '', 'username': '', 'likes': ''}
-        
-        self.log(f"✅ UI dump başarılı ({len(xml_content)} karakter)")
+        early = ", erken çıkış" if parser.done else ""
+        self.log(f"✅ UI dump başarılı ({parser.bytes_read} byte okundu{early})")
+        self.log(f"📊 UI Analysis: {parser.total_nodes} nodes parsed, {parser.text_nodes} with text")
+        # Erken çıkışta ağaç chunk'a göre farklı yerde kesilir: yalnızca parser'ın incelediği node'lar
+        self.last_fingerprint = UiFingerprint.of(parser.hierarchy, parser.total_nodes)
+        self.ui_cache.put('video_info', (dict(parser.video_info), self.last_fingerprint), generation)
+        
+        # Show first few texts for debugging
+        if parser.debug_texts:
+            self.log("📝 Found texts (first 5):")
+            for i, item in enumerate(parser.debug_texts):
+                self.log(f"   {i+1}. '{item['text'][:30]}...' (id: {item['resource_id'][:20]}...)")
+        else:
+            self.log("⚠️ No text elements found in UI!")
         
-        video_info = {
-            'description': '',
-            'username': '',
-            'likes': '',
-            'music': ''
-        }
-        
-        try:
-            root = ET.fromstring(xml_content)
-            
-            # Collect all text elements for more robust parsing
-            all_texts = []
-            total_nodes = 0
-            
-            for elem in root.iter('node'):
-                total_nodes += 1
-                resource_id = elem.get('resource-id', '')
-                text = elem.get('text', '')
-                content_desc = elem.get('content-desc', '')
-                class_name = elem.get('class', '')
-                
-                if text and len(text.strip()) > 0:
-                    all_texts.append({
-                        'text': text,
-                        'resource_id': resource_id,
-                        'content_desc': content_desc,
-                        'class': class_name
-                    })
-            
-            self.log(f"📊 UI Analysis: {total_nodes} total nodes, {len(all_texts)} with text")
-            
-            # Show first few texts for debugging
-            if len(all_texts) > 0:
-                self.log("📝 Found texts (first 5):")
-                for i, item in enumerate(all_texts[:5]):
-                    self.log(f"   {i+1}. '{item['text'][:30]}...' (id: {item['resource_id'][:20]}...)")
-            else:
-                self.log("⚠️ No text elements found in UI!")
-            
-            # Enhanced parsing logic
-            for item in all_texts:
-                text = item['text']
-                resource_id = item['resource_id']
-                content_desc = item['content_desc']
-                
-                # Look for username patterns (starts with @)
-                if text.startswith('@') and not video_info['username']:
-                    video_info['username'] = text
-                
-                # Look for like count patterns (numbers with K, M, or just digits)
-                elif re.match(r'^\d+[KMB]?$', text.replace(',', '')) and not video_info['likes']:
-                    video_info['likes'] = text
-                
-                # Look for description text (longer text without @ or numbers)
-                elif len(text) > 10 and not text.startswith('@') and not re.match(r'^\d+[KMB]?$', text.replace(',', '')) and not video_info['description']:
-                    video_info['description'] = text.lower()
-                
-                # Music info from content descriptions
-                if 'sound' in content_desc.lower() or 'music' in content_desc.lower():
-                    video_info['music'] = content_desc
-                    
-        except Exception as e:
-            self.log(f"❌ XML parsing error: {e}")
+        video_info = parser.video_info
         
         # Parsing sonuçlarını logla
         self.log("📋 Video info parsed:")
@@ -913,48 +1036,346 @@ class CompTIATikTokBot:
         self.log(f"   ❤️ Likes: '{video_info.get('likes', 'NONE')}'")
         self.log(f"   🎵 Music: '{video_info.get('music', 'NONE')[:30]}...'")
         
-        # Temizlik
-        self.run_adb(['shell', 'rm', '-f', '/sdcard/ui_dump.xml'])
-        self.run_adb(['shell', 'rm', '-f', '/sdcard/window_dump.xml'])
-        
         return video_info
     
+    def get_device_serial(self) -> str:
+        """Cihaz serial'ı (ANDROID_SERIAL veya adb get-serialno), tek sefer"""
+        if self.device_serial is None:
+            serial = os.getenv("ANDROID_SERIAL", "").strip()
+            if not serial:
+                serial = (self.run_adb(['get-serialno']) or '').strip()
+            self.device_serial = serial or 'unknown'
+        return self.device_serial
+
+    def load_device_facts(self):
+        """Cihaz bilgilerini önbellekten al; TikTok sürümü değiştiyse yeniden keşfet (tek batch)."""
+        self.device_facts = DeviceFacts(self.device_facts_path, self.get_device_serial())
+        candidates = list(dict.fromkeys([self.tiktok_package] + TIKTOK_PACKAGES))
+        need_size = self.device_facts.screen_size() is None
+        commands = [version_command(pkg) for pkg in candidates] + ([['wm', 'size']] if need_size else [])
+        results = self.run_adb_batch(commands, timeout=15) or []
+        versions = {}
+        for pkg, r in zip(candidates, results):
+            version = parse_version(r.stdout)
+            if version:
+                versions[pkg] = version
+        # Açık TIKTOK_PACKAGE önbellekteki paketi ezer (locator bot ile aynı öncelik)
+        package = choose_package(list(versions), os.getenv("TIKTOK_PACKAGE") or self.device_facts.get('package'))
+        if package is None:
+            self.log("⚠️ TikTok paketi/sürümü okunamadı; varsayılanlar kullanılıyor")
+            return
+        if not self.device_facts.check_version(versions[package]):
+            if self.device_facts.invalidated:
+                self.log(f"🔄 TikTok sürümü değişti ({self.device_facts.invalidated}): cihaz bilgileri yenilendi")
+            need_size = True
+        size = self.device_facts.screen_size()
+        if need_size:
+            if len(results) > len(candidates):
+                size = parse_wm_size(results[len(candidates)].stdout)
+            else:
+                size = parse_wm_size(self.run_adb(['shell', 'wm', 'size']) or '')
+        self.device_facts.update(package=package, screen=list(size) if size else None)
+        self.tiktok_package = package
+        if size:
+            self.screen_width, self.screen_height = size
+        self.log(f"📱 Cihaz: {self.device_serial} | {package} v{versions[package]} | "
+                 f"{self.screen_width}x{self.screen_height}")
+
+    def _run_dump_strategies(self) -> Optional[VideoInfoStreamParser]:
+        """Dump stratejilerini önbellekteki sıraya göre dene (en hızlı çalışan önce)"""
+        if self.dump_cache is None:
+            # Cihaz + TikTok sürümü başına: güncelleme sonrası sıralama sıfırdan öğrenilir
+            version = self.device_facts.get('version') if self.device_facts is not None else None
+            self.dump_cache = DumpStrategyCache(self.dump_cache_path, self.get_device_serial(), version=version)
+        
+        ordered = self.dump_cache.order(list(self.dump_strategies))
+        skipped = [name for name in self.dump_strategies if name not in ordered]
+        if skipped:
+            self.log(f"⛔ Circuit açık, atlanıyor: {', '.join(skipped)}")
+        
+        if self.dump_race:
+            racers = [name for name in ordered if name in self.race_commands]
+            if len(racers) > 1:
+                xml_content = self._race_dump_strategies(racers)
+                parser = parse_video_info(xml_content) if xml_content else None
+                if parser is not None and parser.valid:
+                    return parser
+                # Yarışta olmayan stratejilerle seri devam et
+                ordered = [name for name in ordered if name not in racers]
+                if not ordered:
+                    return None
+        
+        # Tek tur: her strateji bir kez; hepsi başarısızsa en iyisini 1.2 sn sonra bir kez daha dene
+        attempts = ordered + ordered[:1]
+        for i, name in enumerate(attempts):
+            if i == len(ordered):
+                time.sleep(1.2)
+            self.log(f"🔄 UI dump: {name} ({i + 1}/{len(attempts)})...")
+            started = time.monotonic()
+            parser = self.dump_strategies[name]()
+            elapsed = time.monotonic() - started
+            self.dump_cache.record(name, parser is not None, elapsed)
+            if parser is not None:
+                self.log(f"✅ UI dump başarılı ({name}, {elapsed:.2f}s)")
+                return parser
+            self.log(f"❌ UI dump başarısız ({name}, {elapsed:.2f}s)")
+        return None
+
+    # Yarış modunda her stratejinin kendi hedef dosyası var (birbirinin dosyasını ezmesin)
+    race_commands = {
+        'file_compressed': ['shell', 'uiautomator dump --compressed /sdcard/ui_dump_race.xml >/dev/null'
+                                     ' && cat /sdcard/ui_dump_race.xml; rm -f /sdcard/ui_dump_race.xml'],
+        'default_compressed': ['shell', 'uiautomator dump --compressed >/dev/null'
+                                        ' && cat /sdcard/window_dump.xml; rm -f /sdcard/window_dump.xml'],
+        'exec_out_tty': ['exec-out', 'uiautomator', 'dump', '--compressed', '/dev/tty'],
+    }
+    # Yarıda kesilen yarışçının cihazda kalabilecek dosyası (exec-out dosya yazmaz)
+    race_files = {
+        'file_compressed': '/sdcard/ui_dump_race.xml',
+        'default_compressed': '/sdcard/window_dump.xml',
+    }
+
+    def _start_adb_call(self, command: List[str]):
+        """İptal edilebilir adb çağrısı başlat: (wait(timeout) -> CompletedProcess, cancel()) döndürür"""
+        wait_fn, cancel_fn = self._spawn_adb_call(command)
+        name = classify(command)
+        started = time.monotonic()
+        cancelled = threading.Event()
+
+        def _cancel():
+            cancelled.set()
+            cancel_fn()
+
+        def _wait(timeout):
+            timeout = self.adb_timeout(name, timeout)
+            ok, timed_out = False, False
+            try:
+                result = wait_fn(timeout)
+                ok = result.returncode == 0
+                return result
+            except subprocess.TimeoutExpired:
+                timed_out = True
+                raise
+            finally:
+                # Yarışı kaybedip iptal edilenler ölçüme girmez
+                if not cancelled.is_set():
+                    self.adb_metrics.record(name, time.monotonic() - started, ok, timed_out)
+        return _wait, _cancel
+
+    def _spawn_adb_call(self, command: List[str], text: bool = False):
+        """adb sürecini kendi süreç grubunda başlat; timeout/iptalde tüm grup öldürülür"""
+        if self.adb_transport == 'wire' and AdbWireClient.handles(command):
+            client = AdbWireClient()
+            return (lambda timeout: client.run(command, timeout=timeout, text=text)), client.abort
+        # persistent kanal seri çalışır; yarışta her strateji kendi adb sürecini kullanır
+        proc = subprocess.Popen([self.adb_path] + command, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, text=text, start_new_session=True)
+
+        def _cancel():
+            self._kill_process_group(proc)
+
+        def _wait(timeout):
+            try:
+                out, err = proc.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                _cancel()
+                proc.communicate()
+                raise
+            except BaseException:
+                # Ctrl+C ayrı süreç grubuna ulaşmaz: adb'yi yetim bırakma
+                _cancel()
+                try:
+                    proc.wait(timeout=1)
+                except Exception:
+                    pass
+                raise
+            return subprocess.CompletedProcess([self.adb_path] + command, proc.returncode, out, err)
+        return _wait, _cancel
+
+    @staticmethod
+    def _kill_process_group(proc: subprocess.Popen):
+        """Tüm süreç grubunu öldür (torun süreçler pipe'ı açık tutmasın)"""
+        if proc.poll() is not None:
+            return
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError, AttributeError):
+            proc.kill()
+
+    def _stream_adb(self, command: List[str], timeout: float):
+        """adb stdout'unu geldikçe parça parça üret; generator kapatılınca süreç/soket de kapanır"""
+        name = classify(command)
+        timeout = self.adb_timeout(name, timeout)
+        started = time.monotonic()
+        ok, timed_out = False, False
+        try:
+            yield from self._stream_adb_transport(command, timeout)
+            ok = True
+        except GeneratorExit:
+            # Çağıran erken bıraktı (ör. parser işini bitirdi): başarılı sayılır
+            ok = True
+            raise
+        except (subprocess.TimeoutExpired, TimeoutError):
+            timed_out = True
+            raise
+        finally:
+            self.adb_metrics.record(name, time.monotonic() - started, ok, timed_out)
+
+    def _stream_adb_transport(self, command: List[str], timeout: float):
+        if self.adb_transport == 'wire' and len(command) > 1 and command[0] == 'exec-out':
+            yield from AdbWireClient().stream_exec(' '.join(command[1:]), timeout=timeout)
+            return
+        proc = subprocess.Popen([self.adb_path] + command, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, start_new_session=True)
+        timer = threading.Timer(timeout, self._kill_process_group, args=(proc,))
+        timer.start()
+        try:
+            while True:
+                chunk = proc.stdout.read1(65536)
+                if not chunk:
+                    break
+                yield chunk
+            # Timer tetiklendiyse süreç öldürüldü: zaman aşımı
+            if not timer.is_alive() and proc.wait() != 0:
+                raise subprocess.TimeoutExpired([self.adb_path] + command, timeout)
+        finally:
+            timer.cancel()
+            self._kill_process_group(proc)
+            proc.stdout.close()
+            proc.wait()
+
+    @staticmethod
+    def _well_formed_hierarchy(output: Optional[bytes]) -> Optional[memoryview]:
+        """Çıktıdan tam <hierarchy>...</hierarchy> belgesini ayıkla (exec-out sondaki mesajı atılır)"""
+        if not output or b'<hierarchy' not in output:
+            return None
+        end = output.rfind(b'</hierarchy>')
+        if end == -1:
+            return None
+        return memoryview(output)[:end + len(b'</hierarchy>')]
+
+    def _race_dump_strategies(self, racers: List[str]) -> Optional[memoryview]:
+        """Dump stratejilerini paralel çalıştır; ilk geçerli <hierarchy> kazanır, diğerleri iptal edilir"""
+        self.log(f"🏁 UI dump yarışı: {', '.join(racers)}")
+        started = time.monotonic()
+        calls = {name: self._start_adb_call(self.race_commands[name]) for name in racers}
+        winner, xml_content = None, None
+        # Kendi 'rm'ine ulaşamamış olanlar: iptal edilen ya da zaman aşımında öldürülen
+        interrupted: List[str] = []
+        with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+            futures = {pool.submit(call[0], 30): name for name, call in calls.items()}
+            pending = set(futures)
+            while pending and winner is None:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = futures[fut]
+                    elapsed = time.monotonic() - started
+                    try:
+                        result = fut.result()
+                        xml = self._well_formed_hierarchy(result.stdout) if result.returncode == 0 else None
+                    except Exception:
+                        xml = None
+                        interrupted.append(name)
+                    if xml and winner is None:
+                        winner, xml_content = name, xml
+                        self.dump_cache.record(name, True, elapsed)
+                        self.log(f"🏆 Yarışı kazanan: {name} ({elapsed:.2f}s)")
+                    elif xml:
+                        # Aynı anda bitti ama kaybetti: yine de başarılı ölçüm
+                        self.dump_cache.record(name, True, elapsed)
+                    else:
+                        self.dump_cache.record(name, False, elapsed)
+                        self.log(f"❌ Yarış: {name} başarısız ({elapsed:.2f}s)")
+            # Kaybedenleri iptal et
+            # Kazananla aynı anda bitenler kendi dosyasını zaten sildi: iptal/temizlik yok
+            pending = {fut for fut in pending if not fut.done()}
+            for fut in pending:
+                calls[futures[fut]][1]()
+                interrupted.append(futures[fut])
+        if winner is not None and pending:
+            self.log(f"🛑 İptal edildi: {', '.join(futures[f] for f in pending)}")
+        # Yalnızca yarıda kalanlar için: cihazda süren dump'ı öldür, dosyasını sil (ek round trip)
+        if interrupted:
+            cleanup = [['pkill', '-f', "'[u]iautomator.Launcher dump'"]]
+            files = [self.race_files[name] for name in interrupted if name in self.race_files]
+            if files:
+                cleanup.append(['rm', '-f'] + files)
+            self.run_adb_batch(cleanup, timeout=10)
+        return xml_content
+
+    def _dump_via_exec_out(self) -> Optional[VideoInfoStreamParser]:
+        """exec-out ile direkt stdout'tan akışlı parse (dosya yok); alanlar bulununca okuma durur"""
+        command = ['exec-out', 'uiautomator', 'dump', '--compressed', '/dev/tty']
+        self.log(f"🔧 ADB stream: {' '.join(command)}")
+        parser = VideoInfoStreamParser()
+        stream = self._stream_adb(command, timeout=30)
+        try:
+            for chunk in stream:
+                if parser.feed(chunk):
+                    break
+        except subprocess.TimeoutExpired as e:
+            self.log(f"⏱️ ADB stream timed out after {e.timeout:g} seconds")
+            return None
+        except Exception as e:
+            self.log(f"❌ ADB stream exception: {type(e).__name__}: {e}")
+            return None
+        finally:
+            stream.close()
+        parser.close()
+        if not parser.valid:
+            self.log(f"❌ exec-out dump geçersiz ({parser.bytes_read} byte, {parser.error or 'hierarchy yok'})")
+            return None
+        return parser
+
+    def _dump_via_file(self, dump_command: List[str], dump_path: str) -> Optional[VideoInfoStreamParser]:
+        """Tek round trip: eski dump'ları sil, dump al, dosyayı kontrol et/oku, temizle"""
+        commands = [
+            ['rm', '-f', '/sdcard/ui_dump.xml'],
+            ['rm', '-f', '/sdcard/window_dump.xml'],
+            dump_command,
+            ['test', '-f', dump_path],
+            ['cat', dump_path],
+            ['rm', '-f', '/sdcard/ui_dump.xml'],
+            ['rm', '-f', '/sdcard/window_dump.xml'],
+        ]
+        self.log(f"🔧 ADB batch: {' '.join(dump_command)} (+{len(commands) - 1} komut)")
+        results = self.run_adb_batch(commands, timeout=30)
+        if not results or len(results) < 5:
+            self.log("❌ UI dump batch başarısız (code/loglara bak)")
+            return None
+        dump, file_check, cat = results[2], results[3], results[4]
+        self.log(f"📊 Dump result: return_code={dump.exit_code}, "
+                 f"{dump.duration if dump.duration is not None else '?'}s")
+        if dump.stderr:
+            self.log(f"❌ STDERR: {dump.stderr[:200]}...")
+        if not dump.ok:
+            return None
+        if not file_check.ok:
+            self.log("❌ Dump başarılı görünüyor ama dosya bulunamadı")
+            return None
+        if not cat.ok or not cat.raw_stdout:
+            return None
+        parser = parse_video_info(cat.raw_stdout)
+        if not parser.valid:
+            self.log(f"❌ XML parsing error: {parser.error or 'hierarchy yok'}")
+            return None
+        return parser
+
     def get_video_info_alternative(self) -> Dict[str, str]:
         """UI dump başarısızsa alternatif yöntemler dene"""
         self.log("🔄 Alternative: Trying different approaches...")
         
-        # Method 1: Different uiautomator command with --compressed
-        self.log("📱 Method 1: Trying uiautomator --compressed (default path)...")
-        result1 = self.run_adb_with_longer_timeout(['shell', 'uiautomator', 'dump', '--compressed'])
-        if result1 is not None:
-            xml_content = self.run_adb(['shell', 'cat', '/sdcard/window_dump.xml'])
-            if xml_content:
-                self.log("✅ Alternative uiautomator worked (compressed/default)!")
-                return self.parse_xml_content(xml_content)
-
-        # Method 2: Try service call
-        self.log("📱 Method 2: Trying service call...")
-        result2 = self.run_adb_with_longer_timeout(['shell', 'service', 'call', 'window', '1'])
-        if result2 and len(result2) > 10:
-            self.log("✅ Service call returned data")
-            # Basic parsing - look for common patterns
-            return self.extract_basic_info(result2)
+        # Not: uiautomator dump stratejileri zaten _run_dump_strategies içinde denendi;
+        # `service call window 1` XML döndürmediği için kaldırıldı.
 
-        # Method 3: exec-out direct stdout
-        self.log("📱 Method 3: Trying exec-out /dev/tty dump...")
-        result3a = self.run_adb_with_longer_timeout(['exec-out', 'uiautomator', 'dump', '--compressed', '/dev/tty'])
-        if result3a and '<hierarchy' in result3a:
-            self.log("✅ exec-out dump succeeded")
-            return self.parse_xml_content(result3a)
-
-        # Method 4: OCR fallback from screenshot (no UIAutomator needed)
+        # Method 1: OCR fallback from screenshot (no UIAutomator needed)
         ocr_info = self.extract_info_via_ocr()
         if any(ocr_info.values()):
             self.log("✅ OCR fallback extracted some info")
             return ocr_info
 
-        # Method 5: Dumpsys activity
-        self.log("📱 Method 5: Trying dumpsys activity...")  
+        # Method 2: Dumpsys activity
+        self.log("📱 Method 2: Trying dumpsys activity...")
         result3 = self.run_adb_with_longer_timeout(['shell', 'dumpsys', 'activity', 'top'])
         if result3 and 'tiktok' in result3.lower():
             self.log("✅ TikTok activity detected in dumpsys")
@@ -1017,15 +1438,12 @@ class CompTIATikTokBot:
             self.log(f"OCR exception: {type(e).__name__}: {e}")
             return {'description': '', 'username': '', 'likes': '', 'music': ''}
     
-    def parse_xml_content(self, xml_content: str) -> Dict[str, str]:
-        """XML content'i parse et"""
-        # Same parsing logic as before
-        try:
-            root = ET.fromstring(xml_content)
-            # Use same parsing logic...
-            return {'description': 'parsed_from_xml', 'username': 'xml_user', 'likes': '1K', 'music': 'xml_music'}
-        except:
+    def parse_xml_content(self, xml_content: Union[bytes, str]) -> Dict[str, str]:
+        """XML content'i parse et (get_video_description ile aynı kurallar)"""
+        parser = parse_video_info(xml_content)
+        if not parser.valid:
             return {'description': '', 'username': '', 'likes': '', 'music': ''}
+        return dict(parser.video_info)
     
     def extract_basic_info(self, text_content: str) -> Dict[str, str]:
         """Basic text'ten bilgi çıkar"""
@@ -1048,11 +1466,10 @@ class CompTIATikTokBot:
 
     def is_comptia_content(self, video_info: Dict[str, str]) -> Tuple[bool, List[str]]:
         """Video CompTIA içeriği mi kontrol et"""
-        found_keywords = []
-        
         # Açıklama ve kullanıcı adında ara
-        search_text = f"{video_info.get('description', '')} {video_info.get('username', '')}"
-        search_text = search_text.lower().strip()
+        description = video_info.get('description', '')
+        username = video_info.get('username', '')
+        search_text = f"{description} {username}".lower().strip()
         
         self.log(f"🔍 CompTIA araması: '{search_text[:80]}...'")
         
@@ -1060,9 +1477,7 @@ class CompTIATikTokBot:
             self.log("⚠️ Arama metni boş - CompTIA algılaması yapılamıyor")
             return False, []
         
-        for keyword in self.comptia_keywords:
-            if keyword.lower() in search_text:
-                found_keywords.append(keyword)
+        found_keywords = self.keyword_matcher.matched(description, username)
         
         if found_keywords:
             self.log(f"🎯 CompTIA keywords bulundu: {', '.join(found_keywords)}")
@@ -1156,6 +1571,7 @@ class CompTIATikTokBot:
             # Ters swipe
             # Use screen center area for random swipe behavior
             zone = (540, 1200, 150)  # (x, y, radius)
+            self.current_video = None  # ekran değişiyor; swipe öncesi durum yeniden alınmalı
             self.run_adb(['shell', 'input', 'swipe',
                          str(zone['end'][0]), str(zone['end'][1]),
                          str(zone['start'][0]), str(zone['start'][1]),
@@ -1210,9 +1626,9 @@ class CompTIATikTokBot:
                 actions['liked'] = True
                 self.stats['likes_given'] += 1
                 
-                # Screenshot al
+                # Screenshot al (encode + yazma arka planda; JSON'a yazılacağı ad kaydedilir)
                 screenshot_name = f"liked_video_{self.stats['videos_watched']:03d}_{like_method}.png"
-                self.take_screenshot(screenshot_name)
+                screenshot_name = self.submit_screenshot(screenshot_name) or ''
                 
                 # Video bilgilerini JSON olarak kaydet
                 self.save_video_info(screenshot_name, video_info, is_comptia, keywords, like_method)
@@ -1287,9 +1703,12 @@ class CompTIATikTokBot:
         self.session_start = time.time()
         session_end = self.session_start + (duration_minutes * 60)
         
+        # Cihaz bilgileri (ekran boyutu, paket, preflight, dump stratejisi)
+        self.load_device_facts()
+        
         # TikTok'u aç
         self.log("📱 TikTok açılıyor...")
-        self.run_adb(['shell', 'monkey', '-p', 'com.zhiliaoapp.musically',
+        self.run_adb(['shell', 'monkey', '-p', self.tiktok_package,
                      '-c', 'android.intent.category.LAUNCHER', '1'])
         time.sleep(5)
         
@@ -1308,6 +1727,7 @@ class CompTIATikTokBot:
             
             # Video bilgilerini al
             video_info = self.get_video_description()
+            self.current_video = (video_info, self.last_fingerprint)
             
             # CompTIA içeriği mi kontrol et
             is_comptia, keywords = self.is_comptia_content(video_info)
@@ -1375,6 +1795,16 @@ class CompTIATikTokBot:
                 'total_watch_time': round(self.stats['total_watch_time'], 1),
                 'average_watch_time': round(self.stats['total_watch_time']/max(1,self.stats['videos_watched']), 1)
             },
+            'dump_strategies': {
+                'device_serial': self.device_serial,
+                'strategies': self.dump_cache.report() if self.dump_cache else []
+            },
+            'device_facts': self.device_facts.report() if self.device_facts else None,
+            'screenshots': self.screenshot_worker.report(),
+            'performance': {
+                'adb_commands': self.adb_metrics.report(),
+                'ui_cache': self.ui_cache.report()
+            },
             'logs': self.session_logs
         }
         
@@ -1390,6 +1820,9 @@ class CompTIATikTokBot:
 
     def print_session_report(self):
         """Oturum sonuç raporu"""
+        self.flush_screenshots()
+        if self.dump_cache:
+            self.dump_cache.flush(force=True)
         self.log("\n" + "=" * 50)
         self.log("📊 OTURUM RAPORU")
         self.log("=" * 50)
@@ -1405,12 +1838,41 @@ class CompTIATikTokBot:
         self.log(f"👤 Profil Ziyareti: {self.stats['profiles_visited']}")
         self.log(f"⏰ Ortalama İzleme: {self.stats['total_watch_time']/max(1,self.stats['videos_watched']):.1f} sn/video")
         
+        # UI dump strateji tablosu (hit/miss + gecikme)
+        if self.dump_cache and self.dump_cache.session:
+            self.log(f"\n🧩 UI Dump Stratejileri (cihaz: {self.device_serial}):")
+            self.log(f"   {'strateji':<20}{'hit':>5}{'miss':>6}{'skip':>6}{'ort(s)':>9}{'p50(s)':>9}")
+            for row in self.dump_cache.report():
+                avg = f"{row['avg_latency']:.2f}" if row['avg_latency'] is not None else '-'
+                p50 = f"{row['p50_latency']:.2f}" if row['p50_latency'] is not None else '-'
+                flag = ' ⛔' if row['circuit_open'] else ''
+                self.log(f"   {row['strategy']:<20}{row['hits']:>5}{row['misses']:>6}{row['skipped']:>6}{avg:>9}{p50:>9}{flag}")
+        
+        # ADB komut gecikmeleri (sınıf başına)
+        perf = self.adb_metrics.report()
+        if perf:
+            self.log("\n⚡ ADB Performans (ms):")
+            self.log(f"   {'sınıf':<13}{'adet':>6}{'hata':>6}{'t/o':>5}{'p50':>9}{'p95':>9}{'p99':>9}"
+                     f"{'toplam(s)':>11}{'stall(s)':>10}{'timeout(s)':>12}")
+            for name, row in perf.items():
+                cols = [f"{row[q] * 1000:.0f}" if row[q] is not None else '-' for q in ('p50', 'p95', 'p99')]
+                adaptive = f"{row['adaptive_timeout']:.1f}" if row['adaptive_timeout'] is not None else 'sabit'
+                self.log(f"   {name:<13}{row['count']:>6}{row['failures']:>6}{row['timeouts']:>5}"
+                         f"{cols[0]:>9}{cols[1]:>9}{cols[2]:>9}{row['total_secs']:>11.1f}"
+                         f"{row['stall_secs']:>10.1f}{adaptive:>12}")
+        
+        cache = self.ui_cache.report()
+        self.log(f"\n♻️ UI Cache: {cache['hits']} hit / {cache['misses']} miss "
+                 f"({cache['interactions']} etkileşim, nesil {cache['generation']})")
+        
         # Başarı mesajı
         if self.stats['comptia_videos'] > 0:
             self.log(f"\n✅ {self.stats['comptia_videos']} CompTIA videosu bulundu ve etkileşim sağlandı!")
         
         self.log(f"\n📁 Session dosyaları: {self.session_folder}")
-        self.log(f"📸 Screenshots: {self.stats['likes_given']} adet")
+        shots = self.screenshot_worker.report()
+        self.log(f"📸 Screenshots: {shots['written']} adet ({shots['format']}, {shots['failed']} hata, "
+                 f"backpressure {shots['backpressure_secs']:.1f}s)")
         self.log("\n🎉 Bot başarıyla tamamlandı!")
         
         # JSON raporu kaydet
@@ -1469,6 +1931,11 @@ def main():
             bot.print_session_report()
         else:
             print("Session başlatılamadı.")
+    finally:
+        bot.screenshot_worker.close()
+        if bot.dump_cache:
+            bot.dump_cache.flush(force=True)
+        bot.close_adb()
 
 if __name__ == "__main__":
     main()
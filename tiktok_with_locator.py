@@ -4,7 +4,6 @@ TikTok Automation - Locator Version
 Requires an Appium server.
 """
 
-from appium import webdriver
 from appium.webdriver.common.appiumby import AppiumBy
 from appium.options.android import UiAutomator2Options
 from selenium.webdriver.support.ui import WebDriverWait
@@ -17,6 +16,17 @@ import os
 import json
 from datetime import datetime
 
+import appium_profiles
+import appium_session
+from device_facts import DeviceFacts
+from keyword_matcher import KeywordMatcher
+from locator_ranking import LocatorRanking
+from lookup_budget import LookupBudget
+from screenshot_worker import ScreenshotWorker
+from ui_hierarchy import UiHierarchy
+from ui_selector import LocalElement, UnsupportedLocator, find as find_local, find_all as find_all_local, properties
+from ui_spatial import right_panel_actions
+
 class TikTokWithLocator:
     def __init__(self):
         self.driver = None
@@ -32,6 +42,13 @@ class TikTokWithLocator:
         ]
         # Fast mode toggle
         self.fast_mode = os.getenv('FAST_MODE', '0') == '1'
+        # Appium session profile (appium_profiles.py): stock | default | fast
+        self.appium_profile = appium_profiles.profile_name()
+        self.appium_settings = {}
+        # Session reuse across runs (APPIUM_REUSE_SESSION=1) + connect/first-command latency
+        self.reuse_session = appium_session.reuse_enabled()
+        self.session_store = appium_session.SessionStore(os.getenv('APPIUM_SESSION_CACHE', appium_session.SESSION_CACHE))
+        self.session_info = {}
         
         # Session & logging
         self.session_folder = None
@@ -39,47 +56,112 @@ class TikTokWithLocator:
         self.screens_dir = None
         self.stats = {"videos": 0, "likes": 0}
         self.liked_videos = []
+        # Screenshots are captured inline, encoded/written on a background thread
+        self.screenshot_worker = ScreenshotWorker(
+            max_pending_bytes=int(os.getenv('SCREENSHOT_QUEUE_MB', '64')) * 1024 * 1024,
+            image_format=os.getenv('SCREENSHOT_FORMAT', 'png'),
+            log=self.log,
+        )
+        # One page_source per video; locators are evaluated locally against it
+        self._page = None
+        self._page_failed = False
+        self.locator_stats = {"page_sources": 0, "local_lookups": 0, "server_lookups": 0, "clicks": 0,
+                              "snapshot_bytes": 0, "snapshot_fetch_secs": 0.0, "snapshot_parse_secs": 0.0,
+                              "dropped_properties": 0}
+        self.last_snapshot = {}
+        # Per-lookup deadlines (ms): strategies are tried only while budget remains
+        self.lookup_budgets_ms = {
+            "description": float(os.getenv('DESC_BUDGET_MS', '400')),
+            "title": float(os.getenv('TITLE_BUDGET_MS', '300')),
+            "like": float(os.getenv('LIKE_BUDGET_MS', '1500')),
+            "properties": float(os.getenv('PROPERTIES_BUDGET_MS', '2000')),
+        }
+        self.budget_stats = {}
+        # Target keywords: keywords.json 'locator' profile, compiled once
+        self.keyword_matcher = KeywordMatcher.from_config('locator')
+        # Device facts (serial + versionName): screen size, package; window size is asked once
+        self.device_facts = None
+        self.device_facts_path = os.getenv('DEVICE_FACTS_CACHE', 'cache/device_facts.json')
+        self.window_size = None
+        self.app_version = None
+        # Like locator strategy ranking per package/app version (set up after TikTok opens)
+        self.locator_ranking = None
+        self.locator_ranking_path = os.getenv('LOCATOR_RANKING_CACHE', 'cache/locator_ranking.json')
         
     def connect(self):
         """Connect to Appium server"""
         try:
             print("📱 Connecting to Appium...")
             
-            # Appium options
-            options = UiAutomator2Options()
-            options.platform_name = 'Android'
-            options.device_name = 'Samsung S20'
-            # Do not auto-launch an activity; attach session and activate explicitly
-            options.no_reset = True
-            options.auto_grant_permissions = True
-            # Prevent Appium from auto-starting an activity
-            options.set_capability('appium:autoLaunch', False)
-            # Keep session alive during run
-            options.set_capability('appium:newCommandTimeout', 120)
+            started = time.perf_counter()
+            # Appium options (capabilities + server settings from the selected profile)
+            caps = appium_profiles.capabilities(self.appium_profile)
+            mode, first_command_secs = 'new', None
+            skip_caps = {}
+            if self.reuse_session:
+                # Oturum çalıştırmalar arasında açık kalır: boşta kapanma süresini uzat
+                caps['appium:newCommandTimeout'] = int(os.getenv('APPIUM_SESSION_IDLE_SECS', '1800'))
+                entry = self.session_store.load(self.appium_server, self.appium_profile)
+                if entry:
+                    driver, first_command_secs = appium_session.attach(
+                        self.appium_server, UiAutomator2Options().load_capabilities(caps), entry)
+                    if driver is not None:
+                        self.driver, mode = driver, 'attached'
+                    else:
+                        print("♻️  Kayıtlı Appium oturumu kapanmış, yeni oturum açılıyor")
+                        self.session_store.forget(self.appium_server, self.appium_profile)
+                        # Sunucu bir önceki çalıştırmada kuruldu: kurulum/cihaz hazırlığı atlanır
+                        skip_caps = {'appium:skipServerInstallation': True, 'appium:skipDeviceInitialization': True}
+            if self.driver is None:
+                try:
+                    self.driver = appium_session.open_session(
+                        self.appium_server, UiAutomator2Options().load_capabilities({**caps, **skip_caps}))
+                except Exception:
+                    if not skip_caps:
+                        raise
+                    mode = 'new (full init)'
+                    self.driver = appium_session.open_session(
+                        self.appium_server, UiAutomator2Options().load_capabilities(caps))
+                first = time.perf_counter()
+                self.driver.current_package
+                first_command_secs = time.perf_counter() - first
+            self.session_info = {
+                "mode": mode,
+                "session_id": self.driver.session_id,
+                "connect_secs": round(time.perf_counter() - started, 3),
+                "first_command_secs": round(first_command_secs, 3) if first_command_secs is not None else None,
+            }
             
-            self.driver = webdriver.Remote(self.appium_server, options=options)
             # Disable implicit wait for speed
             self.driver.implicitly_wait(0)
             # Short explicit wait
             self.wait = WebDriverWait(self.driver, 3 if self.fast_mode else 5)
-            # Reduce UI idle waits (performance)
-            try:
-                self.driver.update_settings({
-                    "ignoreUnimportantViews": True,
-                    "waitForIdleTimeout": 0,
-                    "waitForIdlePollingInterval": 50
-                })
-            except Exception:
-                pass
+            # Reduce UI idle waits / snapshot size (performance)
+            self.appium_settings = appium_profiles.apply_settings(self.driver, self.appium_profile)
+            print(f"⚙️  Appium profile: {self.appium_profile} ({len(self.appium_settings)} settings)")
+            print(f"⏱️  Session {self.session_info['mode']}: connect {self.session_info['connect_secs']:.2f} s, "
+                  f"first command {self.session_info['first_command_secs'] or 0:.3f} s")
             print("✅ Connected to Appium!")
             return True
             
         except Exception as e:
+            self.driver = None
             print(f"❌ Appium connection failed: {e}")
             print("\n⚠️  Ensure Appium server is running:")
             print("   In terminal: appium")
             return False
     
+    def close_driver(self):
+        """Oturumu kapat; APPIUM_REUSE_SESSION=1 ise açık bırak ve id'sini kaydet."""
+        if self.driver is None:
+            return
+        if self.reuse_session:
+            self.session_store.save(self.appium_server, self.appium_profile, self.driver.session_id,
+                                    getattr(self.driver, 'caps', {}) or {})
+            self.log(f"♻️  Appium oturumu açık bırakıldı: {self.driver.session_id}")
+            return
+        self.driver.quit()
+
     def open_tiktok(self):
         """Open TikTok or bring to foreground"""
         try:
@@ -105,11 +187,258 @@ class TikTokWithLocator:
             print(f"❌ Could not open TikTok: {e}")
             return False
 
+    def detect_app_version(self, pkg: str) -> str:
+        """TikTok versionName: TIKTOK_VERSION (run_locator.sh) or dumpsys via 'mobile: shell'."""
+        version = os.getenv('TIKTOK_VERSION', '').strip()
+        if version:
+            return version
+        try:
+            out = self.driver.execute_script('mobile: shell', {"command": "dumpsys", "args": ["package", pkg]})
+            m = re.search(r'versionName=(\S+)', out or '')
+            if m:
+                return m.group(1)
+        except Exception:
+            # Appium --relaxed-security olmadan mobile: shell kapalı
+            pass
+        return 'unknown'
+
+    def setup_device_facts(self):
+        """Cihaz bilgilerini önbellekten al (TikTok sürümü değiştiyse yenile); paket adayları buna göre sıralanır."""
+        try:
+            caps = self.driver.capabilities or {}
+        except Exception:
+            caps = {}
+        serial = caps.get('deviceUDID') or caps.get('udid') or os.getenv('ANDROID_SERIAL', '')
+        self.device_facts = DeviceFacts(self.device_facts_path, serial)
+        pkg = os.getenv('TIKTOK_PACKAGE') or self.device_facts.get('package') or self.pkg_candidates[0]
+        self.app_version = self.detect_app_version(pkg)
+        if not self.device_facts.check_version(self.app_version) and self.device_facts.invalidated:
+            print(f"🔄 TikTok sürümü değişti ({self.device_facts.invalidated}): cihaz bilgileri yenilendi")
+        size = self.device_facts.screen_size()
+        if size is None:
+            try:
+                ws = self.driver.get_window_size()
+                size = (ws['width'], ws['height'])
+            except Exception:
+                size = None
+        if size:
+            self.window_size = {'width': size[0], 'height': size[1]}
+        self.device_facts.update(package=pkg, screen=list(size) if size else None)
+        self.pkg_candidates = list(dict.fromkeys([pkg] + self.pkg_candidates))
+        print(f"📱 Cihaz: {self.device_facts.serial} | {pkg} v{self.app_version} | "
+              f"{size[0] if size else '?'}x{size[1] if size else '?'}")
+
+    def setup_locator_ranking(self):
+        try:
+            pkg = self.driver.current_package or self.pkg_candidates[0]
+        except Exception:
+            pkg = self.pkg_candidates[0]
+        if self.device_facts is not None and pkg != self.device_facts.get('package'):
+            # Başka bir paket açıldı (musically <-> trill): bilgileri ona göre güncelle
+            self.app_version = self.detect_app_version(pkg)
+            self.device_facts.check_version(self.app_version)
+            size = [self.window_size['width'], self.window_size['height']] if self.window_size else None
+            self.device_facts.update(package=pkg, screen=size)
+        version = self.app_version or self.detect_app_version(pkg)
+        self.locator_ranking = LocatorRanking(self.locator_ranking_path, pkg, version)
+        order = self.locator_ranking.order([label for label, _ in self.like_strategies()])
+        self.log(f"📊 Like locator sırası ({self.locator_ranking.key}): {order[0]} önce")
+
+    # ---- Local locator evaluation ----
+    def page_snapshot(self):
+        """Parsed page_source of the current screen, fetched once (reset by invalidate_page)."""
+        if self._page is None and not self._page_failed:
+            try:
+                started = time.perf_counter()
+                source = self.driver.page_source
+                fetched = time.perf_counter()
+                self._page = UiHierarchy.parse(source)
+                parsed = time.perf_counter()
+                self.last_snapshot = {
+                    "bytes": len(source.encode('utf-8')),
+                    "fetch_secs": fetched - started,
+                    "parse_secs": parsed - fetched,
+                    "nodes": len(self._page),
+                }
+                self.locator_stats['page_sources'] += 1
+                self.locator_stats['snapshot_bytes'] += self.last_snapshot['bytes']
+                self.locator_stats['snapshot_fetch_secs'] += self.last_snapshot['fetch_secs']
+                self.locator_stats['snapshot_parse_secs'] += self.last_snapshot['parse_secs']
+            except Exception as e:
+                self.log(f"⚠️  page_source alınamadı, locator'lar sunucuya gidecek: {e}")
+                self._page_failed = True
+        return self._page
+
+    def invalidate_page(self):
+        """Ekran değişti (swipe/click): bir sonraki lookup yeni page_source çeker."""
+        self._page = None
+        self._page_failed = False
+
+    def find_element(self, by, value):
+        """Locator'ı snapshot üzerinde çöz; snapshot yoksa veya alt küme dışındaysa sunucuya sor.
+        Returns a LocalElement, a WebElement or None."""
+        ui = self.page_snapshot()
+        if ui is not None:
+            try:
+                i = find_local(ui, by, value)
+                self.locator_stats['local_lookups'] += 1
+                return None if i is None else LocalElement(ui, i)
+            except UnsupportedLocator:
+                pass
+        self.locator_stats['server_lookups'] += 1
+        try:
+            return self.driver.find_element(by, value)
+        except Exception:
+            return None
+
+    def element_properties(self, by, value, names, limit=None):
+        """Bulk element properties: all matches of a locator with the requested attributes
+        ('text', 'rect', 'clickable', 'content-desc', ...) from one page_source parse.
+        Without a snapshot (or for unsupported locators) the server is asked element by element
+        within the 'properties' budget; elements left when it runs out are dropped, logged and
+        counted in locator_stats['dropped_properties']."""
+        ui = self.page_snapshot()
+        if ui is not None:
+            try:
+                found = find_all_local(ui, by, value)
+                self.locator_stats['local_lookups'] += 1
+                return properties(ui, found[:limit] if limit else found, names)
+            except UnsupportedLocator:
+                pass
+        self.locator_stats['server_lookups'] += 1
+        result = []
+        budget = self.new_budget('properties')
+        elems = budget.run(self.locator_label(by, value), lambda: self.driver.find_elements(by, value)) or []
+        fetch_started = budget.spent_ms
+        targets = elems[:limit] if limit else elems
+        for el in targets:
+            if budget.expired:
+                budget.skipped.append('element')
+                continue
+            props = {}
+            for name in names:
+                try:
+                    if name == 'text':
+                        props[name] = el.text
+                    elif name in ('rect', 'location', 'size'):
+                        props[name] = getattr(el, name)
+                    else:
+                        props[name] = el.get_attribute(name)
+                except Exception:
+                    props[name] = None
+            result.append(props)
+        if elems:
+            budget.steps.append((f"{len(result)} element", budget.spent_ms - fetch_started, bool(result)))
+        self.finish_budget(budget)
+        dropped = len(targets) - len(result)
+        if dropped:
+            # Eleman başına HTTP çağrısı: bütçe bitince kalanlar atlanır, sonuç eksik
+            self.locator_stats['dropped_properties'] += dropped
+            self.log(f"⚠️  {self.locator_label(by, value)}: {dropped}/{len(targets)} elemanın özellikleri "
+                     f"bütçe ({budget.budget_ms:.0f} ms) bittiği için alınmadı")
+        return result
+
+    @staticmethod
+    def locator_label(by, value) -> str:
+        short = {AppiumBy.ANDROID_UIAUTOMATOR: "UiSelector", AppiumBy.ID: "id", AppiumBy.XPATH: "xpath",
+                 AppiumBy.ACCESSIBILITY_ID: "a11y"}.get(by, by)
+        value = value.replace('new UiSelector().', '')
+        return f"{short} {value if len(value) <= 60 else '…' + value[-59:]}"
+
+    def new_budget(self, what: str, budget_ms=None) -> LookupBudget:
+        return LookupBudget(what, budget_ms if budget_ms is not None else self.lookup_budgets_ms.get(what, 500.0))
+
+    def finish_budget(self, budget: LookupBudget):
+        """Strateji başına süreleri logla, raporda toplamları tut."""
+        self.log(budget.summary())
+        stats = self.budget_stats.setdefault(budget.what, {"lookups": 0, "expired": 0, "spent_ms": 0.0, "max_ms": 0.0})
+        stats["lookups"] += 1
+        stats["expired"] += 1 if budget.skipped else 0
+        stats["spent_ms"] += budget.spent_ms
+        stats["max_ms"] = max(stats["max_ms"], budget.spent_ms)
+
+    def find_text(self, locators, what: str = "text", budget_ms=None) -> str:
+        """İlk boş olmayan metin (locators: [(by, value), ...]), bütçe bitene kadar"""
+        budget = self.new_budget(what, budget_ms)
+        txt = ""
+        for by, value in locators:
+            el = budget.run(self.locator_label(by, value), lambda: self.find_element(by, value))
+            txt = (el.text or "").strip() if el is not None else ""
+            if txt:
+                break
+        self.finish_budget(budget)
+        return txt
+
+    def like_strategies(self):
+        """Like button strategies as (label, lookup); lookup() -> element or None."""
+        rid_candidates = [
+            "com.zhiliaoapp.musically:id/ema",
+            "com.ss.android.ugc.trill:id/ema"
+        ]
+        locators = (
+            # STRATEGY 0: Fastest: resource-id (...:id/ema), UiSelector then ID
+            [(f"UiSelector resourceId('{rid}')", AppiumBy.ANDROID_UIAUTOMATOR, f'new UiSelector().resourceId("{rid}")')
+             for rid in rid_candidates]
+            + [(f"id='{rid}'", AppiumBy.ID, rid) for rid in rid_candidates]
+            # STRATEGY 1: Content-Description (basic English)
+            + [(f"content-desc='{desc}'", AppiumBy.ACCESSIBILITY_ID, desc) for desc in ["Like", "Unlike"]]
+            # STRATEGY 2: UiSelector descriptionContains('like')
+            + [("descriptionContains('like')", AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().descriptionContains("like")')]
+            # STRATEGY 3: XPath content-desc contains Like/like
+            + [("XPath (content-desc contains)", AppiumBy.XPATH,
+                "//android.widget.ImageView[contains(@content-desc,'Like') or contains(@content-desc,'like')]")]
+        )
+        strategies = [(label, lambda by=by, value=value: self.find_element(by, value)) for label, by, value in locators]
+
+        # STRATEGY 4: Right-side action panel heuristic on the same snapshot
+        # (icon right above the first counter)
+        def right_panel():
+            ui = self.page_snapshot()
+            try:
+                pairs = right_panel_actions(ui) if ui is not None else []
+            except Exception:
+                pairs = []
+            return LocalElement(ui, pairs[0][0]) if pairs else None
+
+        strategies.append(("right panel heuristic", right_panel))
+        return strategies
+
+    def like_candidates(self, record: bool = False, budget: LookupBudget = None):
+        """Like button candidates, usual winner first (LocatorRanking): yields (label, element), looked up lazily.
+        record=True stores each lookup's outcome and latency in the ranking; with a budget, strategies stop
+        being tried once its deadline passes."""
+        strategies = dict(self.like_strategies())
+        order = self.locator_ranking.order(list(strategies)) if self.locator_ranking else list(strategies)
+        for label in order:
+            if budget is not None:
+                el = budget.run(label, strategies[label])
+                if budget.skipped and budget.skipped[-1] == label:
+                    continue
+                latency = budget.last_ms() / 1000.0
+            else:
+                started = time.perf_counter()
+                el = strategies[label]()
+                latency = time.perf_counter() - started
+            if record and self.locator_ranking:
+                self.locator_ranking.record(label, el is not None, latency)
+            if el is not None:
+                yield label, el
+
     def like_video_with_locator(self):
         """Like the current video using locators"""
         self.log("❤️  Searching for Like button (locators)...")
         
         def smart_click(el):
+            if isinstance(el, LocalElement):
+                # Resolved locally: the only server call is the tap itself
+                try:
+                    x, y = el.tap_point()
+                    self.driver.execute_script('mobile: clickGesture', {"x": x, "y": y})
+                    self.locator_stats['clicks'] += 1
+                    self.invalidate_page()
+                    return True
+                except Exception:
+                    return False
             try:
                 # Try direct click (some devices work even if clickable=false)
                 el.click()
@@ -123,117 +452,25 @@ class TikTokWithLocator:
                 return True
             except Exception:
                 pass
-            # Fallback: coordinate-based click (mobile: clickGesture)
+            # Fallback: coordinate-based click (mobile: clickGesture); rect = location + size in one call
             try:
-                loc = el.location; sz = el.size
-                cx = loc['x'] + max(1, sz['width']//2)
-                cy = loc['y'] + max(1, sz['height']//2)
+                rect = el.rect
+                cx = rect['x'] + max(1, rect['width']//2)
+                cy = rect['y'] + max(1, rect['height']//2)
                 self.driver.execute_script('mobile: clickGesture', {"x": cx, "y": cy})
                 return True
             except Exception:
                 return False
 
-        # STRATEGY 0: Fastest: resource-id (...:id/ema)
-        rid_candidates = [
-            "com.zhiliaoapp.musically:id/ema",
-            "com.ss.android.ugc.trill:id/ema"
-        ]
-        # First try UiSelector (fast)
-        for rid in rid_candidates:
-            try:
-                ui = f'new UiSelector().resourceId("{rid}")'
-                el = self.driver.find_element(AppiumBy.ANDROID_UIAUTOMATOR, ui)
-                self.log(f"✅ Bulundu: UiSelector resourceId('{rid}')")
-                if smart_click(el):
-                    return True
-            except Exception:
-                continue
-        # Then try ID
-        for rid in rid_candidates:
-            try:
-                el = self.driver.find_element(AppiumBy.ID, rid)
-                self.log(f"✅ Bulundu: id='{rid}'")
-                if smart_click(el):
-                    return True
-            except Exception:
-                continue
-
-        # STRATEGY 1: Content-Description (basic English)
-        for desc in ["Like", "Unlike"]:
-            try:
-                like_btn = self.driver.find_element(AppiumBy.ACCESSIBILITY_ID, desc)
-                self.log(f"✅ Bulundu: content-desc='{desc}'")
-                if smart_click(like_btn):
-                    return True
-            except Exception:
-                continue
-
-        # STRATEGY 2: UiSelector descriptionContains('like')
-        for kw in ["like"]:
-            try:
-                selector = f'new UiSelector().descriptionContains("{kw}")'
-                el = self.driver.find_element(AppiumBy.ANDROID_UIAUTOMATOR, selector)
-                self.log(f"✅ Bulundu: descriptionContains('{kw}')")
-                if smart_click(el):
-                    return True
-            except Exception:
-                continue
-
-        # STRATEGY 3: XPath content-desc contains Like/like
-        try:
-            xpath = "//android.widget.ImageView[contains(@content-desc,'Like') or contains(@content-desc,'like')]"
-            like_btn = self.driver.find_element(AppiumBy.XPATH, xpath)
-            self.log("✅ Found: XPath (content-desc contains)")
-            if smart_click(like_btn):
+        budget = self.new_budget("like")
+        for label, el in self.like_candidates(record=True, budget=budget):
+            where = "local" if isinstance(el, LocalElement) else "server"
+            self.log(f"✅ Bulundu: {label} ({where})")
+            if smart_click(el):
+                self.finish_budget(budget)
                 return True
-        except Exception:
-            pass
-
-        # STRATEGY 4: Heuristic on right-side action panel (single pass)
-        try:
-            size = self.driver.get_window_size()
-            W, H = size['width'], size['height']
-            right_x = int(W * 0.85)
-
-            # Collect numeric labels (like/comment counters)
-            nums = []
-            for tv in self.driver.find_elements(AppiumBy.CLASS_NAME, "android.widget.TextView"):
-                text = tv.text or ""
-                if re.match(r"^\d+[\.,]?\d*[KkMm]?$", text.strip()):
-                    loc = tv.location; sz = tv.size
-                    cx = loc['x'] + sz['width']//2
-                    cy = loc['y'] + sz['height']//2
-                    if cx >= right_x:
-                        nums.append((tv, cx, cy))
-
-            # Collect clickable icons on the right side
-            icons = []
-            for iv in self.driver.find_elements(AppiumBy.CLASS_NAME, "android.widget.ImageView"):
-                try:
-                    clickable = iv.get_attribute('clickable') == 'true'
-                    if not clickable:
-                        continue
-                    loc = iv.location; sz = iv.size
-                    cx = loc['x'] + sz['width']//2
-                    cy = loc['y'] + sz['height']//2
-                    if cx >= right_x and (H*0.25) <= cy <= (H*0.9):
-                        icons.append((iv, cx, cy))
-                except Exception:
-                    continue
-
-            # Assume the closest icon above a numeric label is the like button
-            if nums and icons:
-                icons_sorted = sorted(icons, key=lambda x: x[2])
-                for (_, _, ny) in sorted(nums, key=lambda x: x[2]):
-                    above = [it for it in icons_sorted if it[2] < ny and (ny - it[2]) < int(H*0.25)]
-                    if above:
-                        cand = above[-1][0]
-                        self.log("✅ Found: right panel heuristic icon")
-                        cand.click()
-                        return True
-        except Exception:
-            pass
         
+        self.finish_budget(budget)
         self.log("❌ Like button not found!")
         return False
     
@@ -241,7 +478,9 @@ class TikTokWithLocator:
         """Swipe up to next video"""
         try:
             print("⬆️  Swiping to next video...")
-            size = self.driver.get_window_size()
+            if self.window_size is None:
+                self.window_size = self.driver.get_window_size()
+            size = self.window_size
             
             start_x = size['width'] // 2
             start_y = size['height'] * 0.8
@@ -249,40 +488,28 @@ class TikTokWithLocator:
             end_y = size['height'] * 0.2
             
             self.driver.swipe(start_x, start_y, end_x, end_y, duration=300)
+            self.invalidate_page()
             return True
         except Exception as e:
             print(f"❌ Swipe failed: {e}")
             return False
     
-    def show_all_locators(self, max_seconds: float = 3.0):
-        """Quickly list some locators on screen (time-capped)."""
-        self.log("\n🔍 Scanning elements (quick mode)...")
+    def show_all_locators(self):
+        """List some locators on screen (one page_source parse, no per-element calls)."""
+        self.log("\n🔍 Scanning elements...")
         try:
-            start = time.time()
             found = []
-            # Elements with content-desc
-            try:
-                elems = self.driver.find_elements(AppiumBy.XPATH, "//*[@content-desc]")
-                for el in elems[:20]:
-                    cd = el.get_attribute("content-desc")
-                    if cd:
-                        found.append({'content_desc': cd, 'resource_id': '', 'class': el.get_attribute('className'), 'clickable': el.get_attribute('clickable') == 'true'})
-                    if time.time() - start > max_seconds:
-                        break
-            except Exception:
-                pass
-            # Elements with resource-id
-            if time.time() - start <= max_seconds:
-                try:
-                    elems = self.driver.find_elements(AppiumBy.XPATH, "//*[@resource-id]")
-                    for el in elems[:20]:
-                        rid = el.get_attribute("resourceId")
-                        if rid:
-                            found.append({'content_desc': '', 'resource_id': rid, 'class': el.get_attribute('className'), 'clickable': el.get_attribute('clickable') == 'true'})
-                        if time.time() - start > max_seconds:
-                            break
-                except Exception:
-                    pass
+            names = ('content-desc', 'resource-id', 'class', 'clickable')
+            # Elements with content-desc, then elements with resource-id
+            # Dump'ta her node'da @content-desc/@resource-id var (çoğu boş): sunucudaki gibi boşları ele
+            for key, xpath in (('content_desc', "//*[@content-desc!='']"), ('resource_id', "//*[@resource-id!='']")):
+                for props in self.element_properties(AppiumBy.XPATH, xpath, names, limit=20):
+                    value = props['content-desc' if key == 'content_desc' else 'resource-id']
+                    if value:
+                        entry = {'content_desc': '', 'resource_id': '', 'class': props['class'],
+                                 'clickable': props['clickable'] == 'true'}
+                        entry[key] = value
+                        found.append(entry)
 
             self.log("\n📋 Important elements (first 10):")
             for e in found[:10]:
@@ -303,10 +530,11 @@ class TikTokWithLocator:
         # 1. Appium bağlantısı
         if not self.connect():
             return False
+        self.setup_device_facts()
         
         # 2. TikTok'u aç
         if not self.open_tiktok():
-            self.driver.quit()
+            self.close_driver()
             return False
         
         # 3. Elementleri göster (debug için, opsiyonel)
@@ -321,6 +549,7 @@ class TikTokWithLocator:
             run_minutes = 2.0
         # Session klasörünü kur
         self.setup_session()
+        self.setup_locator_ranking()
         # Optional: switch account
         self.switch_account_name = os.getenv('SWITCH_ACCOUNT', '').strip()
         if self.switch_account_name:
@@ -334,7 +563,14 @@ class TikTokWithLocator:
                     time.sleep(2.0)
                 else:
                     self.log("⚠️  Could not navigate to Home tab; continuing")
-        self.run_for_minutes(run_minutes)
+        try:
+            self.run_for_minutes(run_minutes)
+        except KeyboardInterrupt:
+            self.log("\n⚠️  Interrupted; flushing pending screenshots")
+            self.write_session_report(run_minutes)
+            self.screenshot_worker.close()
+            self.close_driver()
+            return False
 
         self.log("\n✅ Automation finished!")
         self.log(f"📊 Duration: ~{run_minutes:g} min | Videos: {self.stats['videos']} | Likes: {self.stats['likes']}")
@@ -342,7 +578,8 @@ class TikTokWithLocator:
         self.write_session_report(run_minutes)
         
         # Temizlik
-        self.driver.quit()
+        self.screenshot_worker.close()
+        self.close_driver()
         return True
 
     # ---- Account switching ----
@@ -484,6 +721,18 @@ class TikTokWithLocator:
         while time.time() < end_time:
             self.log(f"\n📹 Video #{video_idx}")
             time.sleep(load_secs)
+            # One page_source per video: description, title and the like target all come from it
+            self.invalidate_page()
+            if self.page_snapshot() is not None:
+                snap = self.last_snapshot
+                like = next(self.like_candidates(), None)
+                if like is not None and isinstance(like[1], LocalElement):
+                    x, y = like[1].tap_point()
+                    like_msg = f"like ({x}, {y}) via {like[0]}"
+                else:
+                    like_msg = "like button not in snapshot"
+                self.log(f"🗂️ Snapshot: {snap['bytes'] / 1024:.0f} KB, fetch {snap['fetch_secs'] * 1000:.0f} ms, "
+                         f"parse {snap['parse_secs'] * 1000:.0f} ms, {snap['nodes']} nodes | {like_msg}")
             desc = self.get_video_description_text()
             title = self.get_video_title_text()
             if desc:
@@ -496,9 +745,7 @@ class TikTokWithLocator:
                 self.log(f"🏷️ Title: {tprev[:80]}{'...' if len(tprev) > 80 else ''}")
             
             # Target content? (keywords in desc or title)
-            matched_desc = self.get_matched_keywords(desc)
-            matched_title = self.get_matched_keywords(title)
-            matched_keys = list(dict.fromkeys(matched_desc + matched_title))
+            matched_keys = self.keyword_matcher.matched(desc, title)
             is_target = len(matched_keys) > 0
             
             # İzleme süresi seçimi
@@ -544,8 +791,7 @@ class TikTokWithLocator:
                 self.log(f"🎯 Decision: LIKE (reason: {reason_msg})")
                 if self.like_video_with_locator():
                     self.stats['likes'] += 1
-                    snap_name = f"liked_video_{video_idx:03d}.png"
-                    self.save_screenshot(snap_name)
+                    snap_name = self.save_screenshot(f"liked_video_{video_idx:03d}.png")
                     self.liked_videos.append({
                         "video": video_idx,
                         "desc": (desc or "")[:200],
@@ -574,83 +820,35 @@ class TikTokWithLocator:
 
     def get_video_description_text(self) -> str:
         """Resource-id ile video açıklamasını yakala."""
-        # UiSelector ile hızlı dene
-        for rid in [
-            "com.zhiliaoapp.musically:id/desc",
-            "com.ss.android.ugc.trill:id/desc"
-        ]:
-            try:
-                ui = f'new UiSelector().resourceId("{rid}")'
-                el = self.driver.find_element(AppiumBy.ANDROID_UIAUTOMATOR, ui)
-                txt = (el.text or "").strip()
-                if txt:
-                    return txt
-            except Exception:
-                continue
-        # ID ile dene
-        for rid in [
+        rids = [
             "com.zhiliaoapp.musically:id/desc",
             "com.ss.android.ugc.trill:id/desc"
-        ]:
-            try:
-                el = self.driver.find_element(AppiumBy.ID, rid)
-                txt = (el.text or "").strip()
-                if txt:
-                    return txt
-            except Exception:
-                continue
-        # XPath ile kısa deneme
-        try:
-            el = self.driver.find_element(AppiumBy.XPATH, "//*[@resource-id and contains(@resource-id,'/desc')]")
-            return (el.text or "").strip()
-        except Exception:
-            return ""
+        ]
+        # UiSelector, ID, then a short XPath (resolved on the page snapshot)
+        return self.find_text(
+            [(AppiumBy.ANDROID_UIAUTOMATOR, f'new UiSelector().resourceId("{rid}")') for rid in rids]
+            + [(AppiumBy.ID, rid) for rid in rids]
+            + [(AppiumBy.XPATH, "//*[@resource-id and contains(@resource-id,'/desc')]")],
+            what="description"
+        )
 
     def get_video_title_text(self) -> str:
         """Fetch video title using resource-id."""
-        # Try UiSelector first
-        for rid in [
+        rids = [
             "com.zhiliaoapp.musically:id/title",
-        ]:
-            try:
-                ui = f'new UiSelector().resourceId("{rid}")'
-                el = self.driver.find_element(AppiumBy.ANDROID_UIAUTOMATOR, ui)
-                txt = (el.text or "").strip()
-                if txt:
-                    return txt
-            except Exception:
-                continue
-        # Then try ID
-        for rid in [
-            "com.zhiliaoapp.musically:id/title",
-        ]:
-            try:
-                el = self.driver.find_element(AppiumBy.ID, rid)
-                txt = (el.text or "").strip()
-                if txt:
-                    return txt
-            except Exception:
-                continue
-        # Short XPath attempt
-        try:
-            el = self.driver.find_element(AppiumBy.XPATH, "//*[@resource-id and contains(@resource-id,'/title')]")
-            return (el.text or "").strip()
-        except Exception:
-            return ""
+        ]
+        return self.find_text(
+            [(AppiumBy.ANDROID_UIAUTOMATOR, f'new UiSelector().resourceId("{rid}")') for rid in rids]
+            + [(AppiumBy.ID, rid) for rid in rids]
+            + [(AppiumBy.XPATH, "//*[@resource-id and contains(@resource-id,'/title')]")],
+            what="title"
+        )
 
     def should_like_based_on_desc(self, desc: str) -> bool:
         """Return True if CompTIA-related; else like with 30% chance."""
         if not desc:
             return random.random() < 0.30
-        text = desc.lower()
-        keywords = [
-            'comptia', 'security+', 'network+', 'a+', 'aplus', 'cysa+', 'pentest+', 'linux+', 'cloud+', 'server+', 'project+',
-            'sy0-601', 'sy0-701', 'n10-008', '220-1101', '220-1102', 'cs0-002', 'pt0-002',
-            'cybersecurity', 'network security', 'ethical hacking', 'incident response', 'vulnerability', 'encryption', 'cryptography',
-            'malware', 'phishing', 'osi model', 'subnet', 'subnetting', 'tcp/ip', 'ports', 'protocols',
-            'certification', 'exam', 'exam prep', 'practice test', 'bootcamp'
-        ]
-        if any(k in text for k in keywords):
+        if self.is_target_desc(desc):
             return True
         return random.random() < 0.30
 
@@ -658,28 +856,12 @@ class TikTokWithLocator:
         """Whether the text relates to CompTIA/cybersecurity."""
         if not desc:
             return False
-        text = desc.lower()
-        keywords = [
-            'comptia', 'security+', 'network+', 'a+', 'aplus', 'cysa+', 'pentest+', 'linux+', 'cloud+', 'server+', 'project+',
-            'sy0-601', 'sy0-701', 'n10-008', '220-1101', '220-1102', 'cs0-002', 'pt0-002',
-            'cybersecurity', 'network security', 'ethical hacking', 'incident response', 'vulnerability', 'encryption', 'cryptography',
-            'malware', 'phishing', 'osi model', 'subnet', 'subnetting', 'tcp/ip', 'ports', 'protocols',
-            'certification', 'exam', 'exam prep', 'practice test', 'bootcamp'
-        ]
-        return any(k in text for k in keywords)
+        return next(self.keyword_matcher.scan(desc), None) is not None
 
     def get_matched_keywords(self, desc: str):
         if not desc:
             return []
-        text = desc.lower()
-        keywords = [
-            'comptia', 'security+', 'network+', 'a+', 'aplus', 'cysa+', 'pentest+', 'linux+', 'cloud+', 'server+', 'project+',
-            'sy0-601', 'sy0-701', 'n10-008', '220-1101', '220-1102', 'cs0-002', 'pt0-002',
-            'cybersecurity', 'network security', 'ethical hacking', 'incident response', 'vulnerability', 'encryption', 'cryptography',
-            'malware', 'phishing', 'osi model', 'subnet', 'subnetting', 'tcp/ip', 'ports', 'protocols',
-            'certification', 'exam', 'exam prep', 'practice test', 'bootcamp'
-        ]
-        return [k for k in keywords if k in text]
+        return self.keyword_matcher.matched(desc)
 
     # --- Session helpers ---
     def setup_session(self):
@@ -706,25 +888,41 @@ class TikTokWithLocator:
             except Exception:
                 pass
 
-    def save_screenshot(self, filename: str):
+    def save_screenshot(self, filename: str) -> str:
+        """Capture now, write in the background; returns the file name it will be saved as."""
         if not self.screens_dir:
-            return
-        path = os.path.join(self.screens_dir, filename)
+            return ''
         try:
-            ok = self.driver.get_screenshot_as_file(path)
-            if ok:
-                self.log(f"📸 Screenshot kaydedildi: {path}")
+            png = self.driver.get_screenshot_as_png()
         except Exception as e:
             self.log(f"❌ Screenshot başarısız: {e}")
+            return ''
+        path, _ = self.screenshot_worker.submit(os.path.join(self.screens_dir, filename), png)
+        self.log(f"📸 Screenshot kuyruğa alındı: {path}")
+        return os.path.basename(path)
 
     def write_session_report(self, run_minutes: float):
         if not self.session_folder:
             return
+        self.screenshot_worker.flush()
+        if self.locator_ranking:
+            self.locator_ranking.flush(force=True)
         data = {
             "run_minutes": run_minutes,
             "videos_processed": self.stats.get('videos', 0),
             "likes": self.stats.get('likes', 0),
             "liked_videos": self.liked_videos,
+            "screenshots": self.screenshot_worker.report(),
+            "appium_session": self.session_info,
+            "device_facts": self.device_facts.report() if self.device_facts else None,
+            "appium_profile": {"name": self.appium_profile, "settings": self.appium_settings},
+            "locators": {k: round(v, 3) if isinstance(v, float) else v for k, v in self.locator_stats.items()},
+            "lookup_budgets": {
+                what: {"budget_ms": self.lookup_budgets_ms.get(what), "lookups": st["lookups"], "expired": st["expired"],
+                       "avg_ms": round(st["spent_ms"] / st["lookups"], 1), "max_ms": round(st["max_ms"], 1)}
+                for what, st in self.budget_stats.items()
+            },
+            "locator_ranking": self.locator_ranking.report() if self.locator_ranking else None,
             "timestamp": datetime.now().isoformat()
         }
         try:
@@ -743,7 +941,7 @@ def main():
     print("\nThen run this script.")
     print()
     
-    # Appium check (APPIUM_SERVER env)
+    # Appium check (APPIUM_SERVER env); with session reuse connect() finds out anyway
     import os
     import socket
     from urllib.parse import urlparse
@@ -753,18 +951,19 @@ def main():
     host = parsed.hostname or 'localhost'
     port = parsed.port or 4723
 
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.settimeout(2)
-    result = sock.connect_ex((host, port))
-    sock.close()
+    if not appium_session.reuse_enabled():
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(2)
+        result = sock.connect_ex((host, port))
+        sock.close()
 
-    if result != 0:
-        print("❌ Cannot connect to Appium server!")
-        print(f"   Check: {host}:{port} (APPIUM_SERVER)")
-        print("   On Windows: appium -a 0.0.0.0 -p 4723")
-        sys.exit(1)
+        if result != 0:
+            print("❌ Cannot connect to Appium server!")
+            print(f"   Check: {host}:{port} (APPIUM_SERVER)")
+            print("   On Windows: appium -a 0.0.0.0 -p 4723")
+            sys.exit(1)
 
-    print(f"✅ Appium server detected: {host}:{port}")
+        print(f"✅ Appium server detected: {host}:{port}")
     print("📌 Starting automation...\n")
     
     automation = TikTokWithLocator()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Etkileşim nesli (generation) anahtarlı UI önbelleği
+Every input that can change the screen (tap, swipe, motionevent, keyevent,
+app launch) bumps a generation counter and drops cached reads. A read taken
+with no interaction since is served from the cache instead of another
+uiautomator dump.
+"""
+
+from typing import Any, Dict, Sequence, Union
+
+from adb_metrics import classify
+
+INTERACTION_CLASSES = ('tap', 'swipe', 'motionevent', 'keyevent')
+
+
+def is_interaction(command: Union[Sequence[str], str]) -> bool:
+    """Ekranı değiştirebilecek adb komutu mu (input ... / monkey / am start)?"""
+    if classify(command) in INTERACTION_CLASSES:
+        return True
+    argv = command.split() if isinstance(command, str) else list(command)
+    if argv[:1] in (['shell'], ['exec-out']):
+        argv = argv[1:]
+    return argv[:1] == ['monkey'] or argv[:2] == ['am', 'start']
+
+
+class GenerationCache:
+    def __init__(self):
+        self.generation = 0
+        self._entries: Dict[str, Any] = {}
+        self.stats = {'hits': 0, 'misses': 0, 'stale_puts': 0, 'interactions': 0}
+
+    def bump(self):
+        """Etkileşim oldu: nesil ilerler, önbellek boşalır"""
+        self.generation += 1
+        self.stats['interactions'] += 1
+        self._entries.clear()
+
+    def get(self, key: str) -> Any:
+        value = self._entries.get(key)
+        if value is None:
+            self.stats['misses'] += 1
+        else:
+            self.stats['hits'] += 1
+        return value
+
+    def put(self, key: str, value: Any, generation: int) -> bool:
+        """Okuma başladığındaki nesil hâlâ geçerliyse sakla (arada etkileşim olduysa atla)"""
+        if generation != self.generation:
+            self.stats['stale_puts'] += 1
+            return False
+        self._entries[key] = value
+        return True
+
+    def report(self) -> Dict[str, Any]:
+        reads = self.stats['hits'] + self.stats['misses']
+        return dict(self.stats, generation=self.generation,
+                    hit_rate=round(self.stats['hits'] / reads, 3) if reads else None)
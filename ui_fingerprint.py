@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+UI yapısal parmak izi (video değişimi tespiti)
+Hashes the regions of a UiHierarchy that identify a video: description,
+author and the right-panel counters (class, resource-id and text of every node
+in the region). Two dumps of the same video give the same hashes, so "did the
+swipe land?" becomes a dictionary compare, and diff() says which regions moved.
+
+A streaming parse that stopped early has read a chunk-dependent number of
+nodes past its stop point; pass nodes=parser.total_nodes so only the nodes the
+parser examined (the same prefix for the same screen) are hashed.
+"""
+
+import hashlib
+from typing import Dict, List, Optional
+
+from ui_hierarchy import UiHierarchy
+from ui_spatial import COUNTER_RE
+
+REGIONS = ('description', 'author', 'counters')
+
+
+def _region_texts(ui: UiHierarchy, nodes: Optional[int] = None) -> Dict[str, List[str]]:
+    texts: Dict[str, List[str]] = {region: [] for region in REGIONS}
+    limit = len(ui) if nodes is None else min(nodes, len(ui))
+    # Ekran genişliği: ilk (tam ekran) node'dan
+    width = ui.rect(0)[2] if limit else 0
+    for i in ui.with_text():
+        if i >= limit:
+            break
+        text = ui.text(i).strip()
+        rid = ui.resource_id(i)
+        region = None
+        if rid.endswith(':id/desc'):
+            region = 'description'
+        elif text.startswith('@') or rid.endswith(':id/title'):
+            region = 'author'
+        elif COUNTER_RE.match(text):
+            if ui.center(i)[0] >= width * 0.8:
+                region = 'counters'
+        elif len(text) > 10 and not rid:
+            # resource-id'siz uzun metin (eski sürümler): açıklama sayılır
+            region = 'description'
+        if region:
+            texts[region].append(f"{ui.cls(i)}|{rid}|{text}")
+    return texts
+
+
+class UiFingerprint:
+    def __init__(self, hashes: Dict[str, Optional[str]], nodes: int = 0):
+        self.hashes = hashes  # None = bölge dump'ta yok
+        self.nodes = nodes
+
+    @staticmethod
+    def _hash(texts: List[str]) -> Optional[str]:
+        if not texts:
+            return None
+        return hashlib.blake2b('\x1f'.join(texts).encode('utf-8'), digest_size=8).hexdigest()
+
+    @classmethod
+    def of(cls, ui: UiHierarchy, nodes: Optional[int] = None) -> 'UiFingerprint':
+        """nodes: yalnızca ilk N node (erken çıkışlı parse'ta parser'ın incelediği kısım)"""
+        nodes = len(ui) if nodes is None else min(nodes, len(ui))
+        return cls({region: cls._hash(texts) for region, texts in _region_texts(ui, nodes).items()}, nodes)
+
+    def diff(self, other: 'UiFingerprint') -> Dict[str, bool]:
+        """Bölge -> değişti mi; iki tarafta da olmayan bölgeler atlanır"""
+        return {region: self.hashes.get(region) != other.hashes.get(region)
+                for region in REGIONS
+                if self.hashes.get(region) is not None or other.hashes.get(region) is not None}
+
+    def same_video(self, other: 'UiFingerprint') -> Optional[bool]:
+        """Açıklama (ve yazar) bölgesine göre aynı video mu; karar verilemezse None.
+
+        Without a description on either side there is no decision: the same
+        creator posts back-to-back videos, and counters move when the current
+        video is liked.
+        """
+        diff = self.diff(other)
+        if 'description' not in diff:
+            return None
+        return not (diff['description'] or diff.get('author', False))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, UiFingerprint) and self.hashes == other.hashes
+
+    def __repr__(self) -> str:
+        parts = ', '.join(f"{r}={(self.hashes.get(r) or '-')[:6]}" for r in REGIONS)
+        return f"UiFingerprint({parts})"
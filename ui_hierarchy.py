@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Kompakt UI hierarchy tablosu
+Parses a uiautomator dump or an Appium page_source once into a struct-of-arrays
+node table: interned class / resource-id / package ids, bounds as one int
+array, boolean attributes as bitsets and a parent index. Can be fed chunk by
+chunk straight from an adb pipe (nodes become visible as they arrive).
+"""
+
+import xml.etree.ElementTree as ET
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+BytesOrStr = Union[bytes, bytearray, memoryview, str]
+
+FLAGS = ('checkable', 'checked', 'clickable', 'enabled', 'focusable', 'focused', 'scrollable',
+         'long-clickable', 'password', 'selected', 'displayed')
+# Metin öznitelikleri: boş ('') ile hiç olmayan (XPath @attr yanlış) ayrı tutulur
+STRING_ATTRS = ('text', 'content-desc', 'resource-id', 'class', 'package')
+
+
+def parse_bounds(bounds: str) -> Tuple[int, int, int, int]:
+    """'[x1,y1][x2,y2]' -> (x1, y1, x2, y2); bozuksa (0, 0, 0, 0)"""
+    try:
+        x1, y1, x2, y2 = bounds[1:-1].replace('][', ',').split(',')
+        return int(x1), int(y1), int(x2), int(y2)
+    except (ValueError, AttributeError):
+        return 0, 0, 0, 0
+
+
+class UiHierarchy:
+    def __init__(self):
+        # String intern tablosu (0 = '')
+        self.strings: List[str] = ['']
+        self._string_ids: Dict[str, int] = {'': 0}
+        self.class_ids = array('i')
+        self.resource_ids = array('i')
+        self.package_ids = array('i')
+        self.texts: List[str] = []
+        self.descs: List[str] = []
+        self.bounds = array('i')  # x1, y1, x2, y2 per node
+        self.parents = array('i')  # -1 = kök
+        self.depths = array('i')
+        self.flag_bits: Dict[str, bytearray] = {flag: bytearray() for flag in FLAGS}
+        # STRING_ATTRS'tan dump'ta hiç yazılmamış olanlar (uiautomator hepsini yazar: genelde boş)
+        self.absent_bits: Dict[str, bytearray] = {name: bytearray() for name in STRING_ATTRS}
+
+        self._parser = ET.XMLPullParser(events=('start', 'end'))
+        self._stack: List[int] = []
+        self.bytes_read = 0
+        self.seen_root = False
+        self.complete = False
+        self.error: Optional[Exception] = None
+
+    # ---- building ----
+    @classmethod
+    def parse(cls, xml_content: BytesOrStr) -> 'UiHierarchy':
+        """Tüm dump'ı parse et; bozuk XML'de ET.ParseError fırlatır"""
+        hierarchy = cls()
+        hierarchy.feed(xml_content)
+        hierarchy.close()
+        if hierarchy.error is not None:
+            raise hierarchy.error
+        return hierarchy
+
+    def intern(self, value: str) -> int:
+        sid = self._string_ids.get(value)
+        if sid is None:
+            sid = len(self.strings)
+            self.strings.append(value)
+            self._string_ids[value] = sid
+        return sid
+
+    def feed(self, chunk: BytesOrStr) -> int:
+        """Chunk besle; eklenen node sayısını döndür. </hierarchy> sonrası (exec-out mesajı) yok sayılır."""
+        if self.complete or self.error is not None or not chunk:
+            return 0
+        before = len(self.parents)
+        self.bytes_read += len(chunk)
+        try:
+            self._parser.feed(chunk)
+            for event, elem in self._parser.read_events():
+                if event == 'start':
+                    if elem.tag == 'hierarchy':
+                        self.seen_root = True
+                    else:
+                        self._stack.append(self._add_node(elem.tag, elem.attrib))
+                elif elem.tag == 'hierarchy':
+                    self.complete = True
+                    break
+                else:
+                    self._stack.pop()
+                    # Bitmiş alt ağaçları bırak (bellek tabloda)
+                    elem.clear()
+        except ET.ParseError as e:
+            self.error = e
+        return len(self.parents) - before
+
+    def close(self):
+        """Akış bitti; belge tamamlanmadıysa error set edilir"""
+        if not self.complete and self.error is None:
+            self.error = ET.ParseError('truncated hierarchy')
+
+    def _add_node(self, tag: str, attrib: Dict[str, str]) -> int:
+        idx = len(self.parents)
+        # uiautomator: <node class=...>; Appium page_source: <android.widget.TextView ...>
+        self.class_ids.append(self.intern(attrib.get('class') or ('' if tag == 'node' else tag)))
+        self.resource_ids.append(self.intern(attrib.get('resource-id', '')))
+        self.package_ids.append(self.intern(attrib.get('package', '')))
+        self.texts.append(attrib.get('text', ''))
+        self.descs.append(attrib.get('content-desc', ''))
+        self.bounds.extend(parse_bounds(attrib.get('bounds', '')))
+        self.parents.append(self._stack[-1] if self._stack else -1)
+        self.depths.append(len(self._stack))
+        byte, bit = idx >> 3, 1 << (idx & 7)
+        for flag, bits in self.flag_bits.items():
+            if len(bits) <= byte:
+                bits.append(0)
+            if attrib.get(flag) == 'true':
+                bits[byte] |= bit
+        for name, bits in self.absent_bits.items():
+            if len(bits) <= byte:
+                bits.append(0)
+            if name not in attrib and not (name == 'class' and tag != 'node'):
+                bits[byte] |= bit
+        return idx
+
+    # ---- access ----
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def cls(self, i: int) -> str:
+        return self.strings[self.class_ids[i]]
+
+    def resource_id(self, i: int) -> str:
+        return self.strings[self.resource_ids[i]]
+
+    def package(self, i: int) -> str:
+        return self.strings[self.package_ids[i]]
+
+    def text(self, i: int) -> str:
+        return self.texts[i]
+
+    def desc(self, i: int) -> str:
+        return self.descs[i]
+
+    def rect(self, i: int) -> Tuple[int, int, int, int]:
+        return tuple(self.bounds[i * 4:i * 4 + 4])
+
+    def center(self, i: int) -> Tuple[int, int]:
+        x1, y1, x2, y2 = self.bounds[i * 4:i * 4 + 4]
+        return (x1 + x2) // 2, (y1 + y2) // 2
+
+    def bounds_str(self, i: int) -> str:
+        x1, y1, x2, y2 = self.bounds[i * 4:i * 4 + 4]
+        return f"[{x1},{y1}][{x2},{y2}]"
+
+    def has(self, i: int, flag: str) -> bool:
+        bits = self.flag_bits[flag]
+        return bool(bits[i >> 3] & (1 << (i & 7)))
+
+    def has_attr(self, i: int, name: str) -> bool:
+        """STRING_ATTRS'tan biri dump'ta yazılmış mı (boş olsa bile)"""
+        bits = self.absent_bits[name]
+        return not bits[i >> 3] & (1 << (i & 7))
+
+    def parent(self, i: int) -> int:
+        return self.parents[i]
+
+    def ancestors(self, i: int) -> Iterator[int]:
+        i = self.parents[i]
+        while i != -1:
+            yield i
+            i = self.parents[i]
+
+    def with_flag(self, flag: str) -> Iterator[int]:
+        """Bayrağı set olan node indeksleri (bitset üzerinden)"""
+        bits = self.flag_bits[flag]
+        n = len(self.parents)
+        for byte_idx, byte in enumerate(bits):
+            if not byte:
+                continue
+            for bit in range(8):
+                if byte & (1 << bit):
+                    i = (byte_idx << 3) | bit
+                    if i < n:
+                        yield i
+
+    def with_text(self) -> Iterator[int]:
+        return (i for i, t in enumerate(self.texts) if t and t.strip())
+
+    def packages(self) -> List[str]:
+        """Dump'ta görülen paketler (intern tablosundan, tekrar yok)"""
+        ids = set(self.package_ids)
+        ids.discard(0)
+        return [self.strings[sid] for sid in sorted(ids)]
+
+    def node(self, i: int) -> Dict[str, object]:
+        """Tek node'un okunabilir görünümü (debug/log için)"""
+        return {
+            'index': i,
+            'class': self.cls(i),
+            'resource_id': self.resource_id(i),
+            'package': self.package(i),
+            'text': self.texts[i],
+            'content_desc': self.descs[i],
+            'bounds': self.rect(i),
+            'parent': self.parents[i],
+            'flags': [flag for flag in FLAGS if self.has(i, flag)],
+        }
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Yerel locator motoru (XPath / UiSelector alt kümesi)
+Evaluates the locators the bots hand to Appium against a UiHierarchy parsed
+from one page_source, so lookups cost no HTTP round trip; only the final click
+goes to the server. Supported:
+
+  XPath      //Class or //*, /, //, ., .., axes (child, descendant, parent,
+             ancestor, ancestor-or-self, self, following-sibling,
+             preceding-sibling), predicates with @attr, =, !=, and, or, not(),
+             contains(), starts-with() and positional [n]
+  UiSelector new UiSelector().resourceId/text/textContains/textStartsWith/
+             description/descriptionContains/descriptionStartsWith/className/
+             clickable/enabled/selected/instance(...); *Contains/*StartsWith
+             ignore case, as UiAutomator does
+  id         exact resource-id, or the part after ':id/'
+  accessibility id   exact content-desc
+
+Anything outside the subset raises UnsupportedLocator, so callers can fall
+back to the server.
+"""
+
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ui_hierarchy import FLAGS, STRING_ATTRS, UiHierarchy
+
+# AppiumBy değerleri (appium import etmeden)
+BY_ID = 'id'
+BY_XPATH = 'xpath'
+BY_ACCESSIBILITY_ID = 'accessibility id'
+BY_UIAUTOMATOR = '-android uiautomator'
+
+ROOT = -1  # belge kökü (hierarchy elemanı)
+
+
+class UnsupportedLocator(ValueError):
+    pass
+
+
+def attribute(ui: UiHierarchy, i: int, name: str) -> Optional[str]:
+    """Node özniteliği; yazılmış ama boş öznitelik '', dump'ta olmayan None (XPath'te @attr yanlış)"""
+    if i == ROOT:
+        return None
+    if name in STRING_ATTRS and not ui.has_attr(i, name):
+        return None
+    if name == 'text':
+        value = ui.text(i)
+    elif name == 'content-desc':
+        value = ui.desc(i)
+    elif name == 'resource-id':
+        value = ui.resource_id(i)
+    elif name == 'class':
+        value = ui.cls(i)
+    elif name == 'package':
+        value = ui.package(i)
+    elif name == 'bounds':
+        return ui.bounds_str(i)
+    elif name in FLAGS:
+        return 'true' if ui.has(i, name) else 'false'
+    else:
+        return None
+    return value
+
+
+# ---- XPath ----
+_TOKEN_RE = re.compile(r"""\s*(?:
+    (?P<str>'[^']*'|"[^"]*")
+  | (?P<num>\d+)
+  | (?P<op>//|::|!=|\.\.|[/\[\]()@=,.*])
+  | (?P<name>[A-Za-z_][\w.\-]*)
+)""", re.X)
+
+_AXES = ('child', 'descendant', 'descendant-or-self', 'parent', 'ancestor', 'ancestor-or-self', 'self',
+         'following-sibling', 'preceding-sibling')
+
+
+def _tokenize(expr: str) -> List[Tuple[str, str]]:
+    tokens, pos, expr = [], 0, expr.strip()
+    while pos < len(expr):
+        m = _TOKEN_RE.match(expr, pos)
+        if not m or m.end() == pos:
+            raise UnsupportedLocator(f"xpath: unexpected '{expr[pos:pos + 10]}'")
+        kind = m.lastgroup
+        value = m.group(kind)
+        tokens.append((kind, value[1:-1] if kind == 'str' else value))
+        pos = m.end()
+    return tokens
+
+
+class XPath:
+    """Derlenmiş XPath alt kümesi; evaluate(ui, context) -> belge sırasında node listesi"""
+
+    def __init__(self, expr: str):
+        self.expr = expr
+        self._tokens = _tokenize(expr)
+        self._pos = 0
+        self.absolute = False
+        self.steps = self._parse_path()
+        if self._pos != len(self._tokens):
+            raise UnsupportedLocator(f"xpath: trailing tokens in {expr!r}")
+
+    # -- parser --
+    def _peek(self, offset: int = 0) -> Tuple[str, str]:
+        i = self._pos + offset
+        return self._tokens[i] if i < len(self._tokens) else ('', '')
+
+    def _take(self, value: Optional[str] = None) -> Tuple[str, str]:
+        tok = self._peek()
+        if not tok[0] or (value is not None and tok[1] != value):
+            raise UnsupportedLocator(f"xpath: expected {value!r} in {self.expr!r}")
+        self._pos += 1
+        return tok
+
+    def _parse_path(self):
+        steps = []
+        first = self._peek()[1]
+        if first == '//':
+            self._take()
+            self.absolute = True
+            steps.append(('descendant-or-self', 'node()', []))
+        elif first == '/':
+            self._take()
+            self.absolute = True
+        steps.append(self._parse_step())
+        while self._peek()[1] in ('/', '//'):
+            if self._take()[1] == '//':
+                steps.append(('descendant-or-self', 'node()', []))
+            steps.append(self._parse_step())
+        return steps
+
+    def _parse_step(self):
+        kind, value = self._peek()
+        if value == '.':
+            self._take()
+            return ('self', '*', [])
+        if value == '..':
+            self._take()
+            return ('parent', '*', [])
+        axis = 'child'
+        if kind == 'name' and self._peek(1)[1] == '::':
+            axis = self._take()[1]
+            self._take('::')
+            if axis not in _AXES:
+                raise UnsupportedLocator(f"xpath: axis {axis}")
+        kind, test = self._take()
+        if kind != 'name' and test != '*':
+            raise UnsupportedLocator(f"xpath: node test {test!r}")
+        preds = []
+        while self._peek()[1] == '[':
+            self._take('[')
+            preds.append(self._parse_or())
+            self._take(']')
+        return (axis, test, preds)
+
+    def _parse_or(self):
+        node = self._parse_and()
+        while self._peek() == ('name', 'or'):
+            self._take()
+            node = ('or', node, self._parse_and())
+        return node
+
+    def _parse_and(self):
+        node = self._parse_cmp()
+        while self._peek() == ('name', 'and'):
+            self._take()
+            node = ('and', node, self._parse_cmp())
+        return node
+
+    def _parse_cmp(self):
+        node = self._parse_primary()
+        if self._peek()[1] in ('=', '!='):
+            op = self._take()[1]
+            node = (op, node, self._parse_primary())
+        return node
+
+    def _parse_primary(self):
+        kind, value = self._peek()
+        if value == '(':
+            self._take()
+            node = self._parse_or()
+            self._take(')')
+            return node
+        if value == '@':
+            self._take()
+            return ('attr', self._take()[1])
+        if kind == 'str':
+            self._take()
+            return ('lit', value)
+        if kind == 'num':
+            self._take()
+            return ('num', int(value))
+        if kind == 'name' and self._peek(1)[1] == '(':
+            self._take()
+            self._take('(')
+            args = []
+            while self._peek()[1] != ')':
+                args.append(self._parse_or())
+                if self._peek()[1] == ',':
+                    self._take()
+            self._take(')')
+            if value not in ('contains', 'starts-with', 'not', 'text', 'true', 'false'):
+                raise UnsupportedLocator(f"xpath: function {value}()")
+            return ('fn', value, args)
+        raise UnsupportedLocator(f"xpath: unexpected {value!r} in {self.expr!r}")
+
+    # -- evaluation --
+    def evaluate(self, ui: UiHierarchy, context: int = ROOT) -> List[int]:
+        axes = _Axes(ui)
+        nodes = [ROOT if self.absolute else context]
+        for axis, test, preds in self.steps:
+            found = set()
+            for ctx in nodes:
+                # '//' adımı kökü de taşır ki //X üst seviye node'ları da bulsun
+                candidates = [i for i in axes.walk(axis, ctx)
+                              if test == 'node()' or (i != ROOT and (test == '*' or ui.cls(i) == test))]
+                for pred in preds:
+                    if pred[0] == 'num':
+                        n = pred[1]
+                        candidates = candidates[n - 1:n] if n >= 1 else []
+                    else:
+                        candidates = [i for i in candidates if self._test(ui, i, pred)]
+                found.update(candidates)
+            nodes = sorted(found)
+        return [i for i in nodes if i != ROOT]
+
+    def _test(self, ui: UiHierarchy, i: int, node) -> bool:
+        """Boolean bağlam: @attr var mı (boş olsa bile), diğerleri değerine göre"""
+        if node[0] == 'attr':
+            return attribute(ui, i, node[1]) is not None
+        return _truthy(self._eval(ui, i, node))
+
+    def _eval(self, ui: UiHierarchy, i: int, node):
+        op = node[0]
+        if op == 'attr':
+            return attribute(ui, i, node[1])
+        if op in ('lit', 'num'):
+            return node[1]
+        if op == 'or':
+            return self._test(ui, i, node[1]) or self._test(ui, i, node[2])
+        if op == 'and':
+            return self._test(ui, i, node[1]) and self._test(ui, i, node[2])
+        if op in ('=', '!='):
+            left, right = self._eval(ui, i, node[1]), self._eval(ui, i, node[2])
+            if left is None or right is None:
+                return False
+            return (str(left) == str(right)) == (op == '=')
+        name = node[1]
+        if name == 'text':
+            return attribute(ui, i, 'text')
+        if name in ('true', 'false'):
+            return name == 'true'
+        if name == 'not':
+            return not self._test(ui, i, node[2][0])
+        args = [self._eval(ui, i, a) for a in node[2]]
+        haystack, needle = str(args[0] or ''), str(args[1] or '')
+        return needle in haystack if name == 'contains' else haystack.startswith(needle)
+
+
+def _truthy(value) -> bool:
+    return value is not None and value is not False and value != ''
+
+
+class _Axes:
+    def __init__(self, ui: UiHierarchy):
+        self.ui = ui
+        self._children: Optional[Dict[int, List[int]]] = None
+
+    def children(self, i: int) -> List[int]:
+        if self._children is None:
+            self._children = {}
+            for j, p in enumerate(self.ui.parents):
+                self._children.setdefault(p, []).append(j)
+        return self._children.get(i, [])
+
+    def descendants(self, i: int) -> List[int]:
+        if i == ROOT:
+            return list(range(len(self.ui)))
+        depth, end = self.ui.depths[i], i + 1
+        while end < len(self.ui) and self.ui.depths[end] > depth:
+            end += 1
+        return list(range(i + 1, end))
+
+    def walk(self, axis: str, i: int) -> List[int]:
+        """Eksen üzerindeki node'lar; ters eksenlerde en yakın önce ([1] = en yakın ata)"""
+        ui = self.ui
+        if axis == 'child':
+            return self.children(i)
+        if axis == 'descendant':
+            return self.descendants(i)
+        if axis == 'descendant-or-self':
+            return [i] + self.descendants(i)
+        if axis == 'self':
+            return [i]
+        if i == ROOT:
+            return []
+        if axis == 'parent':
+            return [ui.parent(i)]
+        if axis == 'ancestor':
+            return list(ui.ancestors(i))
+        if axis == 'ancestor-or-self':
+            return [i] + list(ui.ancestors(i))
+        siblings = self.children(ui.parent(i))
+        k = siblings.index(i)
+        return siblings[k + 1:] if axis == 'following-sibling' else siblings[:k][::-1]
+
+
+# ---- UiSelector ----
+_UISEL_RE = re.compile(r'\.(\w+)\(\s*("(?:[^"\\]|\\.)*"|true|false|\d+)\s*\)')
+
+_UISEL_MATCHERS: Dict[str, Callable[[UiHierarchy, int, object], bool]] = {
+    'resourceId': lambda ui, i, v: ui.resource_id(i) == v,
+    'text': lambda ui, i, v: ui.text(i) == v,
+    # UiAutomator: Contains/StartsWith iki tarafı da küçültür
+    'textContains': lambda ui, i, v: v.lower() in ui.text(i).lower(),
+    'textStartsWith': lambda ui, i, v: ui.text(i).lower().startswith(v.lower()),
+    'description': lambda ui, i, v: ui.desc(i) == v,
+    'descriptionContains': lambda ui, i, v: v.lower() in ui.desc(i).lower(),
+    'descriptionStartsWith': lambda ui, i, v: ui.desc(i).lower().startswith(v.lower()),
+    'className': lambda ui, i, v: ui.cls(i) == v,
+    'clickable': lambda ui, i, v: ui.has(i, 'clickable') == v,
+    'enabled': lambda ui, i, v: ui.has(i, 'enabled') == v,
+    'selected': lambda ui, i, v: ui.has(i, 'selected') == v,
+}
+
+
+def compile_uiselector(expr: str) -> Tuple[List[Tuple[str, object]], int]:
+    """'new UiSelector().resourceId("x")...' -> ([(method, arg)], instance)"""
+    body = expr.strip()
+    if body.endswith(';'):
+        body = body[:-1]
+    if not body.startswith('new UiSelector()'):
+        raise UnsupportedLocator(f"uiselector: {expr!r}")
+    rest = body[len('new UiSelector()'):]
+    conditions, instance, pos = [], 0, 0
+    for m in _UISEL_RE.finditer(rest):
+        if m.start() != pos:
+            break
+        pos = m.end()
+        method, raw = m.group(1), m.group(2)
+        if raw.startswith('"'):
+            arg: object = raw[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+        elif raw in ('true', 'false'):
+            arg = raw == 'true'
+        else:
+            arg = int(raw)
+        if method == 'instance':
+            instance = int(arg)
+        elif method in _UISEL_MATCHERS:
+            conditions.append((method, arg))
+        else:
+            raise UnsupportedLocator(f"uiselector: {method}()")
+    if pos != len(rest):
+        raise UnsupportedLocator(f"uiselector: {rest[pos:]!r}")
+    return conditions, instance
+
+
+# ---- public API ----
+def find_all(ui: UiHierarchy, by: str, value: str, context: int = ROOT) -> List[int]:
+    """Appium find_elements karşılığı (belge sırasında node indeksleri)"""
+    if by == BY_XPATH:
+        return XPath(value).evaluate(ui, context)
+    scope = range(len(ui)) if context == ROOT else _Axes(ui).descendants(context)
+    if by == BY_ID:
+        return [i for i in scope if ui.resource_id(i) == value
+                or (':id/' not in value and ui.resource_id(i).endswith(':id/' + value))]
+    if by == BY_ACCESSIBILITY_ID:
+        return [i for i in scope if ui.desc(i) == value]
+    if by == BY_UIAUTOMATOR:
+        conditions, instance = compile_uiselector(value)
+        matches = [i for i in scope if all(_UISEL_MATCHERS[m](ui, i, arg) for m, arg in conditions)]
+        return matches[instance:instance + 1]
+    raise UnsupportedLocator(f"strategy {by!r}")
+
+
+def find(ui: UiHierarchy, by: str, value: str, context: int = ROOT) -> Optional[int]:
+    """Appium find_element karşılığı; bulunamazsa None"""
+    found = find_all(ui, by, value, context)
+    return found[0] if found else None
+
+
+# Appium adları (resourceId, className, contentDescription) da kabul edilir
+ATTRIBUTE_ALIASES = {'resourceId': 'resource-id', 'className': 'class', 'contentDescription': 'content-desc'}
+
+
+def properties(ui: UiHierarchy, indices: List[int], names) -> List[Dict[str, object]]:
+    """Birden çok node için istenen özellikler tek seferde (node başına HTTP çağrısı yok).
+    names: attribute names (Appium aliases accepted) plus 'text', 'rect', 'location', 'size', 'index'."""
+    result = []
+    for i in indices:
+        x1, y1, x2, y2 = ui.rect(i)
+        props: Dict[str, object] = {}
+        for name in names:
+            if name == 'index':
+                props[name] = i
+            elif name == 'text':
+                props[name] = ui.text(i)
+            elif name == 'rect':
+                props[name] = {'x': x1, 'y': y1, 'width': x2 - x1, 'height': y2 - y1}
+            elif name == 'location':
+                props[name] = {'x': x1, 'y': y1}
+            elif name == 'size':
+                props[name] = {'width': x2 - x1, 'height': y2 - y1}
+            else:
+                props[name] = attribute(ui, i, ATTRIBUTE_ALIASES.get(name, name))
+        result.append(props)
+    return result
+
+
+class LocalElement:
+    """Snapshot'taki bir node; WebElement'in okuma API'sinin küçük bir alt kümesi"""
+
+    def __init__(self, ui: UiHierarchy, index: int):
+        self.ui = ui
+        self.index = index
+
+    @property
+    def text(self) -> str:
+        return self.ui.text(self.index)
+
+    @property
+    def location(self) -> Dict[str, int]:
+        x1, y1, _, _ = self.ui.rect(self.index)
+        return {'x': x1, 'y': y1}
+
+    @property
+    def size(self) -> Dict[str, int]:
+        x1, y1, x2, y2 = self.ui.rect(self.index)
+        return {'width': x2 - x1, 'height': y2 - y1}
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return attribute(self.ui, self.index, ATTRIBUTE_ALIASES.get(name, name))
+
+    def find_element(self, by: str, value: str) -> Optional['LocalElement']:
+        i = find(self.ui, by, value, self.index)
+        return None if i is None else LocalElement(self.ui, i)
+
+    def tap_point(self) -> Tuple[int, int]:
+        """Tıklanacak nokta: node'un merkezi; sınırları boşsa en yakın tıklanabilir atanın merkezi"""
+        x1, y1, x2, y2 = self.ui.rect(self.index)
+        if x2 <= x1 or y2 <= y1:
+            ancestor = self.find_element(BY_XPATH, "./ancestor::*[@clickable='true'][1]")
+            if ancestor is not None:
+                return ancestor.tap_point()
+        return self.ui.center(self.index)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+UI hierarchy üzerinde uzamsal indeks
+A uniform grid over the node bounds of a UiHierarchy. Answers region,
+nearest-above and containment queries locally, so geometric heuristics (e.g.
+"icon right above a counter on the right panel") need no per-element WebDriver
+round trips.
+"""
+
+import re
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from ui_hierarchy import UiHierarchy
+
+COUNTER_RE = re.compile(r'^\d+[\.,]?\d*[KkMmBb]?$')
+
+Predicate = Optional[Callable[[int], bool]]
+
+
+class SpatialGrid:
+    def __init__(self, ui: UiHierarchy, cell: int = 128):
+        self.ui = ui
+        self.cell = cell
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        self.width, self.height = 0, 0
+        b = ui.bounds
+        for i in range(len(ui)):
+            x1, y1, x2, y2 = b[i * 4], b[i * 4 + 1], b[i * 4 + 2], b[i * 4 + 3]
+            if x2 <= x1 or y2 <= y1:
+                continue
+            self.width = max(self.width, x2)
+            self.height = max(self.height, y2)
+            for gx in range(x1 // cell, (x2 - 1) // cell + 1):
+                for gy in range(y1 // cell, (y2 - 1) // cell + 1):
+                    self.cells.setdefault((gx, gy), []).append(i)
+
+    def _candidates(self, x1: int, y1: int, x2: int, y2: int) -> Set[int]:
+        found: Set[int] = set()
+        c = self.cell
+        for gx in range(max(0, x1) // c, max(0, x2 - 1) // c + 1):
+            for gy in range(max(0, y1) // c, max(0, y2 - 1) // c + 1):
+                found.update(self.cells.get((gx, gy), ()))
+        return found
+
+    def region(self, x1: int, y1: int, x2: int, y2: int, pred: Predicate = None) -> List[int]:
+        """Merkezi [x1,x2) x [y1,y2) bölgesinde olan node'lar (belge sırasıyla)"""
+        result = []
+        for i in self._candidates(x1, y1, x2, y2):
+            cx, cy = self.ui.center(i)
+            if x1 <= cx < x2 and y1 <= cy < y2 and (pred is None or pred(i)):
+                result.append(i)
+        return sorted(result)
+
+    def containing(self, x: int, y: int, pred: Predicate = None) -> List[int]:
+        """(x, y) noktasını içeren node'lar, en küçük (en derin) önce"""
+        b = self.ui.bounds
+        hits = [i for i in self.cells.get((x // self.cell, y // self.cell), ())
+                if b[i * 4] <= x < b[i * 4 + 2] and b[i * 4 + 1] <= y < b[i * 4 + 3]
+                and (pred is None or pred(i))]
+        return sorted(hits, key=lambda i: ((b[i * 4 + 2] - b[i * 4]) * (b[i * 4 + 3] - b[i * 4 + 1]), -i))
+
+    def contained_in(self, outer: int, pred: Predicate = None) -> List[int]:
+        """outer node'un sınırları içinde kalan node'lar"""
+        ox1, oy1, ox2, oy2 = self.ui.rect(outer)
+        b = self.ui.bounds
+        return sorted(i for i in self._candidates(ox1, oy1, ox2, oy2)
+                      if i != outer and ox1 <= b[i * 4] and oy1 <= b[i * 4 + 1]
+                      and b[i * 4 + 2] <= ox2 and b[i * 4 + 3] <= oy2 and (pred is None or pred(i)))
+
+    def nearest_above(self, x1: int, x2: int, y: int, max_dy: int, pred: Predicate = None) -> Optional[int]:
+        """Merkezi [x1,x2) sütununda, y'nin üstünde ve max_dy içinde olan en yakın node"""
+        best, best_cy = None, None
+        for i in self.region(x1, max(0, y - max_dy), x2, y, pred):
+            cy = self.ui.center(i)[1]
+            if best_cy is None or cy > best_cy:
+                best, best_cy = i, cy
+        return best
+
+    def tap_target(self, i: int) -> int:
+        """Node'un merkezini içeren en küçük tıklanabilir node (yoksa kendisi)"""
+        cx, cy = self.ui.center(i)
+        hits = self.containing(cx, cy, lambda j: self.ui.has(j, 'clickable'))
+        return hits[0] if hits else i
+
+
+def right_panel_actions(ui: UiHierarchy, grid: Optional[SpatialGrid] = None,
+                        right_frac: float = 0.85) -> List[Tuple[int, int]]:
+    """Sağ aksiyon paneli: (ikon, sayaç) çiftleri, yukarıdan aşağı (ilki genelde like).
+
+    Each numeric label on the right edge (TextView or Button, depending on the
+    TikTok build) is paired with the closest ImageView above it, within a quarter
+    of the screen height. The icon itself is often not clickable (its container
+    is), so callers tap its center or use SpatialGrid.tap_target.
+    """
+    grid = grid or SpatialGrid(ui)
+    W, H = grid.width, grid.height
+    right_x = int(W * right_frac)
+
+    def is_counter(i: int) -> bool:
+        return bool(COUNTER_RE.match(ui.text(i).strip()))
+
+    def is_icon(i: int) -> bool:
+        return ui.cls(i) == 'android.widget.ImageView' and H * 0.25 <= ui.center(i)[1] <= H * 0.9
+
+    pairs = []
+    counters = sorted(grid.region(right_x, 0, W, H, is_counter), key=lambda i: ui.center(i)[1])
+    for label in counters:
+        icon = grid.nearest_above(right_x, W, ui.center(label)[1], int(H * 0.25), is_icon)
+        if icon is not None:
+            pairs.append((icon, label))
+    return pairs
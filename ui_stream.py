@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Akışlı (streaming) uiautomator XML ayrıştırıcı
+Feeds dump chunks into a UiHierarchy as they arrive from adb and fills the
+video_info fields node by node; stops as soon as description, username, likes
+and music are all resolved, so the rest of the hierarchy is never parsed.
+"""
+
+import re
+from typing import Dict, List, Union
+
+from ui_hierarchy import UiHierarchy
+
+LIKES_RE = re.compile(r'^\d+[KMB]?$')
+
+
+class VideoInfoStreamParser:
+    FIELDS = ('description', 'username', 'likes', 'music')
+
+    def __init__(self, max_debug_texts: int = 5):
+        self.hierarchy = UiHierarchy()
+        self.video_info: Dict[str, str] = {field: '' for field in self.FIELDS}
+        self.text_nodes = 0
+        self.debug_texts: List[Dict[str, str]] = []
+        self.max_debug_texts = max_debug_texts
+        self._next = 0          # sıradaki incelenecek node
+        self.done = False       # tüm alanlar bulundu (erken çıkış)
+
+    @property
+    def total_nodes(self) -> int:
+        return self._next
+
+    @property
+    def bytes_read(self) -> int:
+        return self.hierarchy.bytes_read
+
+    @property
+    def complete(self) -> bool:
+        return self.hierarchy.complete
+
+    @property
+    def error(self):
+        return self.hierarchy.error
+
+    @property
+    def finished(self) -> bool:
+        return self.done or self.complete or self.error is not None
+
+    @property
+    def valid(self) -> bool:
+        """Geçerli bir hierarchy okundu mu (tam ya da erken çıkışla)?"""
+        return self.hierarchy.seen_root and self.error is None and (self.done or self.complete)
+
+    def feed(self, chunk: Union[bytes, str]) -> bool:
+        """Chunk besle; daha fazla veri gerekmiyorsa True döndür."""
+        if self.finished or not chunk:
+            return self.finished
+        self.hierarchy.feed(chunk)
+        while self._next < len(self.hierarchy) and not self.done:
+            self._on_node(self._next)
+            self._next += 1
+        return self.finished
+
+    def close(self):
+        """Akış bitti; erken çıkış olmadıysa belge tamamlanmış olmalı."""
+        if not self.done:
+            self.hierarchy.close()
+
+    def _on_node(self, i: int):
+        h = self.hierarchy
+        text = h.texts[i]
+        if not text or not text.strip():
+            return
+        self.text_nodes += 1
+        content_desc = h.descs[i]
+        if len(self.debug_texts) < self.max_debug_texts:
+            self.debug_texts.append({'text': text, 'resource_id': h.resource_id(i)})
+
+        info = self.video_info
+        number_like = LIKES_RE.match(text.replace(',', '')) is not None
+        # Look for username patterns (starts with @)
+        if text.startswith('@') and not info['username']:
+            info['username'] = text
+        # Look for like count patterns (numbers with K, M, or just digits)
+        elif number_like and not info['likes']:
+            info['likes'] = text
+        # Look for description text (longer text without @ or numbers)
+        elif len(text) > 10 and not text.startswith('@') and not number_like and not info['description']:
+            info['description'] = text.lower()
+        # Music info from content descriptions
+        if not info['music'] and ('sound' in content_desc.lower() or 'music' in content_desc.lower()):
+            info['music'] = content_desc
+
+        if all(info[field] for field in self.FIELDS):
+            self.done = True
+
+
+def parse_video_info(xml_content: Union[bytes, str], chunk_size: int = 16384) -> VideoInfoStreamParser:
+    """Bellekteki bir dump'ı parça parça besle (erken çıkış burada da geçerli)."""
+    parser = VideoInfoStreamParser()
+    for i in range(0, len(xml_content), chunk_size):
+        if parser.feed(xml_content[i:i + chunk_size]):
+            break
+    parser.close()
+    return parser